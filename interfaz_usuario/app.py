@@ -4,8 +4,6 @@ from __future__ import annotations
 
 import pathlib
 import sys
-import csv
-import io
 from dataclasses import replace
 from typing import List, Tuple
 
@@ -19,7 +17,9 @@ PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[1]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
-from simulador import data, detail, simulation
+from simulador import data, detail, sampling, simulation
+
+PLOT_TOLERANCE = 1e-4  # V, error maximo de interpolacion de la curva graficada
 
 
 def _build_config(temperature: float, pH: float) -> simulation.ElectrolyzerSimulator:
@@ -41,12 +41,14 @@ def _polarization(
 
 
 def _activity_profile(
-    catalyst_name: str, temperature: float, pH: float, potentials: np.ndarray
-) -> List[float]:
+    catalyst_name: str, temperature: float, pH: float, potential_range: Tuple[float, float]
+) -> Tuple[List[float], List[float]]:
+    """Vertices exactos de la curva de actividad (log10(A) es lineal entre ellos)."""
+
     analyzer = simulation.CatalystAnalyzer(
         catalyst=data.CATALYSTS[catalyst_name], temperature=temperature, pH=pH
     )
-    return analyzer.activity_profile(potentials.tolist())
+    return analyzer.activity_curve(*potential_range)
 
 
 def _blank_figure(x_title: str, y_title: str, message: str) -> dict:
@@ -87,7 +89,7 @@ FIELD_DESCRIPTIONS = {
     "ph": "pH del electrolito. Ajusta la energia libre de protones utilizada en los calculos termodinamicos.",
     "current_min": "Limite inferior del barrido de densidad de corriente para la curva de polarizacion.",
     "current_max": "Limite superior del barrido de densidad de corriente para la curva de polarizacion.",
-    "samples": "Numero de puntos discretos utilizados para trazar la curva entre las corrientes minima y maxima.",
+    "samples": "Numero maximo de puntos utilizados para trazar la curva entre las corrientes minima y maxima; se concentran donde la curva se dobla.",
     "focus_current": "Punto especifico de densidad de corriente usado para desglosar los sobrepotenciales.",
     "catalyst": "Conjunto de parametros DFT (energias de adsorcion y barreras) asociados al catalizador seleccionado.",
 }
@@ -446,7 +448,7 @@ def update_ph_display(value: float) -> str:
 
 @app.callback(Output("samples-display", "children"), Input("samples-slider", "value"))
 def update_samples_display(value: int) -> str:
-    return f"{value} puntos"
+    return f"hasta {value} puntos"
 
 
 @app.callback(
@@ -502,10 +504,13 @@ def update_outputs(
         )
 
     sim = _build_config(temperature, pH)
-    currents = np.linspace(current_min, current_max, samples)
-    details = detail.detailed_curve(currents.tolist(), sim.config)
-    voltages = [point.voltage for point in details]
-    table_rows_raw = [point.table_row() for point in details]
+    # Puntos concentrados donde la curva se dobla (zona de Tafel y rodilla cerca de i_lim).
+    currents = sampling.adaptive_currents(
+        sim.config, current_min, current_max, tolerance=PLOT_TOLERANCE, max_points=samples
+    )
+    details = detail.detailed_curve(currents, sim.config)
+    voltages = details.voltage.tolist()
+    table_rows_raw = details.table_rows()
     table_rows = [
         {
             "current": f"{row['current']:.3f}",
@@ -519,17 +524,20 @@ def update_outputs(
         }
         for row in table_rows_raw
     ]
-    store_data = [point.to_dict() for point in details]
+    store_data = details.to_store()
     points_grid = []
-    for point in store_data:
+    for row, point_steps in zip(table_rows_raw, store_data["steps"]):
+        steps = detail.merge_steps(
+            store_data["shared_steps"], point_steps, store_data["step_positions"]
+        )
         equations_text = "\n".join(
             f"{idx+1}. {step['name']} -> {step['expression']} = {step['result']:.4f}"
-            for idx, step in enumerate(point["steps"])
+            for idx, step in enumerate(steps)
         )
         points_grid.append(
             {
-                "current": f"{point['current_density']:.3f}",
-                "voltage": f"{point['voltage']:.3f}",
+                "current": f"{row['current']:.3f}",
+                "voltage": f"{row['voltage']:.3f}",
                 "equations": equations_text,
             }
         )
@@ -579,12 +587,11 @@ def update_outputs(
         },
     }
 
-    potentials = np.linspace(0.6, 1.3, 60)
-    activities = _activity_profile(catalyst, temperature, pH, potentials)
+    potentials, activities = _activity_profile(catalyst, temperature, pH, (0.6, 1.3))
     act_fig = {
         "data": [
             {
-                "x": potentials.tolist(),
+                "x": potentials,
                 "y": activities,
                 "mode": "lines",
                 "line": {"color": "#FFBF69", "width": 3},
@@ -624,14 +631,16 @@ def update_equation_detail(store_data, selected_rows):
     if not store_data:
         message = "Selecciona un punto en la tabla para visualizar las ecuaciones evaluadas."
         return message, [], message
+    columns = detail.CurveColumns.from_json(store_data["columns"])
     idx = 0
     if selected_rows:
-        idx = min(selected_rows[0], len(store_data) - 1)
-    detail_point = store_data[idx]
-    steps = detail_point["steps"]
-    contrib = detail_point["contributions"]
+        idx = min(selected_rows[0], len(columns) - 1)
+    steps = detail.merge_steps(
+        store_data["shared_steps"], store_data["steps"][idx], store_data["step_positions"]
+    )
+    contrib = columns[idx]
     summary_cards = [
-        html.H5(f"Detalle para i = {detail_point['current_density']:.3f} A/cm^2", className="mb-3"),
+        html.H5(f"Detalle para i = {contrib['current']:.3f} A/cm^2", className="mb-3"),
         dbc.Row(
             [
                 dbc.Col(dbc.Card([dbc.CardHeader("V ideal"), html.H4(f"{contrib['V_ideal']:.3f} V")]), md=3),
@@ -675,35 +684,8 @@ def update_equation_detail(store_data, selected_rows):
 def download_table(n_clicks, store_data):
     if not n_clicks or not store_data:
         raise dash.exceptions.PreventUpdate
-    buffer = io.StringIO()
-    writer = csv.writer(buffer)
-    writer.writerow(
-        [
-            "current_density",
-            "voltage",
-            "V_ideal",
-            "eta_act_total",
-            "eta_act_an",
-            "eta_act_cat",
-            "eta_ohm",
-            "eta_conc",
-        ]
-    )
-    for point in store_data:
-        contrib = point["contributions"]
-        writer.writerow(
-            [
-                f"{point['current_density']:.6f}",
-                f"{point['voltage']:.6f}",
-                f"{contrib['V_ideal']:.6f}",
-                f"{contrib['eta_act_total']:.6f}",
-                f"{contrib['eta_act_an']:.6f}",
-                f"{contrib['eta_act_cat']:.6f}",
-                f"{contrib['eta_ohm']:.6f}",
-                f"{contrib['eta_conc']:.6f}",
-            ]
-        )
-    return {"content": buffer.getvalue(), "filename": "curva_detallada.csv"}
+    content = detail.CurveColumns.from_json(store_data["columns"]).to_csv()
+    return {"content": content, "filename": "curva_detallada.csv"}
 
 
 if __name__ == "__main__":
@@ -9,14 +9,56 @@ Este paquete agrupa utilidades para:
 * Explorar el desempeno de catalizadores mediante funciones de mas alto nivel.
 """
 
-from . import constants, data, detail, electrochemistry, models, orr, simulation
+from . import (
+    catalog,
+    constants,
+    data,
+    detail,
+    electrochemistry,
+    equations,
+    fitting,
+    grid,
+    metrics,
+    microkinetics,
+    models,
+    orr,
+    parallel,
+    piecewise,
+    sampling,
+    screening,
+    sensitivity,
+    simulation,
+    stack,
+    streaming,
+    surrogate,
+    timeseries,
+    uncertainty,
+    volcano,
+)
 
 __all__ = [
+    "catalog",
     "constants",
     "data",
     "detail",
     "electrochemistry",
+    "equations",
+    "fitting",
+    "grid",
+    "metrics",
+    "microkinetics",
     "models",
     "orr",
+    "parallel",
+    "piecewise",
+    "sampling",
+    "screening",
+    "sensitivity",
     "simulation",
+    "stack",
+    "streaming",
+    "surrogate",
+    "timeseries",
+    "uncertainty",
+    "volcano",
 ]
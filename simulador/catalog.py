@@ -0,0 +1,490 @@
+"""Catalogos de catalizadores en columnas: lectura y escritura por bloques."""
+
+from __future__ import annotations
+
+import csv
+import itertools
+import math
+import pathlib
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .models import Catalyst, IntermediateData
+from .orr import (
+    ASSOCIATIVE_DEFAULT_INTERCEPT,
+    ASSOCIATIVE_DEFAULT_SLOPE,
+    INTERMEDIATE_FIELDS,
+    CatalystArrays,
+    IntermediateArrays,
+)
+from .streaming import _npy_header
+
+DEFAULT_CHUNK_SIZE = 65_536
+
+FLOAT_COLUMNS = (
+    "d_e_o",
+    "d_e_oh",
+    "delta_g1_u0",
+    "delta_g2_u0",
+    "dissociation_barrier",
+    "associative_linear_coeff",
+    "associative_intercept",
+)
+"""Columnas escalares de :class:`~simulador.models.Catalyst`; NaN representa ``None``."""
+
+INTERMEDIATES = ("O*", "OH*")
+
+INTERMEDIATE_COLUMNS = tuple(
+    f"{key}.{name}" for key in INTERMEDIATES for name in INTERMEDIATE_FIELDS
+)
+"""Tablas de intermedios aplanadas como ``"O*.delta_e"``; NaN si el catalizador no las tiene."""
+
+COLUMNS = ("name",) + FLOAT_COLUMNS + INTERMEDIATE_COLUMNS
+
+PathLike = Union[str, pathlib.Path]
+
+
+def catalyst_columns(catalysts: Sequence[Catalyst]) -> Dict[str, np.ndarray]:
+    """Columnas numericas de ``catalysts`` (:data:`FLOAT_COLUMNS` e intermedios)."""
+
+    columns = {
+        name: np.array(
+            [np.nan if getattr(c, name) is None else getattr(c, name) for c in catalysts],
+            dtype=float,
+        )
+        for name in FLOAT_COLUMNS
+    }
+    for key in INTERMEDIATES:
+        data = [c.intermediates.get(key) for c in catalysts]
+        for name in INTERMEDIATE_FIELDS:
+            columns[f"{key}.{name}"] = np.array(
+                [np.nan if item is None else getattr(item, name) for item in data], dtype=float
+            )
+    return columns
+
+
+def arrays_from_columns(
+    names: Sequence[str], columns: Mapping[str, np.ndarray]
+) -> CatalystArrays:
+    """Arma un :class:`~simulador.orr.CatalystArrays` a partir de columnas del catalogo.
+
+    Aplica los coeficientes asociativos por defecto donde la columna es NaN. Lanza ``KeyError``
+    si un catalizador tiene datos de solo uno de los intermedios, como la version escalar.
+    """
+
+    present = {key: ~np.isnan(columns[f"{key}.delta_e"]) for key in INTERMEDIATES}
+    partial = present["O*"] != present["OH*"]
+    if partial.any():
+        row = int(np.flatnonzero(partial)[0])
+        missing = "O*" if present["OH*"][row] else "OH*"
+        raise KeyError(f"No hay datos para el intermedio {missing} en {names[row]}.")
+
+    def intermediates(key: str) -> IntermediateArrays:
+        return IntermediateArrays(
+            **{
+                name: np.asarray(columns[f"{key}.{name}"], dtype=float)
+                for name in INTERMEDIATE_FIELDS
+            }
+        )
+
+    slope = np.asarray(columns["associative_linear_coeff"], dtype=float)
+    intercept = np.asarray(columns["associative_intercept"], dtype=float)
+    return CatalystArrays(
+        names=tuple(names),
+        d_e_o=np.asarray(columns["d_e_o"], dtype=float),
+        d_e_oh=np.asarray(columns["d_e_oh"], dtype=float),
+        delta_g1_u0=np.asarray(columns["delta_g1_u0"], dtype=float),
+        delta_g2_u0=np.asarray(columns["delta_g2_u0"], dtype=float),
+        dissociation_barrier=np.asarray(columns["dissociation_barrier"], dtype=float),
+        associative_slope=np.where(np.isnan(slope), ASSOCIATIVE_DEFAULT_SLOPE, slope),
+        associative_intercept=np.where(
+            np.isnan(intercept), ASSOCIATIVE_DEFAULT_INTERCEPT, intercept
+        ),
+        has_intermediates=present["O*"],
+        o=intermediates("O*"),
+        oh=intermediates("OH*"),
+    )
+
+
+def iter_catalyst_chunks(
+    catalysts: Iterable[Catalyst], chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[CatalystArrays]:
+    """Empaqueta un iterable de ``Catalyst`` en bloques de a lo sumo ``chunk_size``."""
+
+    if chunk_size <= 0:
+        raise ValueError("El tamano de bloque debe ser positivo.")
+    iterator = iter(catalysts)
+    while True:
+        block = list(itertools.islice(iterator, chunk_size))
+        if not block:
+            return
+        yield CatalystArrays.from_catalysts(block)
+
+
+def _format(value: float) -> str:
+    return "" if math.isnan(value) else repr(float(value))
+
+
+def write_catalog_csv(
+    catalysts: Iterable[Catalyst],
+    path: PathLike,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> int:
+    """Escribe ``catalysts`` en un CSV con las columnas de :data:`COLUMNS`; devuelve las filas.
+
+    Los campos ``None`` y los intermedios ausentes quedan como celdas vacias.
+    """
+
+    rows = 0
+    with open(path, "w", newline="") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(COLUMNS)
+        iterator = iter(catalysts)
+        while True:
+            block = list(itertools.islice(iterator, chunk_size))
+            if not block:
+                break
+            columns = catalyst_columns(block)
+            for row, catalyst in enumerate(block):
+                writer.writerow(
+                    [catalyst.name] + [_format(columns[name][row]) for name in COLUMNS[1:]]
+                )
+            rows += len(block)
+    return rows
+
+
+def _iter_csv_columns(
+    path: PathLike, chunk_size: int
+) -> Iterator[Tuple[List[str], Dict[str, np.ndarray]]]:
+    if chunk_size <= 0:
+        raise ValueError("El tamano de bloque debe ser positivo.")
+    with open(path, newline="") as handle:
+        reader = csv.reader(handle)
+        header = next(reader)
+        if "name" not in header:
+            raise ValueError("El catalogo debe tener una columna 'name'.")
+        position = {name: header.index(name) for name in COLUMNS if name in header}
+        while True:
+            rows = list(itertools.islice(reader, chunk_size))
+            if not rows:
+                return
+            names = [row[position["name"]] for row in rows]
+            columns = {}
+            for name in COLUMNS[1:]:
+                if name not in position:
+                    columns[name] = np.full(len(rows), np.nan)
+                    continue
+                index = position[name]
+                columns[name] = np.array(
+                    [float(row[index]) if row[index] else np.nan for row in rows], dtype=float
+                )
+            yield names, columns
+
+
+def iter_catalog_csv(
+    path: PathLike, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[CatalystArrays]:
+    """Lee un catalogo CSV por bloques sin construir ``Catalyst``; la memoria queda acotada.
+
+    Las columnas que falten en el archivo se toman como NaN (``None`` o intermedio ausente).
+    """
+
+    for names, columns in _iter_csv_columns(path, chunk_size):
+        yield arrays_from_columns(names, columns)
+
+
+# --- Almacen columnar en disco -----------------------------------------------------------
+#
+# Un directorio con un ``.npy`` por columna numerica (abiertos con ``mmap_mode="r"``), los nombres
+# concatenados en UTF-8 (``names.bin`` + ``name_offsets.npy``) y un indice ``name_index.npy`` con
+# las filas ordenadas por nombre para buscar por busqueda binaria sin cargar el catalogo.
+
+_NAMES_FILE = "names.bin"
+_OFFSETS_FILE = "name_offsets.npy"
+_INDEX_FILE = "name_index.npy"
+
+
+def _column_file(column: str) -> str:
+    """``"O*.delta_e"`` -> ``"o.delta_e.npy"`` (sin ``*`` para que sirva en Windows)."""
+
+    return column.replace("*", "").lower() + ".npy"
+
+
+def _name_keys(names: np.ndarray, offsets: np.ndarray, rows: np.ndarray) -> np.ndarray:
+    """Nombres de ``rows`` como arreglo ``S`` de ancho fijo (ordena igual que ``bytes``)."""
+
+    start = np.asarray(offsets[rows])
+    length = np.asarray(offsets[rows + 1]) - start
+    width = max(int(length.max(initial=0)), 1)
+    columns = np.arange(width)
+    inside = columns < length[:, np.newaxis]
+    matrix = np.zeros((rows.size, width), dtype=np.uint8)
+    matrix[inside] = names[(start[:, np.newaxis] + columns)[inside]]
+    return matrix.view(f"S{width}").ravel()
+
+
+def _write_name_index(
+    directory: pathlib.Path, offsets: np.ndarray, rows: int, block: int = DEFAULT_CHUNK_SIZE
+) -> None:
+    """Escribe ``name_index.npy`` (filas ordenadas por nombre) con memoria acotada.
+
+    Cada bloque de ``block`` filas se ordena con ``argsort`` estable sobre claves ``S`` y se
+    guarda como tramo ordenado; luego los tramos se mezclan por lotes. Los nombres repetidos
+    quedan en orden de fila, asi que :meth:`CatalogStore.index` devuelve la primera.
+    """
+
+    if rows == 0:
+        np.save(directory / _INDEX_FILE, np.zeros(0, dtype=np.int64))
+        return
+    names = np.memmap(directory / _NAMES_FILE, dtype=np.uint8, mode="r") if offsets[-1] else None
+    names = np.zeros(0, dtype=np.uint8) if names is None else names
+    runs_path = directory / (_INDEX_FILE + ".tmp")
+    runs = np.lib.format.open_memmap(runs_path, mode="w+", dtype=np.int64, shape=(rows,))
+    bounds = []
+    for start in range(0, rows, block):
+        stop = min(start + block, rows)
+        keys = _name_keys(names, offsets, np.arange(start, stop))
+        runs[start:stop] = start + np.argsort(keys, kind="stable")
+        bounds.append([start, stop])
+
+    index = np.lib.format.open_memmap(
+        directory / _INDEX_FILE, mode="w+", dtype=np.int64, shape=(rows,)
+    )
+    batch = max(1024, block // len(bounds))
+    buffers = [np.zeros(0, dtype=np.int64) for _ in bounds]
+    keys = [np.zeros(0, dtype="S1") for _ in bounds]
+
+    def refill(run: int) -> None:
+        position, stop = bounds[run]
+        more = np.array(runs[position : min(position + batch, stop)])
+        buffers[run] = np.concatenate([buffers[run], more])
+        keys[run] = np.concatenate([keys[run], _name_keys(names, offsets, more)])
+        bounds[run][0] = position + more.size
+
+    for run in range(len(bounds)):
+        refill(run)
+    written = 0
+    while written < rows:
+        # Solo limitan los tramos con filas sin cargar: nada por encima de su ultima clave
+        # cargada puede salir todavia.
+        pending = [r for r in range(len(bounds)) if bounds[r][0] < bounds[r][1]]
+        limit = min((keys[r][-1] for r in pending), default=None)
+        take = [
+            key.size if limit is None else int(np.searchsorted(key, limit, "left"))
+            for key in keys
+        ]
+        if not any(take):
+            # Todas las claves cargadas de los tramos limitantes son iguales a ``limit``: se
+            # cargan mas filas hasta ver una clave mayor (o agotar el tramo).
+            for r in pending:
+                if keys[r][-1] == limit:
+                    refill(r)
+            continue
+        # Tramos concatenados en orden de fila: el orden estable conserva los empates.
+        batch_keys = np.concatenate([key[:n] for key, n in zip(keys, take)])
+        batch_rows = np.concatenate([rows_[:n] for rows_, n in zip(buffers, take)])
+        order = np.argsort(batch_keys, kind="stable")
+        index[written : written + order.size] = batch_rows[order]
+        written += order.size
+        for r, n in enumerate(take):
+            buffers[r], keys[r] = buffers[r][n:], keys[r][n:]
+            if buffers[r].size == 0 and bounds[r][0] < bounds[r][1]:
+                refill(r)
+    index.flush()
+    del index, runs
+    runs_path.unlink()
+
+
+class CatalogStoreWriter:
+    """Escribe un catalogo por bloques en un directorio columnar (ver :class:`CatalogStore`)."""
+
+    def __init__(self, directory: PathLike) -> None:
+        self.directory = pathlib.Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.rows = 0
+        self._name_bytes = 0
+        self._offsets = [np.zeros(1, dtype=np.int64)]
+        self._names = open(self.directory / _NAMES_FILE, "wb")
+        self._handles = {}
+        for column in FLOAT_COLUMNS + INTERMEDIATE_COLUMNS:
+            handle = open(self.directory / _column_file(column), "wb")
+            handle.write(_npy_header(np.dtype(float), 0))
+            self._handles[column] = handle
+
+    def write_columns(self, names: Sequence[str], columns: Mapping[str, np.ndarray]) -> None:
+        """Agrega un bloque dado como columnas (las que falten se escriben como NaN)."""
+
+        encoded = [name.encode("utf-8") for name in names]
+        self._names.write(b"".join(encoded))
+        lengths = np.fromiter((len(item) for item in encoded), dtype=np.int64, count=len(encoded))
+        self._offsets.append(self._name_bytes + np.cumsum(lengths))
+        self._name_bytes += int(lengths.sum())
+        for column, handle in self._handles.items():
+            values = columns.get(column)
+            if values is None:
+                values = np.full(len(names), np.nan)
+            handle.write(np.ascontiguousarray(values, dtype=float).tobytes())
+        self.rows += len(names)
+
+    def write(self, catalysts: Sequence[Catalyst]) -> None:
+        self.write_columns([c.name for c in catalysts], catalyst_columns(catalysts))
+
+    def close(self) -> None:
+        if self._names.closed:
+            return
+        self._names.close()
+        for handle in self._handles.values():
+            handle.seek(0)
+            handle.write(_npy_header(np.dtype(float), self.rows))
+            handle.close()
+        offsets = np.concatenate(self._offsets)
+        np.save(self.directory / _OFFSETS_FILE, offsets)
+        _write_name_index(self.directory, offsets, self.rows)
+
+    def __enter__(self) -> "CatalogStoreWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def write_catalog_store(
+    source: Union[PathLike, Iterable[Catalyst]],
+    directory: PathLike,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> int:
+    """Convierte un CSV (:func:`write_catalog_csv`) o un iterable de ``Catalyst`` en un
+    :class:`CatalogStore`; devuelve el numero de filas."""
+
+    with CatalogStoreWriter(directory) as writer:
+        if isinstance(source, (str, pathlib.Path)):
+            for names, columns in _iter_csv_columns(source, chunk_size):
+                writer.write_columns(names, columns)
+        else:
+            iterator = iter(source)
+            while True:
+                block = list(itertools.islice(iterator, chunk_size))
+                if not block:
+                    break
+                writer.write(block)
+    return writer.rows
+
+
+class CatalogStore:
+    """Catalogo columnar en disco, abierto de forma perezosa con ``np.load(mmap_mode="r")``.
+
+    Solo se leen las columnas y filas que se usan; ``Catalyst`` se materializa a pedido con
+    :meth:`catalyst`. Las busquedas por nombre usan el indice ordenado (``O(log n)``). Si hay
+    nombres repetidos, :meth:`index` devuelve la primera fila.
+
+    El esquema solo guarda los intermedios de :data:`INTERMEDIATES` (O* y OH*): al escribir se
+    descartan los demas, y :meth:`catalyst` devuelve un ``Catalyst`` solo con esos dos.
+    """
+
+    def __init__(self, directory: PathLike) -> None:
+        self.directory = pathlib.Path(directory)
+        self._columns: Dict[str, np.ndarray] = {}
+        self._offsets = np.load(self.directory / _OFFSETS_FILE, mmap_mode="r")
+        self._index = np.load(self.directory / _INDEX_FILE, mmap_mode="r")
+        size = int(self._offsets[-1])
+        self._names = (
+            np.memmap(self.directory / _NAMES_FILE, dtype=np.uint8, mode="r")
+            if size
+            else np.zeros(0, dtype=np.uint8)
+        )
+
+    def __len__(self) -> int:
+        return self._offsets.size - 1
+
+    def column(self, column: str) -> np.ndarray:
+        """Columna de :data:`FLOAT_COLUMNS` o :data:`INTERMEDIATE_COLUMNS` (memmap de lectura)."""
+
+        if column not in self._columns:
+            if column not in FLOAT_COLUMNS + INTERMEDIATE_COLUMNS:
+                raise KeyError(f"Columna desconocida: {column}.")
+            self._columns[column] = np.load(self.directory / _column_file(column), mmap_mode="r")
+        return self._columns[column]
+
+    def _name_bytes(self, row: int) -> bytes:
+        return self._names[self._offsets[row] : self._offsets[row + 1]].tobytes()
+
+    def name(self, row: int) -> str:
+        return self._name_bytes(row).decode("utf-8")
+
+    def names(self, rows: slice = slice(None)) -> List[str]:
+        return [self.name(row) for row in range(len(self))[rows]]
+
+    def index(self, name: str) -> int:
+        """Fila de ``name``; lanza ``KeyError`` si no esta en el catalogo."""
+
+        key = name.encode("utf-8")
+        low, high = 0, len(self)
+        while low < high:
+            middle = (low + high) // 2
+            if self._name_bytes(int(self._index[middle])) < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low < len(self):
+            row = int(self._index[low])
+            if self._name_bytes(row) == key:
+                return row
+        raise KeyError(f"No hay un catalizador llamado {name} en el catalogo.")
+
+    def __contains__(self, name: object) -> bool:
+        try:
+            self.index(name)  # type: ignore[arg-type]
+        except (KeyError, AttributeError):
+            return False
+        return True
+
+    def catalyst(self, key: Union[str, int]) -> Catalyst:
+        """Materializa el ``Catalyst`` de una fila (o de un nombre)."""
+
+        row = self.index(key) if isinstance(key, str) else int(key)
+        if not 0 <= row < len(self):
+            raise IndexError(row)
+
+        def value(column: str) -> Optional[float]:
+            number = float(self.column(column)[row])
+            return None if math.isnan(number) else number
+
+        intermediates = {}
+        for key_name in INTERMEDIATES:
+            if value(f"{key_name}.delta_e") is None:
+                continue
+            data = {name: value(f"{key_name}.{name}") for name in INTERMEDIATE_FIELDS}
+            intermediates[key_name] = IntermediateData(
+                delta_e=data["delta_e"],
+                delta_zpe=data["delta_zpe"],
+                delta_s=data["delta_s"],
+                electrons=int(data["electrons"]),
+                protons=int(data["protons"]),
+            )
+        return Catalyst(
+            name=self.name(row),
+            d_e_o=value("d_e_o"),
+            d_e_oh=value("d_e_oh"),
+            delta_g1_u0=value("delta_g1_u0"),
+            delta_g2_u0=value("delta_g2_u0"),
+            dissociation_barrier=value("dissociation_barrier"),
+            intermediates=intermediates,
+            associative_linear_coeff=value("associative_linear_coeff"),
+            associative_intercept=value("associative_intercept"),
+        )
+
+    def arrays(self, rows: slice = slice(None)) -> CatalystArrays:
+        """Bloque contiguo de filas como :class:`~simulador.orr.CatalystArrays`."""
+
+        columns = {
+            column: np.array(self.column(column)[rows], dtype=float)
+            for column in FLOAT_COLUMNS + INTERMEDIATE_COLUMNS
+        }
+        return arrays_from_columns(self.names(rows), columns)
+
+    def iter_chunks(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[CatalystArrays]:
+        if chunk_size <= 0:
+            raise ValueError("El tamano de bloque debe ser positivo.")
+        for start in range(0, len(self), chunk_size):
+            yield self.arrays(slice(start, start + chunk_size))
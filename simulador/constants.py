@@ -16,6 +16,7 @@ class PhysicalConstants:
     boltzmann: float = 1.380649e-23  # J/K
     electron_charge: float = 1.602176634e-19  # C
     planck: float = 6.62607015e-34  # J.s
+    molar_mass_h2: float = 2.01588e-3  # kg/mol
 
     @property
     def ev_to_joule(self) -> float:
@@ -26,4 +27,6 @@ class PhysicalConstants:
         return 1.0 / self.electron_charge
 
 
+JOULE_TO_KWH = 1.0 / 3.6e6  # kWh/J
+
 CONSTANTS = PhysicalConstants()
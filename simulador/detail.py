@@ -2,31 +2,18 @@
 
 from __future__ import annotations
 
-import math
+import io
+from collections.abc import Mapping, Sequence
 from dataclasses import dataclass
-from typing import Dict, List
+from typing import Dict, Iterable, Iterator, List, Optional
 
-from .constants import CONSTANTS, PhysicalConstants
-from .electrochemistry import arrhenius
-from .models import ElectrolyzerConfig, ElectrodeKinetics
-
-
-@dataclass
-class EquationStep:
-    """Representa una ecuacion y los valores utilizados en un paso."""
+import numpy as np
 
-    name: str
-    expression: str
-    values: Dict[str, float]
-    result: float
-
-    def to_dict(self) -> Dict[str, float]:
-        return {
-            "name": self.name,
-            "expression": self.expression,
-            "values": self.values,
-            "result": self.result,
-        }
+from .constants import CONSTANTS, PhysicalConstants
+from .electrochemistry import ConfigKernel, PolarizationArrays, compile_config
+from .equations import REGISTRY, TRACE_ORDER, EquationStep
+from .models import ElectrolyzerConfig
+from .sampling import DEFAULT_TOLERANCE, adaptive_currents
 
 
 @dataclass
@@ -55,73 +42,53 @@ class PointDetail:
         }
 
 
-def _exchange_current_detail(
-    kinetics: ElectrodeKinetics,
-    temperature: float,
-    constants: PhysicalConstants,
-) -> EquationStep:
-    if kinetics.activation_energy is None:
-        value = kinetics.i0_ref
-        expression = "i0 = i0_ref"
-        values = {"i0_ref": kinetics.i0_ref}
-    else:
-        exponent = (-kinetics.activation_energy / constants.gas_constant) * (
-            1.0 / temperature - 1.0 / kinetics.reference_temperature
-        )
-        value = kinetics.i0_ref * math.exp(exponent)
-        expression = "i0 = i0_ref * exp(-Ea/R * (1/T - 1/Tref))"
-        values = {
-            "i0_ref": kinetics.i0_ref,
-            "Ea": kinetics.activation_energy,
-            "R": constants.gas_constant,
-            "T": temperature,
-            "Tref": kinetics.reference_temperature,
-            "exponent": exponent,
-        }
-    return EquationStep(
-        name=f"Corriente de intercambio {kinetics.name}",
-        expression=expression,
-        values=values,
-        result=value,
-    )
+def _shared_steps(kernel: ConfigKernel) -> List[EquationStep]:
+    """Pasos que solo dependen de la temperatura: voltaje ideal y corrientes de intercambio."""
 
+    return kernel.trace()[1]
 
-def _activation_step(
-    current_density: float,
-    kinetics: ElectrodeKinetics,
-    temperature: float,
-    constants: PhysicalConstants,
-) -> List[EquationStep]:
-    steps = []
-    i0_step = _exchange_current_detail(kinetics, temperature, constants)
-    steps.append(i0_step)
-    i0 = i0_step.result
-    if i0 <= 0:
-        raise ValueError("La corriente de intercambio debe ser positiva.")
-    prefactor = (
-        constants.gas_constant
-        * temperature
-        / (kinetics.alpha * kinetics.electrons * constants.faraday)
-    )
-    eta = prefactor * math.log(current_density / i0)
-    steps.append(
-        EquationStep(
-            name=f"Sobrepotencial activacion {kinetics.name}",
-            expression="eta = (RT/(alpha*nF)) * ln(i/i0)",
-            values={
-                "R": constants.gas_constant,
-                "T": temperature,
-                "alpha": kinetics.alpha,
-                "n": kinetics.electrons,
-                "F": constants.faraday,
-                "i": current_density,
-                "i0": i0,
-                "prefactor": prefactor,
-            },
-            result=eta,
-        )
+
+def _point_trace(current_density: float, kernel: ConfigKernel):
+    """Etapa ``"point"`` del registro con traza; lanza ``ValueError`` si el punto es invalido."""
+
+    env = dict(kernel.trace()[0])
+    env["current_density"] = current_density
+    return REGISTRY.compile_traced("point")(env)
+
+
+def _point_steps(current_density: float, kernel: ConfigKernel) -> List[EquationStep]:
+    """Pasos que dependen de la corriente, en el orden de la traza."""
+
+    return _point_trace(current_density, kernel)[1]
+
+
+_CONTRIBUTIONS = ("V_ideal", "eta_act_an", "eta_act_cat", "eta_act_total", "eta_ohm", "eta_conc")
+
+
+def step_positions() -> Dict[str, List[int]]:
+    """Posicion en la traza completa de cada paso de las etapas ``"config"`` y ``"point"``."""
+
+    return {stage: REGISTRY.trace_positions(stage, TRACE_ORDER) for stage in ("config", "point")}
+
+
+def merge_steps(
+    shared: Sequence, point: Sequence, positions: Optional[Mapping[str, Sequence[int]]] = None
+) -> list:
+    """Reconstruye la traza completa a partir de los pasos compartidos y los del punto.
+
+    ``positions`` (por defecto :func:`step_positions`) indica donde va cada paso de las etapas
+    ``"config"`` y ``"point"``, de modo que el resultado sigue
+    :data:`~simulador.equations.TRACE_ORDER`.
+    Sirve igual para :class:`EquationStep` o sus ``to_dict()``.
+    """
+
+    if positions is None:
+        positions = step_positions()
+    placed = sorted(
+        [*zip(positions["config"], shared), *zip(positions["point"], point)],
+        key=lambda item: item[0],
     )
-    return steps
+    return [step for _, step in placed]
 
 
 def evaluate_point(
@@ -129,156 +96,300 @@ def evaluate_point(
     config: ElectrolyzerConfig,
     constants: PhysicalConstants = CONSTANTS,
 ) -> PointDetail:
-    """Calcula un punto con trazabilidad completa."""
-
-    if current_density <= 0:
-        raise ValueError("La densidad de corriente debe ser positiva.")
-
-    steps: List[EquationStep] = []
-    conds = config.conditions
-    thermo = config.thermo
-    temperature = conds.temperature
-    n = thermo.electrons
-    R = constants.gas_constant
-    F = constants.faraday
-
-    V_std = thermo.standard_potential(temperature, constants)
-    quotient = (
-        conds.pressure_h2 * math.sqrt(max(conds.pressure_o2, 1e-12)) / max(conds.activity_h2o, 1e-12)
-    )
-    nernst_prefactor = R * temperature / (n * F)
-    nernst_term = nernst_prefactor * math.log(quotient)
-    V_ideal = V_std + nernst_term
-    steps.append(
-        EquationStep(
-            name="Voltaje ideal",
-            expression="V = Vstd + (RT/(nF)) * ln(Q)",
-            values={
-                "Vstd": V_std,
-                "R": R,
-                "T": temperature,
-                "n": n,
-                "F": F,
-                "Q": quotient,
-                "ln(Q)": math.log(quotient),
-                "prefactor": nernst_prefactor,
-            },
-            result=V_ideal,
-        )
-    )
+    """Calcula un punto con trazabilidad completa.
 
-    activation_steps_anode = _activation_step(
-        current_density, config.kinetics_anode, temperature, constants
-    )
-    activation_steps_cathode = _activation_step(
-        current_density, config.kinetics_cathode, temperature, constants
-    )
-    steps.extend(activation_steps_anode)
-    steps.extend(activation_steps_cathode)
-    eta_act_an = activation_steps_anode[-1].result
-    eta_act_cat = activation_steps_cathode[-1].result
-    eta_act_total = eta_act_an + eta_act_cat
-    steps.append(
-        EquationStep(
-            name="Sobrepotencial activacion total",
-            expression="eta_act = eta_an + eta_cat",
-            values={"eta_an": eta_act_an, "eta_cat": eta_act_cat},
-            result=eta_act_total,
-        )
+    Los invariantes de temperatura salen del kernel memorizado de la configuracion
+    (:func:`~simulador.electrochemistry.compile_config`).
+    """
+
+    return _evaluate_with_kernel(
+        current_density, config, compile_config(config, constants), constants
     )
 
-    conductivity = arrhenius(
-        config.ohmic.conductivity_ref,
-        config.ohmic.activation_energy,
-        temperature,
-        config.ohmic.reference_temperature,
-        constants,
+
+def _evaluate_with_kernel(
+    current_density: float,
+    config: ElectrolyzerConfig,
+    kernel: ConfigKernel,
+    constants: PhysicalConstants,
+    shared: Optional[List[EquationStep]] = None,
+    positions: Optional[Mapping[str, Sequence[int]]] = None,
+) -> PointDetail:
+    env, point = _point_trace(current_density, kernel)
+    if shared is None:
+        shared = _shared_steps(kernel)
+    contributions = {name: env[name] for name in _CONTRIBUTIONS}
+    return PointDetail(
+        current_density=current_density,
+        voltage=env["voltage"],
+        contributions=contributions,
+        steps=merge_steps(shared, point, positions),
     )
-    if conductivity <= 0:
-        raise ValueError("La conductividad debe ser positiva.")
-    r_membrane = config.ohmic.membrane_thickness_cm / conductivity
-    r_total = r_membrane + config.ohmic.contact_resistance + config.ohmic.electrolyte_resistance
-    eta_ohm = current_density * r_total
-    steps.append(
-        EquationStep(
-            name="Perdida ohmica",
-            expression="eta_ohm = i * (t_mem/kappa + R_contact + R_electrolito)",
-            values={
-                "i": current_density,
-                "t_mem": config.ohmic.membrane_thickness_cm,
-                "kappa": conductivity,
-                "R_contact": config.ohmic.contact_resistance,
-                "R_electrolito": config.ohmic.electrolyte_resistance,
-                "R_total": r_total,
-            },
-            result=eta_ohm,
+
+
+TABLE_COLUMNS = (
+    "current",
+    "voltage",
+    "V_ideal",
+    "eta_act_an",
+    "eta_act_cat",
+    "eta_act_total",
+    "eta_ohm",
+    "eta_conc",
+)
+"""Claves de :meth:`PointDetail.table_row`, en el mismo orden."""
+
+EXPORT_COLUMNS = (
+    "current_density",
+    "voltage",
+    "V_ideal",
+    "eta_act_total",
+    "eta_act_an",
+    "eta_act_cat",
+    "eta_ohm",
+    "eta_conc",
+)
+"""Columnas del CSV exportado (mismo encabezado que la descarga de la app)."""
+
+_STORED_COLUMNS = (
+    "current_density",
+    "voltage",
+    "V_ideal",
+    "eta_act_an",
+    "eta_act_cat",
+    "eta_ohm",
+    "eta_conc",
+)
+
+
+class RowView(Mapping):
+    """Fila de :class:`CurveColumns` con las mismas claves que :meth:`PointDetail.table_row`."""
+
+    __slots__ = ("_columns", "_index")
+
+    def __init__(self, columns: "CurveColumns", index: int) -> None:
+        self._columns = columns
+        self._index = index
+
+    def __getitem__(self, key: str) -> float:
+        if key not in TABLE_COLUMNS:
+            raise KeyError(key)
+        name = "current_density" if key == "current" else key
+        return float(getattr(self._columns, name)[self._index])
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(TABLE_COLUMNS)
+
+    def __len__(self) -> int:
+        return len(TABLE_COLUMNS)
+
+
+@dataclass
+class CurveColumns:
+    """Resultado columnar: un arreglo por contribucion en lugar de un objeto por punto.
+
+    ``columns[a:b]`` devuelve vistas (sin copiar) y ``columns[k]`` un :class:`RowView`.
+    """
+
+    current_density: np.ndarray
+    voltage: np.ndarray
+    V_ideal: np.ndarray
+    eta_act_an: np.ndarray
+    eta_act_cat: np.ndarray
+    eta_ohm: np.ndarray
+    eta_conc: np.ndarray
+
+    @classmethod
+    def from_arrays(cls, arrays: PolarizationArrays) -> "CurveColumns":
+        shape = np.shape(arrays.valid)
+        return cls(
+            **{
+                name: np.ascontiguousarray(np.broadcast_to(getattr(arrays, name), shape))
+                for name in _STORED_COLUMNS
+            }
         )
-    )
 
-    i_lim = arrhenius(
-        config.mass_transport.limit_current_ref,
-        config.mass_transport.activation_energy,
-        temperature,
-        config.mass_transport.reference_temperature,
-        constants,
-    )
-    if current_density >= i_lim:
-        raise ValueError("La densidad de corriente supera la corriente limite.")
-    conc_prefactor = R * temperature / (n * F)
-    eta_conc = conc_prefactor * math.log(i_lim / (i_lim - current_density))
-    steps.append(
-        EquationStep(
-            name="Perdida por concentracion",
-            expression="eta_conc = (RT/(nF)) * ln(i_lim / (i_lim - i))",
-            values={
-                "R": R,
-                "T": temperature,
-                "n": n,
-                "F": F,
-                "i_lim": i_lim,
-                "i": current_density,
-                "prefactor": conc_prefactor,
-            },
-            result=eta_conc,
+    @property
+    def eta_act_total(self) -> np.ndarray:
+        return self.eta_act_an + self.eta_act_cat
+
+    @property
+    def nbytes(self) -> int:
+        return sum(getattr(self, name).nbytes for name in _STORED_COLUMNS)
+
+    def __len__(self) -> int:
+        return self.current_density.size
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return CurveColumns(**{name: getattr(self, name)[index] for name in _STORED_COLUMNS})
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("Indice fuera de la curva.")
+        return RowView(self, index)
+
+    def rows(self) -> Iterator[RowView]:
+        return (RowView(self, k) for k in range(len(self)))
+
+    def table_rows(self) -> List[Dict[str, float]]:
+        """Filas como ``dict`` (equivalentes a ``table_row()``), convertidas por columna."""
+
+        values = [
+            getattr(self, "current_density" if key == "current" else key).tolist()
+            for key in TABLE_COLUMNS
+        ]
+        return [dict(zip(TABLE_COLUMNS, row)) for row in zip(*values)]
+
+    def to_csv(self, target=None, fmt: str = "%.6f") -> Optional[str]:
+        """Escribe :data:`EXPORT_COLUMNS` en ``target`` (ruta o archivo) o devuelve el texto."""
+
+        table = np.column_stack([getattr(self, name) for name in EXPORT_COLUMNS])
+        buffer = io.StringIO() if target is None else target
+        np.savetxt(
+            buffer, table, delimiter=",", fmt=fmt, header=",".join(EXPORT_COLUMNS), comments=""
         )
-    )
+        return buffer.getvalue() if target is None else None
+
+    def to_json(self) -> Dict[str, List[float]]:
+        """Diccionario columnar serializable (p. ej. para ``dcc.Store``)."""
+
+        return {name: getattr(self, name).tolist() for name in _STORED_COLUMNS}
+
+    @classmethod
+    def from_json(cls, data: Mapping[str, Sequence[float]]) -> "CurveColumns":
+        return cls(**{name: np.asarray(data[name], dtype=float) for name in _STORED_COLUMNS})
+
+
+class DetailedCurve(Sequence):
+    """Curva detallada con los numeros en :class:`CurveColumns`.
+
+    Los pasos (:class:`EquationStep`) no se construyen al evaluar la curva: ``curve[k]``
+    devuelve el :class:`PointDetail` completo del punto ``k`` (con el mismo contenido que
+    :func:`evaluate_point`) y :meth:`trace` solo sus pasos. Los pasos que solo dependen de la
+    temperatura (:attr:`shared_steps`) se calculan una vez por curva y se comparten entre
+    puntos. Los valores de :attr:`columns` salen de la evaluacion vectorizada y pueden diferir
+    de los de la traza en el ultimo bit de redondeo.
+    """
+
+    def __init__(
+        self,
+        currents: Iterable[float],
+        config: ElectrolyzerConfig,
+        constants: PhysicalConstants = CONSTANTS,
+    ) -> None:
+        self.config = config
+        self.constants = constants
+        self.kernel = compile_config(config, constants)
+        self._shared: Optional[List[EquationStep]] = None
+        self.step_positions = step_positions()
+        if not isinstance(currents, np.ndarray):
+            currents = np.fromiter(currents, dtype=float)
+        arrays = self.kernel.evaluate(currents.ravel())
+        self.columns = CurveColumns.from_arrays(arrays)
+        if not arrays.valid.all():
+            # Mismo error (y para el mismo punto) que la evaluacion punto a punto.
+            first = int(np.argmin(arrays.valid))
+            self._point(first)
+
+    def __len__(self) -> int:
+        return len(self.columns)
 
-    total_voltage = V_ideal + eta_act_total + eta_ohm + eta_conc
-    steps.append(
-        EquationStep(
-            name="Voltaje total",
-            expression="V_total = V + eta_act + eta_ohm + eta_conc",
-            values={
-                "V": V_ideal,
-                "eta_act": eta_act_total,
-                "eta_ohm": eta_ohm,
-                "eta_conc": eta_conc,
-            },
-            result=total_voltage,
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._point(k) for k in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("Indice fuera de la curva.")
+        return self._point(index)
+
+    def _point(self, index: int) -> PointDetail:
+        current = float(self.columns.current_density[index])
+        return _evaluate_with_kernel(
+            current,
+            self.config,
+            self.kernel,
+            self.constants,
+            self.shared_steps,
+            self.step_positions,
         )
-    )
 
-    contributions = {
-        "V_ideal": V_ideal,
-        "eta_act_an": eta_act_an,
-        "eta_act_cat": eta_act_cat,
-        "eta_act_total": eta_act_total,
-        "eta_ohm": eta_ohm,
-        "eta_conc": eta_conc,
-    }
-    return PointDetail(
-        current_density=current_density,
-        voltage=total_voltage,
-        contributions=contributions,
-        steps=steps,
-    )
+    @property
+    def current_density(self) -> np.ndarray:
+        return self.columns.current_density
+
+    @property
+    def voltage(self) -> np.ndarray:
+        return self.columns.voltage
+
+    @property
+    def shared_steps(self) -> List[EquationStep]:
+        """Voltaje ideal y corrientes de intercambio, comunes a todos los puntos."""
+
+        if self._shared is None:
+            self._shared = _shared_steps(self.kernel)
+        return self._shared
+
+    def point_steps(self, index: int) -> List[EquationStep]:
+        """Solo los pasos que dependen de la corriente del punto ``index``."""
+
+        current = float(self.columns.current_density[index])
+        return _point_steps(current, self.kernel)
+
+    def trace(self, index: int) -> List[EquationStep]:
+        """Pasos de ecuaciones del punto ``index``, construidos bajo demanda."""
+
+        return merge_steps(self.shared_steps, self.point_steps(index), self.step_positions)
+
+    def to_store(self) -> Dict:
+        """Serializacion compacta: columnas, pasos compartidos una vez y pasos por punto.
+
+        La traza completa de un punto se recupera con :func:`merge_steps` y las posiciones
+        guardadas en ``"step_positions"``.
+        """
+
+        return {
+            "columns": self.columns.to_json(),
+            "shared_steps": [step.to_dict() for step in self.shared_steps],
+            "step_positions": self.step_positions,
+            "steps": [
+                [step.to_dict() for step in self.point_steps(k)] for k in range(len(self))
+            ],
+        }
+
+    def table_rows(self) -> List[Dict[str, float]]:
+        """Filas equivalentes a ``[p.table_row() for p in curve]`` sin construir los pasos."""
+
+        return self.columns.table_rows()
 
 
 def detailed_curve(
-    currents: List[float],
+    currents: Iterable[float],
     config: ElectrolyzerConfig,
     constants: PhysicalConstants = CONSTANTS,
-) -> List[PointDetail]:
-    """Evalua una lista de corrientes y regresa el detalle completo."""
+) -> DetailedCurve:
+    """Evalua una lista de corrientes; los pasos de cada punto se generan al pedirlos.
+
+    El resultado se comporta como la lista de :class:`PointDetail` de antes (``len``, indices,
+    iteracion), pero la evaluacion es una sola pasada vectorizada.
+    """
 
-    return [evaluate_point(i, config, constants) for i in currents]
+    return DetailedCurve(currents, config, constants)
+
+
+def adaptive_detailed_curve(
+    config: ElectrolyzerConfig,
+    current_min: float,
+    current_max: float,
+    tolerance: float = DEFAULT_TOLERANCE,
+    max_points: int = 2_000,
+    constants: PhysicalConstants = CONSTANTS,
+) -> DetailedCurve:
+    """:func:`detailed_curve` sobre las corrientes de
+    :func:`~simulador.sampling.adaptive_currents`."""
+
+    currents = adaptive_currents(
+        config, current_min, current_max, tolerance, max_points, constants=constants
+    )
+    return detailed_curve(currents, config, constants)
@@ -3,9 +3,15 @@
 from __future__ import annotations
 
 import math
-from typing import Iterable, List, Sequence
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
 
 from .constants import CONSTANTS, PhysicalConstants
+from .equations import REGISTRY, EquationStep, _exp, config_inputs
 from .models import (
     ElectrolyzerConfig,
     ElectrodeKinetics,
@@ -155,36 +161,535 @@ def cell_voltage(
 ) -> float:
     """Voltaje total de la celda."""
 
-    V_ideal = nernst_potential(config.conditions, config.thermo, constants)
-    eta_act = activation_overpotential(
-        current_density,
-        config.kinetics_anode,
-        config.kinetics_cathode,
-        config.conditions.temperature,
-        constants,
+    return compile_config(config, constants).voltage(current_density)
+
+
+def polarization_curve(
+    currents: Sequence[float],
+    config: ElectrolyzerConfig,
+    constants: PhysicalConstants = CONSTANTS,
+) -> List[float]:
+    """Calcula la curva de polarizacion (U vs i).
+
+    Usa la ruta vectorizada y, si algun punto es invalido, reproduce el error de
+    :func:`cell_voltage` para el primero de ellos.
+    """
+
+    result = polarization_arrays(currents, config, constants)
+    if not result.valid.all():
+        first = int(np.argmin(result.valid))
+        cell_voltage(float(result.current_density.flat[first]), config, constants)
+    return result.voltage.tolist()
+
+
+# --- Ruta vectorizada ---------------------------------------------------------------------------
+#
+# Las funciones ``*_array`` aceptan arreglos de NumPy (o cualquier secuencia) en la densidad de
+# corriente y en los campos numericos de los submodelos, que se combinan por broadcasting. En
+# lugar de lanzar ``ValueError`` devuelven ``(valores, validos)``: los puntos invalidos quedan en
+# ``NaN`` y la mascara booleana indica cuales se pudieron evaluar.
+
+
+def arrhenius_array(
+    value_ref,
+    activation_energy,
+    temperature,
+    reference_temperature,
+    constants: PhysicalConstants = CONSTANTS,
+) -> np.ndarray:
+    """Version vectorizada de :func:`arrhenius`."""
+
+    if activation_energy is None:
+        return np.asarray(value_ref, dtype=float)
+    factor = -np.asarray(activation_energy, dtype=float) / constants.gas_constant
+    exponent = factor * (1.0 / np.asarray(temperature, dtype=float) - 1.0 / reference_temperature)
+    return value_ref * _exp(exponent)
+
+
+def nernst_potential_array(
+    conditions: OperatingConditions,
+    thermo: ThermoModel,
+    constants: PhysicalConstants = CONSTANTS,
+) -> np.ndarray:
+    """Version vectorizada de :func:`nernst_potential`."""
+
+    temperature = np.asarray(conditions.temperature, dtype=float)
+    V_std = thermo.standard_potential(temperature, constants=constants)
+    quotient = (
+        conditions.pressure_h2
+        * np.sqrt(np.maximum(conditions.pressure_o2, 1e-12))
+        / np.maximum(conditions.activity_h2o, 1e-12)
+    )
+    with np.errstate(divide="ignore", invalid="ignore"):
+        nernst_term = (
+            constants.gas_constant
+            * temperature
+            / (thermo.electrons * constants.faraday)
+            * np.log(quotient)
+        )
+    return V_std + nernst_term
+
+
+def _tafel_array(current_density, i0, prefactor) -> Tuple[np.ndarray, np.ndarray]:
+    valid = (current_density > 0.0) & (i0 > 0.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        eta = prefactor * np.log(current_density / i0)
+    return np.where(valid, eta, np.nan), valid
+
+
+def _ohmic_array(current_density, resistance, conductivity) -> Tuple[np.ndarray, np.ndarray]:
+    valid = np.broadcast_to(conductivity > 0, np.broadcast(current_density, conductivity).shape)
+    eta = current_density * resistance
+    return np.where(valid, eta, np.nan), valid
+
+
+def _concentration_array(current_density, i_lim, prefactor) -> Tuple[np.ndarray, np.ndarray]:
+    valid = current_density < i_lim
+    with np.errstate(divide="ignore", invalid="ignore"):
+        eta = prefactor * np.log(i_lim / (i_lim - current_density))
+    return np.where(valid, eta, np.nan), valid
+
+
+def _tafel_prefactor(kinetics: ElectrodeKinetics, temperature, constants: PhysicalConstants):
+    return (
+        constants.gas_constant
+        * temperature
+        / (kinetics.alpha * kinetics.electrons * constants.faraday)
     )
-    eta_ohm = ohmic_overpotential(
-        current_density,
-        config.ohmic,
-        config.conditions.temperature,
+
+
+def _membrane_conductivity(ohmic: OhmicModel, temperature, constants: PhysicalConstants):
+    return arrhenius_array(
+        ohmic.conductivity_ref,
+        ohmic.activation_energy,
+        temperature,
+        ohmic.reference_temperature,
         constants,
     )
-    eta_conc = concentration_overpotential(
-        current_density,
-        config.mass_transport,
-        config.conditions.temperature,
-        config.thermo.electrons,
+
+
+def _total_resistance(ohmic: OhmicModel, conductivity):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        membrane_resistance = ohmic.membrane_thickness_cm / conductivity
+    return membrane_resistance + ohmic.contact_resistance + ohmic.electrolyte_resistance
+
+
+def _limit_current(mass_transport: MassTransportModel, temperature, constants: PhysicalConstants):
+    return arrhenius_array(
+        mass_transport.limit_current_ref,
+        mass_transport.activation_energy,
+        temperature,
+        mass_transport.reference_temperature,
         constants,
     )
-    return V_ideal + eta_act + eta_ohm + eta_conc
 
 
-def polarization_curve(
-    currents: Sequence[float],
+def activation_overpotential_array(
+    current_density,
+    kinetics_anode: ElectrodeKinetics,
+    kinetics_cathode: ElectrodeKinetics,
+    temperature,
+    constants: PhysicalConstants = CONSTANTS,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Sobrepotencial de activacion total para un arreglo de corrientes."""
+
+    current_density = np.asarray(current_density, dtype=float)
+    total = 0.0
+    valid = True
+    for kinetics in (kinetics_anode, kinetics_cathode):
+        i0 = arrhenius_array(
+            kinetics.i0_ref,
+            kinetics.activation_energy,
+            temperature,
+            kinetics.reference_temperature,
+            constants,
+        )
+        eta, ok = _tafel_array(
+            current_density, i0, _tafel_prefactor(kinetics, temperature, constants)
+        )
+        total = total + eta
+        valid = valid & ok
+    return total, valid
+
+
+def ohmic_overpotential_array(
+    current_density,
+    ohmic: OhmicModel,
+    temperature,
+    constants: PhysicalConstants = CONSTANTS,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Perdidas ohmicas para un arreglo de corrientes."""
+
+    conductivity = _membrane_conductivity(ohmic, temperature, constants)
+    return _ohmic_array(
+        np.asarray(current_density, dtype=float),
+        _total_resistance(ohmic, conductivity),
+        conductivity,
+    )
+
+
+def concentration_overpotential_array(
+    current_density,
+    mass_transport: MassTransportModel,
+    temperature,
+    electrons: int = 2,
+    constants: PhysicalConstants = CONSTANTS,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Sobrepotencial por transporte de masa para un arreglo de corrientes."""
+
+    prefactor = constants.gas_constant * temperature / (electrons * constants.faraday)
+    return _concentration_array(
+        np.asarray(current_density, dtype=float),
+        _limit_current(mass_transport, temperature, constants),
+        prefactor,
+    )
+
+
+@dataclass
+class PolarizationArrays:
+    """Curva de polarizacion vectorizada con su desglose y mascara de validez."""
+
+    current_density: np.ndarray
+    V_ideal: np.ndarray
+    eta_act_an: np.ndarray
+    eta_act_cat: np.ndarray
+    eta_ohm: np.ndarray
+    eta_conc: np.ndarray
+    valid: np.ndarray
+
+    @property
+    def eta_act_total(self) -> np.ndarray:
+        return self.eta_act_an + self.eta_act_cat
+
+    @property
+    def voltage(self) -> np.ndarray:
+        return self.V_ideal + self.eta_act_total + self.eta_ohm + self.eta_conc
+
+
+_LOSS_TERMS = ("eta_act_an", "eta_act_cat", "eta_ohm", "eta_conc")
+
+
+def polarization_arrays(
+    currents,
     config: ElectrolyzerConfig,
     constants: PhysicalConstants = CONSTANTS,
-) -> List[float]:
-    """Calcula la curva de polarizacion (U vs i)."""
+) -> PolarizationArrays:
+    """Evalua todos los terminos de la curva en una sola pasada vectorizada.
+
+    Los terminos que solo dependen de la temperatura (Nernst, i0, conductividad e i_lim) salen
+    del :class:`ConfigKernel` de la configuracion y no se recalculan por punto.
+    """
+
+    return compile_config(config, constants).evaluate(currents)
+
+
+def cell_voltage_array(
+    current_density,
+    config: ElectrolyzerConfig,
+    constants: PhysicalConstants = CONSTANTS,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Voltaje total de la celda para un arreglo de corrientes."""
+
+    result = polarization_arrays(current_density, config, constants)
+    return result.voltage, result.valid
+
+
+INVERSE_ITERATIONS = 20
+"""Iteraciones fijas del solver inverso i(V) (Newton con salvaguarda de biseccion)."""
+
+
+def current_at_voltage(
+    voltages,
+    config: ElectrolyzerConfig,
+    constants: PhysicalConstants = CONSTANTS,
+    iterations: int = INVERSE_ITERATIONS,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Inversa de :func:`cell_voltage`: densidad de corriente para cada voltaje objetivo.
+
+    ``config`` puede contener arreglos (ver :func:`simulador.grid.replace_fields`) para resolver
+    varias configuraciones a la vez; se combinan por broadcasting con ``voltages``.
+    """
+
+    return compile_config(config, constants).current_at_voltage(voltages, iterations)
+
+
+# --- Kernel de configuracion --------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class ConfigKernel:
+    """Invariantes de una configuracion a temperatura fija.
+
+    Agrupa todo lo que no depende de la corriente (potencial de Nernst, i0 de cada electrodo,
+    prefactores RT/(alpha nF), conductividad, resistencia total e i_lim). Los campos son
+    ``float`` para configuraciones escalares o arreglos si la configuracion los contiene. Se
+    calculan con la etapa ``"config"`` de :data:`~simulador.equations.REGISTRY`, cuyas
+    variables quedan en ``environment``.
+    """
+
+    config: ElectrolyzerConfig = field(repr=False, compare=False)
+    constants: PhysicalConstants = field(repr=False, compare=False)
+    temperature: float
+    V_std: float
+    quotient: float
+    ln_quotient: float
+    thermal_prefactor: float  # RT/(nF)
+    V_ideal: float
+    i0_exponent_anode: Optional[float]
+    i0_exponent_cathode: Optional[float]
+    i0_anode: float
+    i0_cathode: float
+    tafel_anode: float  # RT/(alpha n F)
+    tafel_cathode: float
+    conductivity: float
+    resistance: float  # Ohm.cm2
+    limit_current: float
+    environment: Dict[str, object] = field(default_factory=dict, repr=False, compare=False)
+    _trace: Optional[Tuple[Dict[str, object], List[EquationStep]]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def _activation(self, current_density: float, i0: float, prefactor: float, name: str) -> float:
+        if current_density <= 0.0:
+            raise ValueError("La densidad de corriente debe ser positiva para perdidas de activacion.")
+        if i0 <= 0.0:
+            raise ValueError(f"i0 invalido ({i0}) para {name}.")
+        return prefactor * math.log(current_density / i0)
+
+    def _losses(self, current_density: float) -> Tuple[float, float, float, float]:
+        eta_an = self._activation(
+            current_density, self.i0_anode, self.tafel_anode, self.config.kinetics_anode.name
+        )
+        eta_cat = self._activation(
+            current_density, self.i0_cathode, self.tafel_cathode, self.config.kinetics_cathode.name
+        )
+        if self.conductivity <= 0:
+            raise ValueError("La conductividad debe ser positiva.")
+        eta_ohm = current_density * self.resistance
+        if current_density >= self.limit_current:
+            raise ValueError("La densidad de corriente supera la corriente limite.")
+        eta_conc = self.thermal_prefactor * math.log(
+            self.limit_current / (self.limit_current - current_density)
+        )
+        return eta_an, eta_cat, eta_ohm, eta_conc
+
+    def breakdown(self, current_density: float) -> Dict[str, float]:
+        """Desglose escalar; lanza ``ValueError`` igual que las funciones por punto."""
+
+        eta_an, eta_cat, eta_ohm, eta_conc = self._losses(current_density)
+        return {
+            "V_ideal": self.V_ideal,
+            "eta_act_an": eta_an,
+            "eta_act_cat": eta_cat,
+            "eta_ohm": eta_ohm,
+            "eta_conc": eta_conc,
+        }
+
+    def voltage(self, current_density: float) -> float:
+        eta_an, eta_cat, eta_ohm, eta_conc = self._losses(current_density)
+        return self.V_ideal + (eta_an + eta_cat) + eta_ohm + eta_conc
+
+    def evaluate(self, currents) -> PolarizationArrays:
+        """Evalua un arreglo de corrientes sin lanzar errores (ver :class:`PolarizationArrays`)."""
+
+        current_density = np.asarray(currents, dtype=float)
+        env = dict(self.environment)
+        env["current_density"] = current_density
+        env, valid = REGISTRY.compile("point", _LOSS_TERMS)(env)
+        shape = np.broadcast_shapes(
+            np.shape(self.V_ideal), valid.shape, *(np.shape(env[name]) for name in _LOSS_TERMS)
+        )
+        return PolarizationArrays(
+            current_density=np.broadcast_to(current_density, shape),
+            V_ideal=np.broadcast_to(self.V_ideal, shape),
+            valid=np.broadcast_to(valid, shape),
+            **{name: np.broadcast_to(env[name], shape) for name in _LOSS_TERMS},
+        )
+
+    def trace(self) -> Tuple[Dict[str, object], List[EquationStep]]:
+        """Variables escalares y pasos de la etapa ``"config"`` (calculados una vez).
+
+        Solo para configuraciones escalares; es la base de las trazas de :mod:`simulador.detail`.
+        """
+
+        if self._trace is None:
+            inputs = config_inputs(self.config, self.constants, self.temperature)
+            object.__setattr__(self, "_trace", REGISTRY.compile_traced("config")(inputs))
+        return self._trace
+
+    def current_at_voltage(
+        self, voltages, iterations: int = INVERSE_ITERATIONS
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Resuelve V(i) = V objetivo para un arreglo de voltajes.
+
+        V(i) es monotona creciente en (0, i_lim), asi que la raiz queda acotada en ``u = ln(i)``
+        entre la solucion de Tafel pura (cota superior, recortada a i_lim) y la solucion de Tafel
+        desplazada por las perdidas ohmica y de concentracion en esa cota (cota inferior). Se
+        aplica Newton con salvaguarda de biseccion durante ``iterations`` pasos, sin criterio de
+        parada por punto. Devuelve ``(corriente, validos)``.
+        """
+
+        target = np.asarray(voltages, dtype=float)
+        slope = self.tafel_anode + self.tafel_cathode
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            offset = self.tafel_anode * np.log(self.i0_anode) + self.tafel_cathode * np.log(
+                self.i0_cathode
+            )
+            ln_limit = np.log(self.limit_current)
+            u_tafel = (target - self.V_ideal + offset) / slope
+            u_hi = np.minimum(u_tafel, ln_limit)
+            i_edge = np.minimum(np.exp(u_hi), self.limit_current * (1.0 - 1e-12))
+            extra = i_edge * self.resistance + self.thermal_prefactor * np.log(
+                self.limit_current / (self.limit_current - i_edge)
+            )
+            u_lo = np.minimum(u_tafel - extra / slope, u_hi)
+
+            valid = (
+                np.isfinite(target)
+                & (self.i0_anode > 0.0)
+                & (self.i0_cathode > 0.0)
+                & (self.conductivity > 0.0)
+                & (self.limit_current > 0.0)
+                & (slope > 0.0)
+                & np.isfinite(u_lo)
+                & np.isfinite(u_hi)
+            )
+            u_lo = np.where(valid, u_lo, 0.0)
+            u_hi = np.where(valid, u_hi, 0.0)
+            u = np.where(valid, np.log(i_edge), 0.0)
+            for _ in range(iterations):
+                current = np.exp(u)
+                gap = self.limit_current - current
+                residual = (
+                    self.V_ideal
+                    + slope * u
+                    - offset
+                    + current * self.resistance
+                    + self.thermal_prefactor * np.log(self.limit_current / gap)
+                    - target
+                )
+                residual = np.where(gap > 0.0, residual, np.inf)
+                above = residual > 0.0
+                u_hi = np.where(above, u, u_hi)
+                u_lo = np.where(above, u_lo, u)
+                # Newton en u = ln(i) donde domina Tafel y en w = ln(i_lim - i) donde domina
+                # el transporte de masa: en cada regimen V es casi lineal en su variable.
+                tafel_slope = slope / current
+                conc_slope = self.thermal_prefactor / gap
+                derivative = tafel_slope + self.resistance + conc_slope
+                step_u = u - residual / (current * derivative)
+                step_w = np.log(
+                    self.limit_current - gap * np.exp(residual / (gap * derivative))
+                )
+                conc_regime = conc_slope > tafel_slope
+                step = np.where(conc_regime, step_w, step_u)
+                # Biseccion en i si domina la concentracion y en ln(i) si domina Tafel.
+                middle = np.where(
+                    conc_regime,
+                    np.log(0.5 * (np.exp(u_lo) + np.exp(u_hi))),
+                    0.5 * (u_lo + u_hi),
+                )
+                inside = np.isfinite(step) & (step >= u_lo) & (step <= u_hi)
+                u = np.where(inside, step, middle)
+        return np.where(valid, np.exp(u), np.nan), valid
+
+
+def _as_scalar(value):
+    if value is None or type(value) is float:
+        return value
+    return float(value) if np.ndim(value) == 0 else value
+
+
+_KERNEL_FIELDS = (
+    "V_std",
+    "quotient",
+    "ln_quotient",
+    "thermal_prefactor",
+    "V_ideal",
+    "i0_exponent_anode",
+    "i0_exponent_cathode",
+    "i0_anode",
+    "i0_cathode",
+    "tafel_anode",
+    "tafel_cathode",
+    "conductivity",
+    "resistance",
+    "limit_current",
+)
+
+
+def build_kernel(
+    config: ElectrolyzerConfig,
+    constants: PhysicalConstants = CONSTANTS,
+    temperature=None,
+) -> ConfigKernel:
+    """Calcula los invariantes de ``config`` sin pasar por la cache."""
+
+    if temperature is None:
+        temperature = config.conditions.temperature
+    temperature = _as_scalar(np.asarray(temperature, dtype=float))
+    env, _ = REGISTRY.compile("config")(config_inputs(config, constants, temperature))
+    return ConfigKernel(
+        config=config,
+        constants=constants,
+        temperature=temperature,
+        environment=env,
+        **{name: _as_scalar(env[name]) for name in _KERNEL_FIELDS},
+    )
+
+
+KERNEL_CACHE_SIZE = 128
+"""Numero maximo de kernels memorizados por :func:`compile_config`."""
+
+_KERNEL_CACHE: "OrderedDict[tuple, ConfigKernel]" = OrderedDict()
+_KERNEL_LOCK = threading.Lock()
+
+
+def _config_key(config: ElectrolyzerConfig) -> tuple:
+    return (
+        tuple(config.thermo.__dict__.values()),
+        tuple(config.kinetics_anode.__dict__.values()),
+        tuple(config.kinetics_cathode.__dict__.values()),
+        tuple(config.ohmic.__dict__.values()),
+        tuple(config.mass_transport.__dict__.values()),
+        tuple(config.conditions.__dict__.values()),
+    )
+
+
+def compile_config(
+    config: ElectrolyzerConfig,
+    constants: PhysicalConstants = CONSTANTS,
+    temperature: float | None = None,
+) -> ConfigKernel:
+    """Devuelve el :class:`ConfigKernel` de ``config``, memorizado por (config, temperatura).
+
+    La clave se arma con los valores de los campos, por lo que modificar la configuracion
+    genera un kernel nuevo. Las configuraciones con arreglos (no hashables) no se memorizan.
+    """
+
+    # ``id(constants)`` es estable mientras la entrada viva: el kernel guarda una referencia.
+    key = (_config_key(config), temperature, id(constants))
+    try:
+        kernel = _KERNEL_CACHE.get(key)
+    except TypeError:
+        return build_kernel(config, constants, temperature)
+    if kernel is not None:
+        try:
+            _KERNEL_CACHE.move_to_end(key)
+        except KeyError:  # desalojado por otro hilo entre ``get`` y ``move_to_end``
+            pass
+        return kernel
+
+    kernel = build_kernel(config, constants, temperature)
+    with _KERNEL_LOCK:
+        _KERNEL_CACHE[key] = kernel
+        while len(_KERNEL_CACHE) > KERNEL_CACHE_SIZE:
+            _KERNEL_CACHE.popitem(last=False)
+    return kernel
+
 
-    return [cell_voltage(i, config, constants) for i in currents]
+def clear_kernel_cache() -> None:
+    """Vacia la cache de :func:`compile_config`."""
 
+    with _KERNEL_LOCK:
+        _KERNEL_CACHE.clear()
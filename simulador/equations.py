@@ -0,0 +1,553 @@
+"""Registro declarativo de ecuaciones compilado a evaluadores rapido y con traza.
+
+Cada ecuacion se declara una sola vez (nombre, expresion, entradas y funcion). El registro la
+compila en dos evaluadores:
+
+* :meth:`EquationRegistry.compile`: vectorizado con NumPy, sin construir pasos; marca los
+  puntos invalidos con NaN y una mascara en lugar de lanzar errores. Lo usa
+  :class:`~simulador.electrochemistry.ConfigKernel`.
+* :meth:`EquationRegistry.compile_traced`: escalar, produce un :class:`EquationStep` por
+  ecuacion con nombre y lanza ``ValueError`` en la primera condicion que falla. Lo usa
+  :mod:`simulador.detail`.
+
+Las ecuaciones se agrupan en dos etapas: ``"config"`` (invariantes que solo dependen de la
+configuracion y la temperatura) y ``"point"`` (dependen de la densidad de corriente).
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .constants import CONSTANTS, PhysicalConstants
+from .models import ElectrolyzerConfig
+
+
+@dataclass
+class EquationStep:
+    """Representa una ecuacion y los valores utilizados en un paso."""
+
+    name: str
+    expression: str
+    values: Dict[str, float]
+    result: float
+
+    def to_dict(self) -> Dict[str, float]:
+        return {
+            "name": self.name,
+            "expression": self.expression,
+            "values": self.values,
+            "result": self.result,
+        }
+
+
+def _is_scalar(value) -> bool:
+    return isinstance(value, float) or np.ndim(value) == 0
+
+
+def _exp(value):
+    # Para escalares se usa ``math`` y el kernel coincide bit a bit con las funciones por punto.
+    return math.exp(value) if _is_scalar(value) else np.exp(value)
+
+
+def _log(value):
+    if _is_scalar(value):
+        return math.log(value) if value > 0 else (-math.inf if value == 0 else math.nan)
+    return np.log(value)
+
+
+def _sqrt(value):
+    return math.sqrt(value) if _is_scalar(value) else np.sqrt(value)
+
+
+def _maximum(a, b):
+    value = np.maximum(a, b)
+    return float(value) if _is_scalar(value) else value
+
+
+OPS = SimpleNamespace(exp=_exp, log=_log, sqrt=_sqrt, maximum=_maximum)
+"""Funciones disponibles para las ecuaciones (``math`` si el argumento es escalar)."""
+
+
+def _apply(function: Callable, args: list):
+    try:
+        return function(OPS, *args)
+    except ZeroDivisionError:
+        # ``float`` lanza al dividir por cero; con ``np.float64`` se obtiene inf/NaN como en
+        # los arreglos y la validez la deciden las condiciones de las ecuaciones siguientes.
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            return function(OPS, *[np.float64(a) if isinstance(a, float) else a for a in args])
+
+
+@dataclass(frozen=True)
+class Guard:
+    """Condicion de validez sobre ``inputs``; ``message`` es el error del evaluador con traza."""
+
+    inputs: Tuple[str, ...]
+    predicate: Callable
+    message: str
+
+
+@dataclass(frozen=True)
+class Equation:
+    """Una ecuacion: ``output = function(OPS, *inputs)``.
+
+    ``name`` (plantilla ``str.format`` sobre las variables) y ``values`` (pares etiqueta,
+    variable) describen el paso de la traza; sin ``name`` la ecuacion es interna y no genera
+    paso. ``when`` elige entre variantes de una misma salida (p. ej. sin energia de activacion).
+    """
+
+    output: str
+    inputs: Tuple[str, ...]
+    function: Callable
+    stage: str = "point"
+    name: Optional[str] = None
+    expression: str = ""
+    values: Tuple[Tuple[str, str], ...] = ()
+    guards: Tuple[Guard, ...] = ()
+    when: Optional[Callable[[Mapping], bool]] = None
+
+
+def _select(variants: Sequence[Equation], env: Mapping) -> Equation:
+    for equation in variants:
+        if equation.when is None or equation.when(env):
+            return equation
+    raise LookupError(f"Ninguna variante aplica para {variants[0].output}.")
+
+
+class FastEvaluator:
+    """Evaluador vectorizado de una etapa; devuelve ``(variables, validos)``."""
+
+    def __init__(self, plan: List[List[Equation]]) -> None:
+        self.plan = plan
+
+    def __call__(self, env: Mapping) -> Tuple[Dict, np.ndarray]:
+        env = dict(env)
+        valid = True
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            for variants in self.plan:
+                equation = variants[0] if len(variants) == 1 else _select(variants, env)
+                value = _apply(equation.function, [env[name] for name in equation.inputs])
+                if equation.guards:
+                    ok = True
+                    for guard in equation.guards:
+                        ok = ok & guard.predicate(*[env[name] for name in guard.inputs])
+                    if _is_scalar(ok) and _is_scalar(value):
+                        value = value if ok else math.nan
+                    else:
+                        value = np.where(ok, value, np.nan)
+                    valid = valid & ok
+                env[equation.output] = value
+        return env, np.asarray(valid)
+
+
+class TracedEvaluator:
+    """Evaluador escalar de una etapa; devuelve ``(variables, pasos)``."""
+
+    def __init__(self, plan: List[List[Equation]]) -> None:
+        self.plan = plan
+
+    def __call__(self, env: Mapping) -> Tuple[Dict, List[EquationStep]]:
+        env = dict(env)
+        steps: List[EquationStep] = []
+        for variants in self.plan:
+            equation = _select(variants, env)
+            for guard in equation.guards:
+                if not guard.predicate(*[env[name] for name in guard.inputs]):
+                    raise ValueError(guard.message)
+            value = _apply(equation.function, [env[name] for name in equation.inputs])
+            env[equation.output] = value
+            if equation.name is not None:
+                steps.append(
+                    EquationStep(
+                        name=equation.name.format(**env),
+                        expression=equation.expression,
+                        values={label: env[name] for label, name in equation.values},
+                        result=value,
+                    )
+                )
+        return env, steps
+
+
+class EquationRegistry:
+    """Ecuaciones declaradas en orden de dependencia, agrupadas por salida."""
+
+    def __init__(self) -> None:
+        self._equations: Dict[str, List[Equation]] = {}
+        self._compiled: Dict[tuple, object] = {}
+
+    def register(self, equation: Equation) -> Equation:
+        """Agrega una ecuacion (o una variante de una salida existente)."""
+
+        self._equations.setdefault(equation.output, []).append(equation)
+        self._compiled.clear()
+        return equation
+
+    def equations(self, stage: str) -> List[List[Equation]]:
+        return [variants for variants in self._equations.values() if variants[0].stage == stage]
+
+    def _plan(self, stage: str, outputs: Optional[Sequence[str]]) -> List[List[Equation]]:
+        plan = self.equations(stage)
+        if outputs is None:
+            return plan
+        needed = set(outputs)
+        kept = []
+        for variants in reversed(plan):
+            if variants[0].output in needed:
+                kept.append(variants)
+                for equation in variants:
+                    needed.update(equation.inputs)
+                    for guard in equation.guards:
+                        needed.update(guard.inputs)
+        return kept[::-1]
+
+    def compile(self, stage: str, outputs: Optional[Sequence[str]] = None) -> FastEvaluator:
+        """Evaluador vectorizado de ``stage``, podado a lo necesario para ``outputs``."""
+
+        key = ("fast", stage, None if outputs is None else tuple(outputs))
+        if key not in self._compiled:
+            self._compiled[key] = FastEvaluator(self._plan(stage, outputs))
+        return self._compiled[key]
+
+    def trace_positions(self, stage: str, order: Sequence[str]) -> List[int]:
+        """Posicion en ``order`` de cada paso con nombre de ``stage``, en el orden de su traza.
+
+        Lanza ``ValueError`` si alguna ecuacion con nombre no figura en ``order``.
+        """
+
+        return [
+            list(order).index(variants[0].output)
+            for variants in self.equations(stage)
+            if variants[0].name is not None
+        ]
+
+    def compile_traced(self, stage: str) -> TracedEvaluator:
+        key = ("traced", stage)
+        if key not in self._compiled:
+            self._compiled[key] = TracedEvaluator(self._plan(stage, None))
+        return self._compiled[key]
+
+
+def config_inputs(
+    config: ElectrolyzerConfig,
+    constants: PhysicalConstants = CONSTANTS,
+    temperature=None,
+) -> Dict[str, object]:
+    """Variables de entrada de la etapa ``"config"`` tomadas de la configuracion."""
+
+    conds = config.conditions
+    thermo = config.thermo
+    ohmic = config.ohmic
+    mass = config.mass_transport
+    env = {
+        "R": constants.gas_constant,
+        "F": constants.faraday,
+        "temperature": conds.temperature if temperature is None else temperature,
+        "electrons": thermo.electrons,
+        "delta_h_ref": thermo.delta_h_ref,
+        "delta_s_ref": thermo.delta_s_ref,
+        "pressure_h2": conds.pressure_h2,
+        "pressure_o2": conds.pressure_o2,
+        "activity_h2o": conds.activity_h2o,
+        "conductivity_ref": ohmic.conductivity_ref,
+        "activation_energy_ohmic": ohmic.activation_energy,
+        "reference_temperature_ohmic": ohmic.reference_temperature,
+        "membrane_thickness_cm": ohmic.membrane_thickness_cm,
+        "contact_resistance": ohmic.contact_resistance,
+        "electrolyte_resistance": ohmic.electrolyte_resistance,
+        "limit_current_ref": mass.limit_current_ref,
+        "activation_energy_mass": mass.activation_energy,
+        "reference_temperature_mass": mass.reference_temperature,
+    }
+    electrodes = (("anode", config.kinetics_anode), ("cathode", config.kinetics_cathode))
+    for suffix, kinetics in electrodes:
+        env[f"i0_ref_{suffix}"] = kinetics.i0_ref
+        env[f"activation_energy_{suffix}"] = kinetics.activation_energy
+        env[f"reference_temperature_{suffix}"] = kinetics.reference_temperature
+        env[f"alpha_{suffix}"] = kinetics.alpha
+        env[f"electrons_{suffix}"] = kinetics.electrons
+        env[f"name_{suffix}"] = kinetics.name
+    return env
+
+
+def _has_energy(name: str) -> Callable[[Mapping], bool]:
+    return lambda env: env[name] is not None
+
+
+def _no_energy(name: str) -> Callable[[Mapping], bool]:
+    return lambda env: env[name] is None
+
+
+def _arrhenius(ops, value_ref, activation_energy, R, temperature, reference_temperature):
+    exponent = (-activation_energy / R) * (1.0 / temperature - 1.0 / reference_temperature)
+    return value_ref * ops.exp(exponent)
+
+
+def _without_arrhenius(ops, value_ref):
+    return value_ref * 1.0
+
+
+def _positive_current(message: str) -> Guard:
+    return Guard(("current_density",), lambda i: i > 0.0, message)
+
+
+POSITIVE_CONDUCTIVITY = Guard(
+    ("conductivity",), lambda kappa: kappa > 0, "La conductividad debe ser positiva."
+)
+
+REGISTRY = EquationRegistry()
+"""Ecuaciones de la celda (secciones 1.1 a 1.5 de ``definicion final de ecuaciones.md``)."""
+
+TRACE_ORDER = (
+    "V_ideal",
+    "i0_anode",
+    "eta_act_an",
+    "i0_cathode",
+    "eta_act_cat",
+    "eta_act_total",
+    "eta_ohm",
+    "eta_conc",
+    "voltage",
+)
+"""Salidas con paso de traza en el orden en que se muestran: voltaje ideal, cada electrodo
+(i0 y eta) y luego el resto. Mezcla pasos de las etapas ``"config"`` y ``"point"``."""
+
+# --- Etapa "config": invariantes a temperatura fija ---------------------------------------
+
+REGISTRY.register(
+    Equation(
+        "V_std",
+        ("delta_h_ref", "delta_s_ref", "temperature", "electrons", "F"),
+        lambda ops, dH, dS, T, n, F: (dH - T * dS) / (n * F),
+        stage="config",
+    )
+)
+REGISTRY.register(
+    Equation(
+        "quotient",
+        ("pressure_h2", "pressure_o2", "activity_h2o"),
+        lambda ops, p_h2, p_o2, a_h2o: (
+            p_h2 * ops.sqrt(ops.maximum(p_o2, 1e-12)) / ops.maximum(a_h2o, 1e-12)
+        ),
+        stage="config",
+    )
+)
+REGISTRY.register(
+    Equation("ln_quotient", ("quotient",), lambda ops, Q: ops.log(Q), stage="config")
+)
+REGISTRY.register(
+    Equation(
+        "thermal_prefactor",
+        ("R", "temperature", "electrons", "F"),
+        lambda ops, R, T, n, F: R * T / (n * F),
+        stage="config",
+    )
+)
+REGISTRY.register(
+    Equation(
+        "V_ideal",
+        ("V_std", "thermal_prefactor", "ln_quotient"),
+        lambda ops, V_std, prefactor, ln_Q: V_std + prefactor * ln_Q,
+        stage="config",
+        name="Voltaje ideal",
+        expression="V = Vstd + (RT/(nF)) * ln(Q)",
+        values=(
+            ("Vstd", "V_std"),
+            ("R", "R"),
+            ("T", "temperature"),
+            ("n", "electrons"),
+            ("F", "F"),
+            ("Q", "quotient"),
+            ("ln(Q)", "ln_quotient"),
+            ("prefactor", "thermal_prefactor"),
+        ),
+    )
+)
+
+for _suffix in ("anode", "cathode"):
+    _energy = f"activation_energy_{_suffix}"
+    _exponent = f"i0_exponent_{_suffix}"
+    REGISTRY.register(
+        Equation(
+            _exponent,
+            (_energy, "R", "temperature", f"reference_temperature_{_suffix}"),
+            lambda ops, Ea, R, T, Tref: (-Ea / R) * (1.0 / T - 1.0 / Tref),
+            stage="config",
+            when=_has_energy(_energy),
+        )
+    )
+    REGISTRY.register(
+        Equation(_exponent, (), lambda ops: None, stage="config", when=_no_energy(_energy))
+    )
+    REGISTRY.register(
+        Equation(
+            f"i0_{_suffix}",
+            (f"i0_ref_{_suffix}", _exponent),
+            lambda ops, i0_ref, exponent: i0_ref * ops.exp(exponent),
+            stage="config",
+            name=f"Corriente de intercambio {{name_{_suffix}}}",
+            expression="i0 = i0_ref * exp(-Ea/R * (1/T - 1/Tref))",
+            values=(
+                ("i0_ref", f"i0_ref_{_suffix}"),
+                ("Ea", _energy),
+                ("R", "R"),
+                ("T", "temperature"),
+                ("Tref", f"reference_temperature_{_suffix}"),
+                ("exponent", _exponent),
+            ),
+            when=_has_energy(_energy),
+        )
+    )
+    REGISTRY.register(
+        Equation(
+            f"i0_{_suffix}",
+            (f"i0_ref_{_suffix}",),
+            _without_arrhenius,
+            stage="config",
+            name=f"Corriente de intercambio {{name_{_suffix}}}",
+            expression="i0 = i0_ref",
+            values=(("i0_ref", f"i0_ref_{_suffix}"),),
+            when=_no_energy(_energy),
+        )
+    )
+    REGISTRY.register(
+        Equation(
+            f"tafel_{_suffix}",
+            ("R", "temperature", f"alpha_{_suffix}", f"electrons_{_suffix}", "F"),
+            lambda ops, R, T, alpha, n, F: R * T / (alpha * n * F),
+            stage="config",
+        )
+    )
+
+for _output, _prefix, _suffix in (
+    ("conductivity", "conductivity_ref", "ohmic"),
+    ("limit_current", "limit_current_ref", "mass"),
+):
+    _energy = f"activation_energy_{_suffix}"
+    REGISTRY.register(
+        Equation(
+            _output,
+            (_prefix, _energy, "R", "temperature", f"reference_temperature_{_suffix}"),
+            _arrhenius,
+            stage="config",
+            when=_has_energy(_energy),
+        )
+    )
+    REGISTRY.register(
+        Equation(_output, (_prefix,), _without_arrhenius, stage="config", when=_no_energy(_energy))
+    )
+
+REGISTRY.register(
+    Equation(
+        "resistance",
+        ("membrane_thickness_cm", "conductivity", "contact_resistance", "electrolyte_resistance"),
+        lambda ops, t_mem, kappa, R_contact, R_electrolyte: (
+            t_mem / kappa + R_contact + R_electrolyte
+        ),
+        stage="config",
+    )
+)
+
+# --- Etapa "point": dependen de la densidad de corriente ----------------------------------
+
+for _output, _suffix in (("eta_act_an", "anode"), ("eta_act_cat", "cathode")):
+    REGISTRY.register(
+        Equation(
+            _output,
+            ("current_density", f"i0_{_suffix}", f"tafel_{_suffix}"),
+            lambda ops, i, i0, prefactor: prefactor * ops.log(i / i0),
+            name=f"Sobrepotencial activacion {{name_{_suffix}}}",
+            expression="eta = (RT/(alpha*nF)) * ln(i/i0)",
+            values=(
+                ("R", "R"),
+                ("T", "temperature"),
+                ("alpha", f"alpha_{_suffix}"),
+                ("n", f"electrons_{_suffix}"),
+                ("F", "F"),
+                ("i", "current_density"),
+                ("i0", f"i0_{_suffix}"),
+                ("prefactor", f"tafel_{_suffix}"),
+            ),
+            guards=(
+                _positive_current("La densidad de corriente debe ser positiva."),
+                Guard(
+                    (f"i0_{_suffix}",),
+                    lambda i0: i0 > 0.0,
+                    "La corriente de intercambio debe ser positiva.",
+                ),
+            ),
+        )
+    )
+
+REGISTRY.register(
+    Equation(
+        "eta_act_total",
+        ("eta_act_an", "eta_act_cat"),
+        lambda ops, eta_an, eta_cat: eta_an + eta_cat,
+        name="Sobrepotencial activacion total",
+        expression="eta_act = eta_an + eta_cat",
+        values=(("eta_an", "eta_act_an"), ("eta_cat", "eta_act_cat")),
+    )
+)
+REGISTRY.register(
+    Equation(
+        "eta_ohm",
+        ("current_density", "resistance"),
+        lambda ops, i, resistance: i * resistance,
+        name="Perdida ohmica",
+        expression="eta_ohm = i * (t_mem/kappa + R_contact + R_electrolito)",
+        values=(
+            ("i", "current_density"),
+            ("t_mem", "membrane_thickness_cm"),
+            ("kappa", "conductivity"),
+            ("R_contact", "contact_resistance"),
+            ("R_electrolito", "electrolyte_resistance"),
+            ("R_total", "resistance"),
+        ),
+        guards=(POSITIVE_CONDUCTIVITY,),
+    )
+)
+REGISTRY.register(
+    Equation(
+        "eta_conc",
+        ("current_density", "limit_current", "thermal_prefactor"),
+        lambda ops, i, i_lim, prefactor: prefactor * ops.log(i_lim / (i_lim - i)),
+        name="Perdida por concentracion",
+        expression="eta_conc = (RT/(nF)) * ln(i_lim / (i_lim - i))",
+        values=(
+            ("R", "R"),
+            ("T", "temperature"),
+            ("n", "electrons"),
+            ("F", "F"),
+            ("i_lim", "limit_current"),
+            ("i", "current_density"),
+            ("prefactor", "thermal_prefactor"),
+        ),
+        guards=(
+            Guard(
+                ("current_density", "limit_current"),
+                lambda i, i_lim: i < i_lim,
+                "La densidad de corriente supera la corriente limite.",
+            ),
+        ),
+    )
+)
+REGISTRY.register(
+    Equation(
+        "voltage",
+        ("V_ideal", "eta_act_total", "eta_ohm", "eta_conc"),
+        lambda ops, V, eta_act, eta_ohm, eta_conc: V + eta_act + eta_ohm + eta_conc,
+        name="Voltaje total",
+        expression="V_total = V + eta_act + eta_ohm + eta_conc",
+        values=(
+            ("V", "V_ideal"),
+            ("eta_act", "eta_act_total"),
+            ("eta_ohm", "eta_ohm"),
+            ("eta_conc", "eta_conc"),
+        ),
+    )
+)
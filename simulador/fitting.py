@@ -0,0 +1,197 @@
+"""Ajuste de parametros del modelo contra curvas de polarizacion medidas."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .constants import CONSTANTS, PhysicalConstants
+from .grid import replace_fields, resolve_field
+from .models import ElectrolyzerConfig
+from .sensitivity import voltage_jacobian
+
+DEFAULT_PARAMETERS = (
+    "kinetics_anode.i0_ref",
+    "kinetics_anode.alpha",
+    "kinetics_anode.activation_energy",
+    "ohmic.contact_resistance",
+    "mass_transport.limit_current_ref",
+)
+
+DEFAULT_BOUNDS: Dict[str, Tuple[float, float]] = {
+    "i0_ref": (1e-15, 1.0),
+    "alpha": (0.05, 1.0),
+    "activation_energy": (0.0, 300_000.0),
+    "conductivity_ref": (1e-4, 10.0),
+    "membrane_thickness_cm": (1e-4, 1.0),
+    "contact_resistance": (0.0, 10.0),
+    "electrolyte_resistance": (0.0, 10.0),
+    "limit_current_ref": (1e-3, 1e3),
+}
+"""Cotas por defecto segun el nombre del campo (se aplican a ambos electrodos)."""
+
+LOG_FIELDS = frozenset({"i0_ref", "conductivity_ref", "limit_current_ref"})
+"""Campos multiplicativos que se ajustan en escala logaritmica."""
+
+
+@dataclass
+class FitResult:
+    """Parametros ajustados por celda con su covarianza."""
+
+    parameters: Tuple[str, ...]
+    cells: np.ndarray
+    values: np.ndarray  # (n_celdas, n_parametros)
+    covariance: np.ndarray  # (n_celdas, n_parametros, n_parametros)
+    residual_rms: np.ndarray
+    converged: np.ndarray
+    iterations: int
+    base_config: ElectrolyzerConfig = field(repr=False)
+
+    @property
+    def stderr(self) -> np.ndarray:
+        return np.sqrt(np.diagonal(self.covariance, axis1=1, axis2=2))
+
+    def config(self, cell=None) -> ElectrolyzerConfig:
+        """Configuracion base con los valores ajustados de ``cell`` (la primera por defecto)."""
+
+        index = 0 if cell is None else int(np.flatnonzero(self.cells == cell)[0])
+        values = {name: float(self.values[index, k]) for k, name in enumerate(self.parameters)}
+        return replace_fields(self.base_config, values)
+
+
+def _segment_sum(values: np.ndarray, cell: np.ndarray, n_cells: int) -> np.ndarray:
+    return np.bincount(cell, weights=values, minlength=n_cells)
+
+
+def fit_polarization(
+    config: ElectrolyzerConfig,
+    temperature: Sequence[float],
+    current: Sequence[float],
+    voltage: Sequence[float],
+    parameters: Sequence[str] = DEFAULT_PARAMETERS,
+    bounds: Optional[Mapping[str, Tuple[float, float]]] = None,
+    cells: Optional[Sequence] = None,
+    constants: PhysicalConstants = CONSTANTS,
+    max_iterations: int = 100,
+    tolerance: float = 1e-9,
+) -> FitResult:
+    """Ajusta ``parameters`` por minimos cuadrados a mediciones (T, i, V).
+
+    Todas las celdas (``cells`` etiqueta cada medicion; una sola celda si es ``None``) se
+    ajustan a la vez con Levenberg-Marquardt vectorizado: los residuos y el jacobiano analitico
+    de :func:`~simulador.sensitivity.voltage_jacobian` se evaluan sobre todos los puntos y todas
+    las temperaturas en una llamada, y las ecuaciones normales se resuelven por lotes. Los
+    parametros quedan dentro de ``bounds`` (o :data:`DEFAULT_BOUNDS`) y los de
+    :data:`LOG_FIELDS` se ajustan en escala logaritmica. La covarianza se estima como
+    ``s^2 (J^T J)^-1`` en el optimo.
+    """
+
+    temperature = np.asarray(temperature, dtype=float).ravel()
+    current = np.asarray(current, dtype=float).ravel()
+    voltage = np.asarray(voltage, dtype=float).ravel()
+    if not (temperature.size == current.size == voltage.size):
+        raise ValueError("Las mediciones de T, i y V deben tener la misma longitud.")
+    labels, cell = np.unique(
+        np.zeros(current.size, dtype=int) if cells is None else np.asarray(cells).ravel(),
+        return_inverse=True,
+    )
+    cell = cell.ravel()
+    n_cells = labels.size
+    parameters = tuple(parameters)
+    n_params = len(parameters)
+
+    attrs = [resolve_field(name)[1] for name in parameters]
+    is_log = np.array([attr in LOG_FIELDS for attr in attrs])
+    bounds = dict(bounds or {})
+    low = np.empty(n_params)
+    high = np.empty(n_params)
+    start = np.empty(n_params)
+    for k, (name, attr) in enumerate(zip(parameters, attrs)):
+        low[k], high[k] = bounds.get(name, DEFAULT_BOUNDS.get(attr, (-np.inf, np.inf)))
+        submodel, _ = resolve_field(name)
+        value = getattr(getattr(config, submodel), attr)
+        start[k] = 0.0 if value is None else value
+    low_t = np.where(is_log, np.log(np.maximum(low, 1e-300)), low)
+    high_t = np.where(is_log, np.log(high), high)
+
+    def to_values(phi: np.ndarray) -> np.ndarray:
+        values = phi.copy()
+        values[..., is_log] = np.exp(phi[..., is_log])
+        return values
+
+    def evaluate(phi: np.ndarray):
+        values = to_values(phi)
+        fields = {name: values[cell, k] for k, name in enumerate(parameters)}
+        fields["conditions.temperature"] = temperature
+        result = voltage_jacobian(current, replace_fields(config, fields), constants)
+        jac = np.stack([result.column(name) for name in parameters], axis=-1)
+        jac = np.where(is_log, jac * values[cell], jac)  # dV/dln(theta) = theta dV/dtheta
+        residual = result.voltage - voltage
+        cost = _segment_sum(np.where(result.valid, residual**2, 0.0), cell, n_cells)
+        invalid = _segment_sum((~result.valid).astype(float), cell, n_cells) > 0
+        cost = np.where(invalid, np.inf, cost)
+        return residual, jac, cost
+
+    def normal_equations(residual: np.ndarray, jac: np.ndarray):
+        A = np.empty((n_cells, n_params, n_params))
+        g = np.empty((n_cells, n_params))
+        for p in range(n_params):
+            g[:, p] = _segment_sum(jac[:, p] * residual, cell, n_cells)
+            for q in range(p, n_params):
+                A[:, p, q] = A[:, q, p] = _segment_sum(jac[:, p] * jac[:, q], cell, n_cells)
+        return A, g
+
+    start_t = np.where(is_log, np.log(np.maximum(start, 1e-300)), start)
+    phi = np.tile(np.clip(start_t, low_t, high_t), (n_cells, 1))
+    residual, jac, cost = evaluate(phi)
+    if not np.all(np.isfinite(cost)):
+        raise ValueError("La configuracion inicial no es valida para todos los puntos medidos.")
+
+    damping = np.full(n_cells, 1e-3)
+    converged = np.zeros(n_cells, dtype=bool)
+    iterations = 0
+    for iterations in range(1, max_iterations + 1):
+        A, g = normal_equations(residual, jac)
+        # Parametros en una cota con el gradiente empujando hacia afuera quedan fijos.
+        fixed = ((phi <= low_t) & (g > 0)) | ((phi >= high_t) & (g < 0))
+        free = (~fixed).astype(float)
+        A = A * free[:, :, None] * free[:, None, :] + np.eye(n_params) * fixed[:, :, None]
+        g = g * free
+        diag = np.maximum(np.diagonal(A, axis1=1, axis2=2), 1e-30)
+        system = A + damping[:, None, None] * (diag[:, :, None] * np.eye(n_params))
+        step = np.linalg.solve(system, -g[..., None])[..., 0]
+        trial = np.clip(phi + np.where(converged[:, None], 0.0, step), low_t, high_t)
+        trial_residual, trial_jac, trial_cost = evaluate(trial)
+
+        accept = (trial_cost < cost) & ~converged
+        improvement = np.where(accept, (cost - trial_cost) / np.maximum(cost, 1e-300), 0.0)
+        phi = np.where(accept[:, None], trial, phi)
+        point_accept = accept[cell]
+        residual = np.where(point_accept, trial_residual, residual)
+        jac = np.where(point_accept[:, None], trial_jac, jac)
+        cost = np.where(accept, trial_cost, cost)
+        damping = np.where(accept, damping / 3.0, damping * 3.0)
+
+        converged |= (accept & (improvement < tolerance)) | (damping > 1e12)
+        if converged.all():
+            break
+
+    A, _ = normal_equations(residual, jac)
+    counts = np.bincount(cell, minlength=n_cells)
+    dof = np.maximum(counts - n_params, 1)
+    values = to_values(phi)
+    covariance_t = np.linalg.pinv(A) * (cost / dof)[:, None, None]
+    scale = np.where(is_log, values, 1.0)
+    covariance = covariance_t * scale[:, :, None] * scale[:, None, :]
+    return FitResult(
+        parameters=parameters,
+        cells=labels,
+        values=values,
+        covariance=covariance,
+        residual_rms=np.sqrt(cost / counts),
+        converged=converged,
+        iterations=iterations,
+        base_config=config,
+    )
@@ -0,0 +1,141 @@
+"""Barridos vectorizados sobre grillas cartesianas de parametros."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field, fields, replace
+from typing import Dict, Mapping, Sequence, Tuple, get_type_hints
+
+import numpy as np
+
+from .constants import CONSTANTS, PhysicalConstants
+from .electrochemistry import polarization_arrays
+from .models import ElectrolyzerConfig
+
+FIELD_ALIASES = {
+    "temperature": "conditions.temperature",
+    "pH": "conditions.pH",
+    "pressure_total": "conditions.pressure_total",
+    "pressure_h2": "conditions.pressure_h2",
+    "pressure_o2": "conditions.pressure_o2",
+    "activity_h2o": "conditions.activity_h2o",
+    "membrane_thickness_cm": "ohmic.membrane_thickness_cm",
+    "conductivity_ref": "ohmic.conductivity_ref",
+    "contact_resistance": "ohmic.contact_resistance",
+    "electrolyte_resistance": "ohmic.electrolyte_resistance",
+}
+"""Nombres cortos aceptados como ejes; cualquier otro campo se indica como ``submodelo.campo``."""
+
+COMPONENTS = ("V_ideal", "eta_act_an", "eta_act_cat", "eta_ohm", "eta_conc")
+
+_SUBMODELS = get_type_hints(ElectrolyzerConfig)
+
+
+def resolve_field(name: str) -> Tuple[str, str]:
+    """Traduce un nombre de eje a ``(submodelo, campo)`` de :class:`ElectrolyzerConfig`."""
+
+    path = FIELD_ALIASES.get(name, name)
+    submodel, _, attr = path.partition(".")
+    model_type = _SUBMODELS.get(submodel)
+    if model_type is None or attr not in {f.name for f in fields(model_type)}:
+        raise ValueError(f"Campo de configuracion desconocido: {name}.")
+    return submodel, attr
+
+
+def replace_fields(config: ElectrolyzerConfig, values: Mapping[str, object]) -> ElectrolyzerConfig:
+    """Copia ``config`` sustituyendo campos; los valores pueden ser arreglos de NumPy.
+
+    Una configuracion con arreglos en sus campos es valida para toda la ruta vectorizada de
+    :mod:`simulador.electrochemistry`, que los combina por broadcasting.
+    """
+
+    grouped: Dict[str, Dict[str, object]] = {}
+    for name, value in values.items():
+        submodel, attr = resolve_field(name)
+        grouped.setdefault(submodel, {})[attr] = value
+    updates = {
+        submodel: replace(getattr(config, submodel), **changes)
+        for submodel, changes in grouped.items()
+    }
+    return replace(config, **updates)
+
+
+@dataclass
+class GridResult:
+    """Arreglo N-D etiquetado: un eje por campo variado y el ultimo para la corriente."""
+
+    dims: Tuple[str, ...]
+    coords: Dict[str, np.ndarray]
+    voltage: np.ndarray
+    valid: np.ndarray
+    components: Dict[str, np.ndarray] = field(default_factory=dict)
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        return self.voltage.shape
+
+    def isel(self, **indices: int) -> "GridResult":
+        """Selecciona por indice entero en los ejes indicados (los elimina del resultado)."""
+
+        unknown = set(indices) - set(self.dims)
+        if unknown:
+            raise KeyError(f"Ejes desconocidos: {sorted(unknown)}.")
+        key = tuple(indices.get(dim, slice(None)) for dim in self.dims)
+        dims = tuple(dim for dim in self.dims if dim not in indices)
+        return GridResult(
+            dims=dims,
+            coords={dim: self.coords[dim] for dim in dims},
+            voltage=self.voltage[key],
+            valid=self.valid[key],
+            components={name: values[key] for name, values in self.components.items()},
+        )
+
+
+def parameter_grid(
+    config: ElectrolyzerConfig,
+    currents: Sequence[float],
+    axes: Mapping[str, Sequence[float]],
+    constants: PhysicalConstants = CONSTANTS,
+    breakdown: bool = False,
+    chunk_points: int = 4_000_000,
+) -> GridResult:
+    """Evalua V(i) sobre el producto cartesiano de ``axes`` y ``currents``.
+
+    Cada eje sustituye un campo de ``config`` (ver :data:`FIELD_ALIASES`) por un arreglo
+    orientado en su propia dimension, de modo que una sola llamada a
+    :func:`~simulador.electrochemistry.polarization_arrays` cubre todas las combinaciones. La
+    grilla se procesa en bloques del primer eje de a lo sumo ``chunk_points`` puntos para acotar
+    los temporales; con ``breakdown`` se guardan ademas los sobrepotenciales por componente.
+    """
+
+    dims = tuple(axes) + ("current_density",)
+    coords = {name: np.asarray(values, dtype=float).ravel() for name, values in axes.items()}
+    coords["current_density"] = np.asarray(currents, dtype=float).ravel()
+    for name in axes:
+        resolve_field(name)
+    shape = tuple(coords[dim].size for dim in dims)
+    ndim = len(shape)
+
+    voltage = np.empty(shape)
+    valid = np.empty(shape, dtype=bool)
+    components = {name: np.empty(shape) for name in COMPONENTS} if breakdown else {}
+
+    currents_nd = coords["current_density"].reshape((1,) * (ndim - 1) + (-1,))
+    inner_points = int(np.prod(shape[1:], dtype=np.int64))
+    step = max(1, chunk_points // max(inner_points, 1)) if ndim > 1 else 1
+
+    for start in range(0, shape[0] if ndim > 1 else 1, step):
+        block = slice(start, start + step)
+        values = {}
+        for axis, name in enumerate(dims[:-1]):
+            column = coords[name][block] if axis == 0 else coords[name]
+            orient = [1] * ndim
+            orient[axis] = column.size
+            values[name] = column.reshape(orient)
+        result = polarization_arrays(currents_nd, replace_fields(config, values), constants)
+        target = block if ndim > 1 else slice(None)
+        voltage[target] = result.voltage
+        valid[target] = result.valid
+        for name in components:
+            components[name][target] = getattr(result, name)
+
+    return GridResult(dims=dims, coords=coords, voltage=voltage, valid=valid, components=components)
@@ -0,0 +1,76 @@
+"""Eficiencia, calor y produccion de hidrogeno calculados sobre arreglos completos."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from .constants import CONSTANTS, JOULE_TO_KWH, PhysicalConstants
+from .electrochemistry import PolarizationArrays, compile_config
+from .models import ElectrolyzerConfig, ThermoModel
+
+
+def thermoneutral_voltage(thermo: ThermoModel, constants: PhysicalConstants = CONSTANTS):
+    """V_tn = DeltaH/(nF): voltaje al que la celda no genera ni absorbe calor."""
+
+    return thermo.delta_h_ref / (thermo.electrons * constants.faraday)
+
+
+@dataclass
+class PerformanceMetrics:
+    """Indicadores por punto; los puntos invalidos quedan en NaN."""
+
+    current_density: np.ndarray  # A/cm2
+    voltage: np.ndarray  # V
+    valid: np.ndarray
+    thermoneutral_voltage: np.ndarray  # V
+    voltage_efficiency: np.ndarray  # V_ideal / V
+    thermal_efficiency: np.ndarray  # V_tn / V (base poder calorifico superior)
+    power_density: np.ndarray  # W/cm2
+    heat_density: np.ndarray  # W/cm2, (V - V_tn) i; negativo si la celda absorbe calor
+    specific_energy: np.ndarray  # kWh/kg H2
+    hydrogen_rate: np.ndarray  # mol/(s.cm2)
+
+
+def performance_metrics(
+    arrays: PolarizationArrays,
+    config: ElectrolyzerConfig,
+    constants: PhysicalConstants = CONSTANTS,
+) -> PerformanceMetrics:
+    """Deriva los indicadores de un resultado de
+    :func:`~simulador.electrochemistry.polarization_arrays` sin volver a evaluar el modelo.
+
+    La produccion sigue la ley de Faraday, ``i / (nF)``, y la energia especifica es
+    ``nF V / M_H2`` (independiente de la corriente salvo por V). Funciona igual para
+    configuraciones con arreglos (los indicadores se expanden a la forma del resultado).
+    """
+
+    valid = arrays.valid
+    nF = config.thermo.electrons * constants.faraday
+    voltage = np.where(valid, arrays.voltage, np.nan)
+    current = np.where(valid, arrays.current_density, np.nan)
+    V_tn = np.broadcast_to(thermoneutral_voltage(config.thermo, constants), voltage.shape)
+    return PerformanceMetrics(
+        current_density=arrays.current_density,
+        voltage=voltage,
+        valid=valid,
+        thermoneutral_voltage=V_tn,
+        voltage_efficiency=arrays.V_ideal / voltage,
+        thermal_efficiency=V_tn / voltage,
+        power_density=voltage * current,
+        heat_density=(voltage - V_tn) * current,
+        specific_energy=nF * voltage / constants.molar_mass_h2 * JOULE_TO_KWH,
+        hydrogen_rate=current / nF,
+    )
+
+
+def performance_curve(
+    currents,
+    config: ElectrolyzerConfig,
+    constants: PhysicalConstants = CONSTANTS,
+) -> PerformanceMetrics:
+    """Evalua el modelo y sus indicadores para un arreglo de corrientes en una sola pasada."""
+
+    arrays = compile_config(config, constants).evaluate(currents)
+    return performance_metrics(arrays, config, constants)
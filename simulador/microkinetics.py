@@ -0,0 +1,225 @@
+"""Modelo microcinetico de campo medio para la via disociativa con efectos de cobertura.
+
+Pasos (seccion 2.1 de ``requerimientos.md``), por sitio ``*``::
+
+    0: 1/2 O2 + *      <-> O*
+    A: O* + H+ + e-    <-> OH*
+    B: OH* + H+ + e-   <-> H2O + *
+
+Las energias de reaccion de A y B son DeltaG1 y DeltaG2 de :mod:`simulador.orr`; la del paso 0
+cierra el balance ``DeltaG0 + DeltaG1 + DeltaG2 = 2 (U - U0)``. Las energias de O* y OH* se
+desplazan linealmente con la cobertura de oxigeno (``CoverageInteractions``). Cada paso tiene
+``k_f = nu exp(-(b + max(DeltaG, 0)) / kT)`` y ``k_f / k_b = exp(-DeltaG / kT)``, con ``b`` la
+barrera de disociacion de O2 en el paso 0 y cero en los de transferencia (la barrera de
+activacion es la de energia libre, como en :func:`~simulador.orr.calcular_actividad`).
+
+El estado estacionario ``r0 = rA = rB`` se reduce a un punto fijo en theta_O (ver ``_Cycle``)
+que se resuelve con Newton vectorizado sobre todos los catalizadores a la vez, recorriendo los
+potenciales en orden y arrancando cada uno desde la solucion del potencial vecino.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from .constants import CONSTANTS, PhysicalConstants
+from .orr import WATER_REFERENCE_ENERGY, CatalystSet, barrier_lines
+
+EQUILIBRIUM_POTENTIAL = WATER_REFERENCE_ENERGY / 2  # V, U0 de la ORR
+MAX_ITERATIONS = 50
+TOLERANCE = 1e-12  # cambio maximo de cobertura para dar por convergido
+
+
+@dataclass(frozen=True)
+class CoverageInteractions:
+    """Desplazamiento (eV por monocapa de O*) de la energia libre de O* y OH* con theta_O.
+
+    Valores positivos desestabilizan al adsorbato al crecer theta_O; con ambos en cero las
+    energias no dependen de la cobertura.
+    """
+
+    o_o: float = 0.0  # eV/ML, O*-O*
+    oh_o: float = 0.0  # eV/ML, OH*-O*
+
+
+@dataclass
+class SteadyState:
+    """Coberturas y velocidad neta por sitio, de forma ``(n_catalizadores, n_potenciales)``."""
+
+    potential: np.ndarray  # V
+    theta_o: np.ndarray
+    theta_oh: np.ndarray
+    theta_free: np.ndarray
+    rate: np.ndarray  # 1/s por sitio, positiva en sentido de reduccion
+    converged: np.ndarray
+    iterations: np.ndarray
+
+    @property
+    def log10_rate(self) -> np.ndarray:
+        """log10 de la velocidad neta; NaN donde la reaccion va en sentido inverso."""
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(self.rate > 0, np.log10(self.rate), np.nan)
+
+
+def _rate_constants(delta_g, barrier, kT):
+    """``k_f, k_b`` (sin prefactor) y sus derivadas ``d ln k / d DeltaG``."""
+
+    uphill = delta_g > 0
+    forward = np.exp(-(barrier + np.where(uphill, delta_g, 0.0)) / kT)
+    backward = np.exp(-(barrier + np.where(uphill, 0.0, -delta_g)) / kT)
+    return forward, backward, np.where(uphill, -1.0 / kT, 0.0), np.where(uphill, 0.0, 1.0 / kT)
+
+
+class _Cycle:
+    """Ciclo de tres estados (*, O*, OH*) a un potencial, como funcion de theta_O.
+
+    Con las constantes fijas las coberturas salen de forma cerrada (metodo de King-Altman:
+    cada estado pesa la suma de productos de constantes de sus arboles de expansion), sin
+    restas y exactas aun para coberturas diminutas. Solo queda el punto fijo en theta_O.
+    """
+
+    def __init__(self, intercept, slope, kT, potential, interactions) -> None:
+        self.kT = kT
+        self.barrier0 = intercept[:, 3]
+        g_a = intercept[:, 0] + slope[:, 0] * potential
+        g_b = intercept[:, 1] + slope[:, 1] * potential
+        self.total = 2.0 * (potential - EQUILIBRIUM_POTENTIAL)
+        self.base = (self.total - g_a - g_b, g_a, g_b)
+        # d DeltaG / d theta_O de cada paso; suman cero.
+        self.shift = (
+            interactions.o_o,
+            interactions.oh_o - interactions.o_o,
+            -interactions.oh_o,
+        )
+
+    def solve(self, theta_o, rows=None):
+        """Coberturas ``(*, O*, OH*)``, ``d theta_O / d theta_O_entrada`` y la velocidad.
+
+        Las constantes se normalizan por la mayor de cada estado para que los productos no
+        se anulen; la velocidad se devuelve ya reescalada (sin el prefactor). ``rows`` limita
+        la evaluacion a un subconjunto de catalizadores.
+        """
+
+        base, barrier0, kT = self.base, self.barrier0, self.kT
+        if rows is not None:
+            base = tuple(g[rows] for g in base)
+            barrier0 = barrier0[rows]
+            kT = kT[rows] if np.ndim(kT) else kT
+        rates = []
+        for g, c, b in zip(base, self.shift, (barrier0, 0.0, 0.0)):
+            forward, backward, d_forward, d_backward = _rate_constants(g + c * theta_o, b, kT)
+            rates.append((forward, backward, d_forward * c, d_backward * c))
+        (k0f, k0b, g0f, g0b), (kaf, kab, gaf, gab), (kbf, kbb, gbf, gbb) = rates
+        scale = np.maximum.reduce([k0f, k0b, kaf, kab, kbf, kbb])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            k0f, k0b, kaf, kab, kbf, kbb = (k / scale for k in (k0f, k0b, kaf, kab, kbf, kbb))
+        # Pesos de cada estado y sus derivadas respecto de theta_O.
+        terms_s = ((k0b, kbf, g0b + gbf), (kab, k0b, gab + g0b), (kaf, kbf, gaf + gbf))
+        terms_o = ((k0f, kab, g0f + gab), (kbf, k0f, gbf + g0f), (kbb, kab, gbb + gab))
+        terms_h = ((kbb, kaf, gbb + gaf), (k0b, kbb, g0b + gbb), (k0f, kaf, g0f + gaf))
+        weights, derivatives = [], []
+        for terms in (terms_s, terms_o, terms_h):
+            products = [a * b for a, b, _ in terms]
+            weights.append(sum(products))
+            derivatives.append(sum(p * d for p, (_, _, d) in zip(products, terms)))
+        total = sum(weights)
+        d_total = sum(derivatives)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            coverages = tuple(w / total for w in weights)
+            d_theta_o = (derivatives[1] - coverages[1] * d_total) / total
+            # k0b kab kbb = k0f kaf kbf exp(DeltaG_total / kT): sin cancelaciones cerca de U0.
+            rate = -np.expm1(self.total / kT) * k0f * kaf * kbf / total * scale
+        return coverages, d_theta_o, rate
+
+
+def _newton(cycle: _Cycle, x, tolerance: float, max_iterations: int):
+    """Newton sobre ``h(x) = theta_O(x) - x`` con respaldo de biseccion.
+
+    ``h(0) >= 0 >= h(1)``, asi que la raiz queda acotada y el intervalo se estrecha en cada
+    iteracion; los pasos de Newton que salen de el, o que no reducen a la mitad el paso
+    anterior (oscilaciones en sigmoides empinadas), se reemplazan por el punto medio. Cada
+    iteracion evalua solo los estados que aun no convergieron.
+    """
+
+    x = x.copy()
+    low, high = np.zeros_like(x), np.ones_like(x)
+    previous = np.ones_like(x)  # ultimo paso de cada estado
+    iterations = np.zeros(x.shape, dtype=np.int32)
+    rows = np.arange(x.size)
+    for _ in range(max_iterations):
+        if rows.size == 0:
+            break
+        current = x[rows]
+        coverages, d_theta_o, _ = cycle.solve(current, rows)
+        h = coverages[1] - current
+        low[rows] = np.where(h > 0, current, low[rows])
+        high[rows] = np.where(h < 0, current, high[rows])
+        slope = d_theta_o - 1.0
+        with np.errstate(divide="ignore", invalid="ignore"):
+            step = current - h / slope
+        accept = (step >= low[rows]) & (step <= high[rows])
+        accept &= np.abs(2.0 * h) <= np.abs(previous[rows] * slope)
+        step = np.where(accept, step, 0.5 * (low[rows] + high[rows]))
+        previous[rows] = step - current
+        x[rows] = step
+        iterations[rows] += 1
+        rows = rows[np.abs(step - current) > tolerance]
+    converged = np.ones(x.shape, dtype=bool)
+    converged[rows] = False
+    return x, converged, iterations
+
+
+def solve_steady_state(
+    catalysts: CatalystSet,
+    potentials,
+    temperature: float = 298.15,
+    pH: float = 0.0,
+    interactions: CoverageInteractions = CoverageInteractions(),
+    prefactor: float = 1.0,
+    tolerance: float = TOLERANCE,
+    max_iterations: int = MAX_ITERATIONS,
+    reference_potential: float = 1.23,
+    constants: PhysicalConstants = CONSTANTS,
+) -> SteadyState:
+    """Coberturas y velocidad estacionarias para cada catalizador y potencial.
+
+    Los potenciales se recorren ordenados; cada uno parte de la solucion del anterior (el
+    primero, de la solucion lineal con theta_O = 0). ``converged`` marca los estados que
+    cumplieron ``tolerance`` en ``max_iterations``. Con ``prefactor = 1`` la velocidad es
+    adimensional y comparable con :func:`~simulador.orr.calcular_actividad`.
+    """
+
+    potentials = np.atleast_1d(np.asarray(potentials, dtype=float))
+    order = np.argsort(potentials, kind="stable")
+    lines = barrier_lines(catalysts, temperature, pH, reference_potential, constants)
+    intercept, slope, kT = lines.intercept, lines.slope, lines.kT
+    n = intercept.shape[0]
+    shape = (n, potentials.size)
+    theta_o, theta_oh, theta_free, rate = (np.empty(shape) for _ in range(4))
+    converged = np.empty(shape, dtype=bool)
+    iterations = np.empty(shape, dtype=np.int32)
+
+    x = None
+    for column in order:
+        cycle = _Cycle(intercept, slope, kT, potentials[column], interactions)
+        if x is None:
+            x = cycle.solve(np.zeros(n))[0][1]
+            x = np.where(np.isfinite(x), x, 0.0)
+        x, done, count = _newton(cycle, x, tolerance, max_iterations)
+        coverages, _, net = cycle.solve(x)
+        theta_free[:, column], theta_o[:, column], theta_oh[:, column] = coverages
+        rate[:, column] = prefactor * net
+        converged[:, column] = done & np.isfinite(net)
+        iterations[:, column] = count
+    return SteadyState(
+        potential=potentials,
+        theta_o=theta_o,
+        theta_oh=theta_oh,
+        theta_free=theta_free,
+        rate=rate,
+        converged=converged,
+        iterations=iterations,
+    )
@@ -3,10 +3,13 @@
 from __future__ import annotations
 
 import math
-from typing import Dict
+from dataclasses import dataclass
+from typing import Dict, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
 
 from .constants import CONSTANTS, PhysicalConstants
-from .models import Catalyst
+from .models import Catalyst, IntermediateData
 
 WATER_REFERENCE_ENERGY = 2.46  # eV, calibrado con Pt @ U0
 ASSOCIATIVE_DEFAULT_SLOPE = 0.65  # eV/eV
@@ -134,3 +137,554 @@ def calcular_actividad(
         raise ValueError("Temperatura invalida.")
     return math.exp(-barrier / kT)
 
+
+# --- Catalizador compilado ----------------------------------------------------------------
+#
+# A temperatura y pH fijos todas las energias del modelo son lineales en U. El catalizador
+# compilado guarda la ordenada y la pendiente de cada una, de modo que evaluar un potencial
+# nuevo cuesta unas pocas multiplicaciones y sumas.
+
+
+class CompiledCatalyst:
+    """Terminos independientes del potencial de un catalizador a (T, pH) fijos.
+
+    Se obtiene con :func:`compile_catalyst`; sus metodos devuelven lo mismo que las funciones
+    escalares de este modulo (salvo redondeo en el ultimo digito).
+    """
+
+    __slots__ = (
+        "name",
+        "temperature",
+        "pH",
+        "kT",
+        "free_energy_terms",
+        "missing_intermediate",
+        "dg1_0",
+        "dg1_u",
+        "dg2_0",
+        "dg2_u",
+        "associative_0",
+        "dissociation_barrier",
+    )
+
+    def free_energy(self, intermediate: str, potential: float) -> float:
+        """Equivalente a :func:`calcular_energia_libre`."""
+
+        try:
+            constant, electrons = self.free_energy_terms[intermediate]
+        except KeyError:
+            raise KeyError(
+                f"No hay datos para el intermedio {intermediate} en {self.name}."
+            ) from None
+        return constant + electrons * potential
+
+    def _require_intermediates(self) -> None:
+        # Como en la version escalar, solo fallan las evaluaciones que usan DeltaG1/DeltaG2.
+        if self.missing_intermediate is not None:
+            raise KeyError(
+                f"No hay datos para el intermedio {self.missing_intermediate} en {self.name}."
+            )
+
+    def dissociative(self, potential: float) -> Dict[str, float]:
+        """Equivalente a :func:`evaluar_mecanismo_disociativo`."""
+
+        self._require_intermediates()
+        delta_g1 = self.dg1_0 + self.dg1_u * potential
+        delta_g2 = self.dg2_0 + self.dg2_u * potential
+        return {"delta_g1": delta_g1, "delta_g2": delta_g2, "limiting": max(delta_g1, delta_g2)}
+
+    def associative(self, potential: float) -> Dict[str, float]:
+        """Equivalente a :func:`evaluar_mecanismo_asociativo`."""
+
+        return {"barrier": self.associative_0 + potential}
+
+    def dominant(self, potential: float) -> Dict[str, float | str]:
+        """Equivalente a :func:`determinar_via_dominante`."""
+
+        dis = self.dissociative(potential)
+        assoc = self.associative(potential)
+        candidates = {
+            "mecanismo disociativo": dis["limiting"],
+            "mecanismo asociativo": assoc["barrier"],
+            "disociacion O2": self.dissociation_barrier,
+        }
+        dominant = min(candidates.items(), key=lambda item: item[1])
+        return {
+            "via_dominante": dominant[0],
+            "barrera": dominant[1],
+            "detalle_disociativo": dis,
+            "detalle_asociativo": assoc,
+        }
+
+    def barrier(self, potential: float) -> float:
+        """Barrera de la via dominante, sin construir diccionarios."""
+
+        self._require_intermediates()
+        delta_g1 = self.dg1_0 + self.dg1_u * potential
+        delta_g2 = self.dg2_0 + self.dg2_u * potential
+        return min(
+            delta_g1 if delta_g1 >= delta_g2 else delta_g2,
+            self.associative_0 + potential,
+            self.dissociation_barrier,
+        )
+
+    def activity(self, potential: float) -> float:
+        """Equivalente a :func:`calcular_actividad`."""
+
+        if self.kT <= 0:
+            raise ValueError("Temperatura invalida.")
+        return math.exp(-self.barrier(potential) / self.kT)
+
+
+def compile_catalyst(
+    catalyst: Catalyst,
+    temperature: float,
+    pH: float,
+    reference_potential: float = 1.23,
+    constants: PhysicalConstants = CONSTANTS,
+) -> CompiledCatalyst:
+    """Precalcula los terminos de ``catalyst`` que no dependen del potencial."""
+
+    kT = _thermal_energy_ev(temperature, constants)
+    pH_term = kT * math.log(10) * pH
+    compiled = CompiledCatalyst()
+    compiled.name = catalyst.name
+    compiled.temperature = temperature
+    compiled.pH = pH
+    compiled.kT = kT
+    compiled.free_energy_terms = {
+        name: (
+            data.delta_e + data.delta_zpe - temperature * data.delta_s + data.protons * pH_term,
+            data.electrons,
+        )
+        for name, data in catalyst.intermediates.items()
+    }
+    compiled.missing_intermediate = None
+    if catalyst.intermediates:
+        missing = [name for name in ("O*", "OH*") if name not in catalyst.intermediates]
+        if missing:
+            compiled.missing_intermediate = missing[0]
+            compiled.dg1_0 = compiled.dg1_u = compiled.dg2_0 = compiled.dg2_u = math.nan
+        else:
+            g_o, e_o = compiled.free_energy_terms["O*"]
+            g_oh, e_oh = compiled.free_energy_terms["OH*"]
+            compiled.dg1_0, compiled.dg1_u = g_oh - g_o, float(e_oh - e_o)
+            compiled.dg2_0, compiled.dg2_u = WATER_REFERENCE_ENERGY - g_oh, float(-e_oh)
+    else:
+        compiled.dg1_0, compiled.dg1_u = catalyst.delta_g1_u0 - reference_potential, 1.0
+        compiled.dg2_0, compiled.dg2_u = catalyst.delta_g2_u0 - reference_potential, 1.0
+
+    slope = (
+        catalyst.associative_linear_coeff
+        if catalyst.associative_linear_coeff is not None
+        else ASSOCIATIVE_DEFAULT_SLOPE
+    )
+    intercept = (
+        catalyst.associative_intercept
+        if catalyst.associative_intercept is not None
+        else ASSOCIATIVE_DEFAULT_INTERCEPT
+    )
+    delta_binding = abs(catalyst.d_e_o - ASSOCIATIVE_OPTIMAL_BINDING)
+    compiled.associative_0 = intercept + slope * delta_binding - reference_potential
+    compiled.dissociation_barrier = catalyst.dissociation_barrier
+    return compiled
+
+
+# --- Ruta vectorizada ----------------------------------------------------------------------
+#
+# Las funciones ``*_array`` evaluan un conjunto de catalizadores empaquetado en columnas
+# (:class:`CatalystArrays`) sobre arreglos de potencial, temperatura y pH que se combinan por
+# broadcasting. Los resultados tienen forma ``(n_catalizadores,) + forma(U, T, pH)``.
+
+PATHWAYS = ("mecanismo disociativo", "mecanismo asociativo", "disociacion O2")
+"""Nombres de las vias; el codigo de via de :class:`PathwayArrays` es el indice en esta tupla."""
+
+INTERMEDIATE_FIELDS = ("delta_e", "delta_zpe", "delta_s", "electrons", "protons")
+
+DESCRIPTOR_INTERMEDIATES = {
+    "O*": IntermediateData(delta_e=0.0, electrons=0, protons=0),
+    "OH*": IntermediateData(delta_e=0.0, electrons=1, protons=1),
+}
+"""Conteo de electrones/protones de O*/OH* (como en Pt) sin correcciones ZPE ni entropicas."""
+
+
+@dataclass
+class IntermediateArrays:
+    """Datos DFT de un intermedio para varios catalizadores (NaN si el catalizador no los tiene)."""
+
+    delta_e: np.ndarray
+    delta_zpe: np.ndarray
+    delta_s: np.ndarray
+    electrons: np.ndarray
+    protons: np.ndarray
+
+    @classmethod
+    def from_data(cls, data: Sequence[IntermediateData | None]) -> "IntermediateArrays":
+        columns = {
+            name: np.array(
+                [np.nan if item is None else getattr(item, name) for item in data], dtype=float
+            )
+            for name in INTERMEDIATE_FIELDS
+        }
+        return cls(**columns)
+
+
+@dataclass
+class CatalystArrays:
+    """Conjunto de catalizadores en columnas (struct-of-arrays) para la ruta vectorizada.
+
+    ``has_intermediates`` indica que catalizadores usan los datos DFT de O*/OH* en la via
+    disociativa; el resto usa ``delta_g1_u0``/``delta_g2_u0``. Los coeficientes asociativos ya
+    tienen aplicados los valores por defecto.
+    """
+
+    names: Tuple[str, ...]
+    d_e_o: np.ndarray
+    d_e_oh: np.ndarray
+    delta_g1_u0: np.ndarray
+    delta_g2_u0: np.ndarray
+    dissociation_barrier: np.ndarray
+    associative_slope: np.ndarray
+    associative_intercept: np.ndarray
+    has_intermediates: np.ndarray
+    o: IntermediateArrays
+    oh: IntermediateArrays
+
+    @classmethod
+    def from_catalysts(cls, catalysts: Sequence[Catalyst]) -> "CatalystArrays":
+        """Empaqueta ``catalysts``; lanza ``KeyError`` si alguno tiene intermedios sin O*/OH*."""
+
+        catalysts = list(catalysts)
+        for catalyst in catalysts:
+            for intermediate in ("O*", "OH*"):
+                if catalyst.intermediates and intermediate not in catalyst.intermediates:
+                    raise KeyError(
+                        f"No hay datos para el intermedio {intermediate} en {catalyst.name}."
+                    )
+
+        def column(values) -> np.ndarray:
+            return np.array(list(values), dtype=float)
+
+        def intermediates(key: str) -> IntermediateArrays:
+            return IntermediateArrays.from_data([c.intermediates.get(key) for c in catalysts])
+
+        return cls(
+            names=tuple(c.name for c in catalysts),
+            d_e_o=column(c.d_e_o for c in catalysts),
+            d_e_oh=column(c.d_e_oh for c in catalysts),
+            delta_g1_u0=column(c.delta_g1_u0 for c in catalysts),
+            delta_g2_u0=column(c.delta_g2_u0 for c in catalysts),
+            dissociation_barrier=column(c.dissociation_barrier for c in catalysts),
+            associative_slope=column(
+                ASSOCIATIVE_DEFAULT_SLOPE if c.associative_linear_coeff is None
+                else c.associative_linear_coeff
+                for c in catalysts
+            ),
+            associative_intercept=column(
+                ASSOCIATIVE_DEFAULT_INTERCEPT if c.associative_intercept is None
+                else c.associative_intercept
+                for c in catalysts
+            ),
+            has_intermediates=np.array([bool(c.intermediates) for c in catalysts], dtype=bool),
+            o=intermediates("O*"),
+            oh=intermediates("OH*"),
+        )
+
+    @classmethod
+    def from_descriptors(
+        cls,
+        d_e_o,
+        d_e_oh,
+        intermediates: Optional[Mapping[str, IntermediateData]] = None,
+        associative_slope: float = ASSOCIATIVE_DEFAULT_SLOPE,
+        associative_intercept: float = ASSOCIATIVE_DEFAULT_INTERCEPT,
+        dissociation_barrier: float = math.inf,
+    ) -> "CatalystArrays":
+        """Catalizadores "virtuales" definidos solo por sus descriptores (sin ``Catalyst``).
+
+        ``d_e_o`` y ``d_e_oh`` se aplanan y se usan como ``delta_e`` de O* y OH*; de
+        ``intermediates`` solo se toman las correcciones (ZPE, entropia, electrones y
+        protones), por defecto las de :data:`DESCRIPTOR_INTERMEDIATES`. Con
+        ``dissociation_barrier`` infinita la disociacion de O2 nunca domina.
+        """
+
+        d_e_o, d_e_oh = (
+            np.ravel(a).astype(float) for a in np.broadcast_arrays(d_e_o, d_e_oh)
+        )
+        if intermediates is None:
+            intermediates = DESCRIPTOR_INTERMEDIATES
+        size = d_e_o.size
+
+        def corrections(key: str, delta_e: np.ndarray) -> IntermediateArrays:
+            data = intermediates[key]
+            return IntermediateArrays(
+                delta_e=delta_e,
+                **{
+                    name: np.full(size, float(getattr(data, name)))
+                    for name in INTERMEDIATE_FIELDS[1:]
+                },
+            )
+
+        return cls(
+            names=(),
+            d_e_o=d_e_o,
+            d_e_oh=d_e_oh,
+            delta_g1_u0=np.full(size, np.nan),
+            delta_g2_u0=np.full(size, np.nan),
+            dissociation_barrier=np.full(size, float(dissociation_barrier)),
+            associative_slope=np.full(size, float(associative_slope)),
+            associative_intercept=np.full(size, float(associative_intercept)),
+            has_intermediates=np.ones(size, dtype=bool),
+            o=corrections("O*", d_e_o),
+            oh=corrections("OH*", d_e_oh),
+        )
+
+    def __len__(self) -> int:
+        return self.d_e_o.size
+
+
+CatalystSet = Union[CatalystArrays, Catalyst, Sequence[Catalyst]]
+
+
+def as_catalyst_arrays(catalysts: CatalystSet) -> CatalystArrays:
+    """Acepta un :class:`CatalystArrays`, un catalizador o una secuencia de catalizadores."""
+
+    if isinstance(catalysts, CatalystArrays):
+        return catalysts
+    if isinstance(catalysts, Catalyst):
+        catalysts = [catalysts]
+    return CatalystArrays.from_catalysts(catalysts)
+
+
+def _conditions(potential, temperature, pH) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Agrega el eje de catalizadores al frente de ``U``, ``T`` y ``pH``."""
+
+    arrays = np.broadcast_arrays(
+        np.asarray(potential, dtype=float),
+        np.asarray(temperature, dtype=float),
+        np.asarray(pH, dtype=float),
+    )
+    return tuple(a[np.newaxis] for a in arrays)
+
+
+def _column(values: np.ndarray, ndim: int) -> np.ndarray:
+    """Columna de catalizadores con ``ndim`` ejes extra para el broadcasting."""
+
+    return values.reshape(values.shape + (1,) * ndim)
+
+
+def _thermal_energy_ev_array(temperature, constants: PhysicalConstants = CONSTANTS) -> np.ndarray:
+    return constants.boltzmann * np.asarray(temperature, dtype=float) * constants.joule_to_ev
+
+
+def calcular_energia_libre_array(
+    intermediate: IntermediateArrays,
+    potential,
+    pH,
+    temperature,
+    constants: PhysicalConstants = CONSTANTS,
+) -> np.ndarray:
+    """Version vectorizada de :func:`calcular_energia_libre` para un intermedio empaquetado."""
+
+    U, T, pH = _conditions(potential, temperature, pH)
+    ndim = U.ndim - 1
+    delta_g = _column(intermediate.delta_e + intermediate.delta_zpe, ndim)
+    delta_g = delta_g - T * _column(intermediate.delta_s, ndim)
+    delta_g = delta_g + _column(intermediate.electrons, ndim) * U
+    pH_term = _thermal_energy_ev_array(T, constants) * math.log(10) * pH
+    return delta_g + _column(intermediate.protons, ndim) * pH_term
+
+
+def evaluar_mecanismo_disociativo_array(
+    catalysts: CatalystSet,
+    potential,
+    temperature,
+    pH,
+    reference_potential: float = 1.23,
+    constants: PhysicalConstants = CONSTANTS,
+) -> Dict[str, np.ndarray]:
+    """Version vectorizada de :func:`evaluar_mecanismo_disociativo`."""
+
+    cats = as_catalyst_arrays(catalysts)
+    U, _, _ = _conditions(potential, temperature, pH)
+    ndim = U.ndim - 1
+    shift = U - reference_potential
+    delta_g1 = _column(cats.delta_g1_u0, ndim) + shift
+    delta_g2 = _column(cats.delta_g2_u0, ndim) + shift
+    if cats.has_intermediates.any():
+        g_o = calcular_energia_libre_array(cats.o, potential, pH, temperature, constants)
+        g_oh = calcular_energia_libre_array(cats.oh, potential, pH, temperature, constants)
+        dft = _column(cats.has_intermediates, ndim)
+        delta_g1 = np.where(dft, g_oh - g_o, delta_g1)
+        delta_g2 = np.where(dft, WATER_REFERENCE_ENERGY - g_oh, delta_g2)
+    return {
+        "delta_g1": delta_g1,
+        "delta_g2": delta_g2,
+        "limiting": np.maximum(delta_g1, delta_g2),
+    }
+
+
+def evaluar_mecanismo_asociativo_array(
+    catalysts: CatalystSet,
+    potential,
+    reference_potential: float = 1.23,
+) -> Dict[str, np.ndarray]:
+    """Version vectorizada de :func:`evaluar_mecanismo_asociativo`."""
+
+    cats = as_catalyst_arrays(catalysts)
+    U = np.asarray(potential, dtype=float)[np.newaxis]
+    ndim = U.ndim - 1
+    base = cats.associative_intercept + cats.associative_slope * np.abs(
+        cats.d_e_o - ASSOCIATIVE_OPTIMAL_BINDING
+    )
+    return {"barrier": _column(base, ndim) + (U - reference_potential)}
+
+
+@dataclass
+class PathwayArrays:
+    """Via dominante y barreras por catalizador y condicion."""
+
+    pathway: np.ndarray  # codigo de via (indice en PATHWAYS)
+    barrier: np.ndarray  # eV, barrera de la via dominante
+    delta_g1: np.ndarray
+    delta_g2: np.ndarray
+    dissociative: np.ndarray  # eV, barrera limitante de la via disociativa
+    associative: np.ndarray  # eV
+    dissociation: np.ndarray  # eV, barrera de disociacion de O2
+
+    @property
+    def pathway_names(self) -> np.ndarray:
+        return np.asarray(PATHWAYS, dtype=object)[self.pathway]
+
+
+def determinar_via_dominante_array(
+    catalysts: CatalystSet,
+    potential,
+    temperature,
+    pH,
+    constants: PhysicalConstants = CONSTANTS,
+) -> PathwayArrays:
+    """Version vectorizada de :func:`determinar_via_dominante`.
+
+    Ante empates gana la primera via de :data:`PATHWAYS`, igual que en la version escalar.
+    """
+
+    cats = as_catalyst_arrays(catalysts)
+    U, T, pH = np.broadcast_arrays(
+        np.asarray(potential, dtype=float),
+        np.asarray(temperature, dtype=float),
+        np.asarray(pH, dtype=float),
+    )
+    dis = evaluar_mecanismo_disociativo_array(cats, U, T, pH, constants=constants)
+    assoc = evaluar_mecanismo_asociativo_array(cats, U)["barrier"]
+    dissociation = np.broadcast_to(_column(cats.dissociation_barrier, U.ndim), assoc.shape)
+
+    barrier = dis["limiting"].copy()
+    pathway = np.zeros(barrier.shape, dtype=np.int8)
+    for code, candidate in ((1, assoc), (2, dissociation)):
+        lower = candidate < barrier
+        barrier = np.where(lower, candidate, barrier)
+        pathway[lower] = code
+    return PathwayArrays(
+        pathway=pathway,
+        barrier=barrier,
+        delta_g1=dis["delta_g1"],
+        delta_g2=dis["delta_g2"],
+        dissociative=dis["limiting"],
+        associative=assoc,
+        dissociation=dissociation,
+    )
+
+
+def actividad_desde_barrera(barrier, temperature, constants: PhysicalConstants = CONSTANTS):
+    """A = exp(-DeltaG*/kT); NaN donde la temperatura no es valida (kT <= 0)."""
+
+    kT = _thermal_energy_ev_array(temperature, constants)
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        return np.where(kT > 0, np.exp(-barrier / kT), np.nan)
+
+
+def calcular_actividad_array(
+    catalysts: CatalystSet,
+    potential,
+    temperature,
+    pH,
+    constants: PhysicalConstants = CONSTANTS,
+) -> Tuple[np.ndarray, PathwayArrays]:
+    """Version vectorizada de :func:`calcular_actividad`; devuelve ``(actividad, vias)``."""
+
+    decision = determinar_via_dominante_array(catalysts, potential, temperature, pH, constants)
+    T = _conditions(potential, temperature, pH)[1]
+    return actividad_desde_barrera(decision.barrier, T, constants), decision
+
+
+@dataclass
+class BarrierLines:
+    """Barreras del modelo como rectas en U: ``barrera = intercept + slope * U``.
+
+    El ultimo eje recorre :data:`BARRIER_LINES` (DeltaG1, DeltaG2, asociativa, disociacion O2);
+    los demas son ``(n_catalizadores,) + forma(T, pH)``. Es la version en arreglos de
+    :class:`CompiledCatalyst`.
+    """
+
+    intercept: np.ndarray
+    slope: np.ndarray
+    kT: np.ndarray
+
+
+BARRIER_LINES = ("delta_g1", "delta_g2", "asociativa", "disociacion O2")
+LINE_PATHWAYS = np.array([0, 0, 1, 2], dtype=np.int8)
+"""Codigo de via (indice en :data:`PATHWAYS`) de cada recta de :data:`BARRIER_LINES`."""
+
+
+def barrier_lines(
+    catalysts: CatalystSet,
+    temperature=298.15,
+    pH=0.0,
+    reference_potential: float = 1.23,
+    constants: PhysicalConstants = CONSTANTS,
+) -> BarrierLines:
+    """Ordenadas y pendientes de las cuatro barreras a (T, pH) fijos, para cada catalizador."""
+
+    cats = as_catalyst_arrays(catalysts)
+    _, T, pH = _conditions(0.0, temperature, pH)
+    ndim = T.ndim - 1
+    pH_term = _thermal_energy_ev_array(T, constants) * math.log(10) * pH
+
+    def free_energy_0(data: IntermediateArrays) -> np.ndarray:
+        constant = _column(data.delta_e + data.delta_zpe, ndim) - T * _column(data.delta_s, ndim)
+        return constant + _column(data.protons, ndim) * pH_term
+
+    shape = (len(cats),) + T.shape[1:]
+    g_o, g_oh = free_energy_0(cats.o), free_energy_0(cats.oh)
+    dft = _column(cats.has_intermediates, ndim)
+    e_o, e_oh = _column(cats.o.electrons, ndim), _column(cats.oh.electrons, ndim)
+    g1_u0 = _column(cats.delta_g1_u0, ndim) - reference_potential
+    g2_u0 = _column(cats.delta_g2_u0, ndim) - reference_potential
+    associative = (
+        cats.associative_intercept
+        + cats.associative_slope * np.abs(cats.d_e_o - ASSOCIATIVE_OPTIMAL_BINDING)
+        - reference_potential
+    )
+    intercept = np.stack(
+        np.broadcast_arrays(
+            np.where(dft, g_oh - g_o, g1_u0),
+            np.where(dft, WATER_REFERENCE_ENERGY - g_oh, g2_u0),
+            _column(associative, ndim),
+            _column(cats.dissociation_barrier, ndim),
+        ),
+        axis=-1,
+    )
+    slope = np.stack(
+        np.broadcast_arrays(
+            np.where(dft, e_oh - e_o, 1.0),
+            np.where(dft, -e_oh, 1.0),
+            np.ones(shape),
+            np.zeros(shape),
+        ),
+        axis=-1,
+    )
+    intercept = np.broadcast_to(intercept, shape + (4,))
+    slope = np.broadcast_to(slope, shape + (4,))
+    kT = np.broadcast_to(_thermal_energy_ev_array(T, constants), shape)
+    return BarrierLines(intercept=intercept, slope=slope, kT=kT)
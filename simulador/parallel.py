@@ -0,0 +1,120 @@
+"""Barridos en paralelo sobre muchas configuraciones con memoria compartida."""
+
+from __future__ import annotations
+
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .constants import CONSTANTS, PhysicalConstants
+from .electrochemistry import compile_config
+from .grid import COMPONENTS, GridResult
+from .models import ElectrolyzerConfig
+
+_FLOAT_COLUMNS = ("voltage",) + COMPONENTS
+
+
+def _attach(name: str, shape: Tuple[int, ...], dtype) -> Tuple[shared_memory.SharedMemory, np.ndarray]:
+    block = shared_memory.SharedMemory(name=name)
+    return block, np.ndarray(shape, dtype=dtype, buffer=block.buf)
+
+
+def _run_shard(
+    start: int,
+    configs: Sequence[ElectrolyzerConfig],
+    constants: PhysicalConstants,
+    names: Tuple[str, str, str],
+    shape: Tuple[int, int],
+) -> int:
+    """Evalua las filas ``start .. start+len(configs)`` y las escribe en memoria compartida."""
+
+    n_configs, n_currents = shape
+    blocks = []
+    try:
+        block, currents = _attach(names[0], (n_currents,), float)
+        blocks.append(block)
+        block, values = _attach(names[1], (len(_FLOAT_COLUMNS), n_configs, n_currents), float)
+        blocks.append(block)
+        block, valid = _attach(names[2], (n_configs, n_currents), bool)
+        blocks.append(block)
+        for offset, config in enumerate(configs):
+            row = start + offset
+            result = compile_config(config, constants).evaluate(currents)
+            for column, name in enumerate(_FLOAT_COLUMNS):
+                values[column, row] = getattr(result, name)
+            valid[row] = result.valid
+        # Soltar las vistas antes de cerrar los bloques.
+        del currents, values, valid
+    finally:
+        for block in blocks:
+            block.close()
+    return len(configs)
+
+
+def parallel_sweep(
+    configs: Sequence[ElectrolyzerConfig],
+    currents: Sequence[float],
+    constants: PhysicalConstants = CONSTANTS,
+    max_workers: Optional[int] = None,
+    shard_size: Optional[int] = None,
+) -> GridResult:
+    """Evalua la curva de cada configuracion repartiendo el trabajo en procesos.
+
+    Las configuraciones se dividen en bloques contiguos; cada proceso escribe sus filas en
+    arreglos de ``multiprocessing.shared_memory`` en lugar de devolver listas serializadas. Cada
+    fila se calcula de forma independiente, asi que el resultado es identico para cualquier
+    numero de procesos. Con ``max_workers=1`` todo corre en el proceso actual.
+    """
+
+    configs = list(configs)
+    currents = np.asarray(currents, dtype=float).ravel()
+    shape = (len(configs), currents.size)
+    workers = max_workers or os.cpu_count() or 1
+    if shard_size is None:
+        shard_size = max(1, math.ceil(len(configs) / (workers * 4)))
+
+    sizes = (currents.nbytes, len(_FLOAT_COLUMNS) * shape[0] * shape[1] * 8, shape[0] * shape[1])
+    blocks: List[shared_memory.SharedMemory] = [
+        shared_memory.SharedMemory(create=True, size=max(size, 1)) for size in sizes
+    ]
+    try:
+        np.ndarray(currents.shape, dtype=float, buffer=blocks[0].buf)[:] = currents
+        names = tuple(block.name for block in blocks)
+        shards = [
+            (start, configs[start : start + shard_size])
+            for start in range(0, len(configs), shard_size)
+        ]
+        if workers == 1:
+            for start, chunk in shards:
+                _run_shard(start, chunk, constants, names, shape)
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [
+                    pool.submit(_run_shard, start, chunk, constants, names, shape)
+                    for start, chunk in shards
+                ]
+                for future in futures:
+                    future.result()
+
+        values = np.ndarray((len(_FLOAT_COLUMNS),) + shape, dtype=float, buffer=blocks[1].buf)
+        valid = np.ndarray(shape, dtype=bool, buffer=blocks[2].buf)
+        columns = {name: values[column].copy() for column, name in enumerate(_FLOAT_COLUMNS)}
+        valid = valid.copy()
+        del values
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+    voltage = columns.pop("voltage")
+    return GridResult(
+        dims=("config", "current_density"),
+        coords={"config": np.arange(shape[0]), "current_density": currents},
+        voltage=voltage,
+        valid=valid,
+        components=columns,
+    )
@@ -0,0 +1,207 @@
+"""Solucion cerrada de la actividad ORR como funcion lineal por tramos del potencial.
+
+A (T, pH) fijos las cuatro barreras de :mod:`simulador.orr` son rectas en U y la barrera
+dominante es ``min(max(DeltaG1, DeltaG2), asociativa, disociacion O2)``, de modo que log10(A)
+es lineal por tramos. Los quiebres son intersecciones entre pares de rectas (a lo sumo seis),
+asi que se obtienen de forma exacta sin barrer potenciales.
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass, field
+from itertools import combinations
+from typing import Tuple
+
+import numpy as np
+
+from .constants import CONSTANTS, PhysicalConstants
+from .orr import LINE_PATHWAYS, BarrierLines, CatalystSet, barrier_lines
+
+_PAIRS = np.array(list(combinations(range(4), 2)))
+MAX_BREAKPOINTS = len(_PAIRS)
+
+
+def _active_line(intercept: np.ndarray, slope: np.ndarray, potential: np.ndarray) -> np.ndarray:
+    """Recta dominante en ``potential`` con las reglas de desempate de la version escalar.
+
+    ``intercept``/``slope`` tienen forma ``(..., 4)`` y ``potential`` ``(..., k)``.
+    """
+
+    values = intercept[..., np.newaxis, :] + slope[..., np.newaxis, :] * potential[..., np.newaxis]
+    line = np.where(values[..., 0] >= values[..., 1], 0, 1)
+    barrier = np.maximum(values[..., 0], values[..., 1])
+    for candidate in (2, 3):
+        lower = values[..., candidate] < barrier
+        line = np.where(lower, candidate, line)
+        barrier = np.where(lower, values[..., candidate], barrier)
+    return line.astype(np.int8)
+
+
+def _pack(values: np.ndarray, keep: np.ndarray, fill) -> np.ndarray:
+    """Mueve al frente los elementos con ``keep`` del ultimo eje y rellena el resto."""
+
+    order = np.argsort(~keep, axis=-1, kind="stable")
+    packed = np.take_along_axis(values, order, axis=-1)
+    return np.where(np.take_along_axis(keep, order, axis=-1), packed, fill)
+
+
+@dataclass
+class ActivityPieces:
+    """Barrera dominante como recta por tramos en U, para cada catalizador y (T, pH).
+
+    El ultimo eje de ``breakpoints`` (``MAX_BREAKPOINTS``) y de los tramos
+    (``MAX_BREAKPOINTS + 1``) esta ordenado y relleno con NaN / -1 al final. El tramo ``k``
+    va de ``breakpoints[k - 1]`` a ``breakpoints[k]`` (con -inf/+inf en los extremos).
+    """
+
+    breakpoints: np.ndarray  # V
+    line: np.ndarray  # indice en orr.BARRIER_LINES de cada tramo (-1 si no existe)
+    intercept: np.ndarray  # eV
+    slope: np.ndarray  # eV/V
+    n_segments: np.ndarray
+    kT: np.ndarray  # eV
+    lines: BarrierLines = field(repr=False)
+
+    @property
+    def pathway(self) -> np.ndarray:
+        """Codigo de via (indice en :data:`~simulador.orr.PATHWAYS`) por tramo (-1 si no existe)."""
+
+        return np.where(self.line >= 0, LINE_PATHWAYS[self.line], -1).astype(np.int8)
+
+    def segment(self, potentials) -> np.ndarray:
+        """Tramo de cada potencial; forma ``(...) + forma(potentials)``."""
+
+        U = np.asarray(potentials, dtype=float)
+        bp = self.breakpoints.reshape(self.breakpoints.shape[:-1] + (1,) * U.ndim + (-1,))
+        # Los NaN de relleno comparan como False y no cuentan.
+        return np.sum(U[..., np.newaxis] > bp, axis=-1)
+
+    def barrier(self, potentials) -> np.ndarray:
+        """Barrera dominante (eV) evaluada con los tramos; forma ``(...) + forma(potentials)``."""
+
+        U = np.asarray(potentials, dtype=float)
+        segment = self.segment(U)
+        lead = self.intercept.shape[:-1]
+        flat = segment.reshape(lead + (-1,))
+        intercept = np.take_along_axis(self.intercept, flat, axis=-1).reshape(segment.shape)
+        slope = np.take_along_axis(self.slope, flat, axis=-1).reshape(segment.shape)
+        return intercept + slope * U
+
+    def log10_activity(self, potentials) -> np.ndarray:
+        U = np.asarray(potentials, dtype=float)
+        kT = self.kT.reshape(self.kT.shape + (1,) * U.ndim)
+        return -self.barrier(U) / (kT * math.log(10))
+
+    def activity(self, potentials) -> np.ndarray:
+        U = np.asarray(potentials, dtype=float)
+        kT = self.kT.reshape(self.kT.shape + (1,) * U.ndim)
+        return np.exp(-self.barrier(U) / kT)
+
+    def switch_potentials(self) -> np.ndarray:
+        """Quiebres donde cambia la via dominante (los cambios DeltaG1/DeltaG2 no cuentan)."""
+
+        pathway = self.pathway
+        switch = (pathway[..., :-1] != pathway[..., 1:]) & (pathway[..., 1:] >= 0)
+        return _pack(self.breakpoints, switch, np.nan)
+
+    def limiting_potential(self) -> np.ndarray:
+        """Mayor U con los dos pasos disociativos cuesta abajo (DeltaG1, DeltaG2 <= 0).
+
+        NaN si no existe tal potencial e ``inf`` si no esta acotado.
+        """
+
+        a = self.lines.intercept[..., :2]
+        s = self.lines.slope[..., :2]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            root = -a / s
+        upper = np.min(np.where(s > 0, root, np.inf), axis=-1)
+        lower = np.max(np.where(s < 0, root, -np.inf), axis=-1)
+        blocked = np.any((s == 0) & (a > 0), axis=-1) | (lower > upper)
+        return np.where(blocked, np.nan, upper)
+
+    def onset_potential(self, threshold: float = 0.0) -> np.ndarray:
+        """Mayor U con barrera dominante ``<= threshold`` (A >= exp(-threshold/kT)).
+
+        NaN si la barrera nunca baja del umbral e ``inf`` si no esta acotado.
+        """
+
+        n = self.line.shape[-1]
+        lead = self.breakpoints.shape[:-1]
+        low = np.concatenate([np.full(lead + (1,), -np.inf), self.breakpoints], axis=-1)
+        high = np.concatenate([self.breakpoints, np.full(lead + (1,), np.inf)], axis=-1)
+        # El ultimo tramo existente termina en +inf aunque siga relleno de NaN.
+        last = np.arange(n) == (self.n_segments[..., np.newaxis] - 1)
+        high = np.where(last, np.inf, high)
+        a, s = self.intercept, self.slope
+        with np.errstate(divide="ignore", invalid="ignore"):
+            root = (threshold - a) / s
+        # Supremo de {U en el tramo : a + s U <= threshold}, o -inf si el conjunto es vacio.
+        rising = np.where(root >= low, np.minimum(high, root), -np.inf)
+        falling = np.where(high >= root, high, -np.inf)
+        flat = np.where(a <= threshold, high, -np.inf)
+        sup = np.where(s > 0, rising, np.where(s < 0, falling, flat))
+        sup = np.max(np.where(self.line >= 0, sup, -np.inf), axis=-1)
+        return np.where(sup == -np.inf, np.nan, sup)
+
+    def vertices(self, index: Tuple[int, ...], potential_min: float, potential_max: float):
+        """Potenciales y log10(A) de los vertices en ``[potential_min, potential_max]``.
+
+        ``index`` elige el catalizador/condicion; uniendo los vertices con rectas se obtiene la
+        curva exacta de log10(A) vs U.
+        """
+
+        inner = self.breakpoints[index]
+        inner = inner[(inner > potential_min) & (inner < potential_max)]
+        U = np.concatenate([[potential_min], inner, [potential_max]])
+        segment = np.sum(U[:, np.newaxis] > self.breakpoints[index][np.newaxis, :], axis=-1)
+        barrier = self.intercept[index][segment] + self.slope[index][segment] * U
+        return U, -barrier / (self.kT[index] * math.log(10))
+
+
+def activity_pieces(
+    catalysts: CatalystSet,
+    temperature=298.15,
+    pH=0.0,
+    reference_potential: float = 1.23,
+    constants: PhysicalConstants = CONSTANTS,
+) -> ActivityPieces:
+    """Quiebres y tramos exactos de la barrera dominante vs U, vectorizado en catalizadores.
+
+    Las formas de salida son ``(n_catalizadores,) + forma(T, pH)`` mas el eje de tramos.
+    """
+
+    lines = barrier_lines(catalysts, temperature, pH, reference_potential, constants)
+    a, s = lines.intercept, lines.slope
+    i, j = _PAIRS[:, 0], _PAIRS[:, 1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        crossings = (a[..., j] - a[..., i]) / (s[..., i] - s[..., j])
+    crossings = np.sort(np.where(np.isfinite(crossings), crossings, np.nan), axis=-1)
+
+    # Un potencial de prueba dentro de cada intervalo entre cruces consecutivos.
+    lead = crossings.shape[:-1]
+    low = np.concatenate([crossings[..., :1] - 2.0, crossings], axis=-1)
+    high = np.concatenate([crossings, crossings[..., -1:] + 2.0], axis=-1)
+    probe = np.where(np.isnan(high), low + 1.0, 0.5 * (low + high))
+    probe[..., 0] = np.where(np.isnan(crossings[..., 0]), 0.0, probe[..., 0])
+    exists = ~np.isnan(probe)
+    line = _active_line(a, s, np.where(exists, probe, 0.0))
+    # Los intervalos inexistentes (al final) repiten la recta anterior y no generan quiebres.
+    last = np.maximum.accumulate(np.where(exists, np.arange(probe.shape[-1]), 0), axis=-1)
+    line = np.take_along_axis(line, last, axis=-1)
+
+    change = line[..., :-1] != line[..., 1:]
+    keep = np.concatenate([np.ones(lead + (1,), dtype=bool), change], axis=-1)
+    breakpoints = _pack(crossings, change, np.nan)
+    line = _pack(line, keep, -1).astype(np.int8)
+    safe = np.maximum(line, 0)
+    present = line >= 0
+    return ActivityPieces(
+        breakpoints=breakpoints,
+        line=line,
+        intercept=np.where(present, np.take_along_axis(a, safe, axis=-1), np.nan),
+        slope=np.where(present, np.take_along_axis(s, safe, axis=-1), np.nan),
+        n_segments=keep.sum(axis=-1),
+        kT=np.asarray(lines.kT),
+        lines=lines,
+    )
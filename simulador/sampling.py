@@ -0,0 +1,111 @@
+"""Muestreo adaptativo de la densidad de corriente para curvas de polarizacion."""
+
+from __future__ import annotations
+
+from typing import List, Tuple
+
+import numpy as np
+
+from .constants import CONSTANTS, PhysicalConstants
+from .electrochemistry import compile_config, polarization_curve
+from .models import ElectrolyzerConfig
+
+DEFAULT_TOLERANCE = 1e-3  # V
+MIN_RELATIVE_WIDTH = 1e-9
+"""Ancho minimo de un intervalo, relativo al rango, por debajo del cual no se subdivide."""
+
+
+def _interval_error(y_left, y_mid, y_right, width, min_width) -> np.ndarray:
+    """Desvio del punto medio respecto de la interpolacion lineal de los extremos.
+
+    Si la validez cambia dentro del intervalo (p. ej. al cruzar i_lim) el error es infinito
+    para seguir refinando el borde hasta ``min_width``.
+    """
+
+    finite = np.isfinite(np.stack([y_left, y_mid, y_right]))
+    with np.errstate(invalid="ignore"):
+        error = np.abs(y_mid - 0.5 * (y_left + y_right))
+    error = np.where(finite.all(axis=0), error, np.where(finite.any(axis=0), np.inf, 0.0))
+    return np.where(width > min_width, error, 0.0)
+
+
+def adaptive_currents(
+    config: ElectrolyzerConfig,
+    current_min: float,
+    current_max: float,
+    tolerance: float = DEFAULT_TOLERANCE,
+    max_points: int = 2_000,
+    initial_points: int = 9,
+    constants: PhysicalConstants = CONSTANTS,
+) -> np.ndarray:
+    """Corrientes en ``[current_min, current_max]`` refinadas donde V(i) se curva.
+
+    Parte de ``initial_points`` puntos uniformes y subdivide (por biseccion y de forma
+    vectorizada) cada intervalo cuyo punto medio se aparta mas de ``tolerance`` voltios de la
+    recta entre sus extremos, hasta cumplir la tolerancia o llegar a ``max_points``; en ese caso
+    se subdividen primero los intervalos de mayor error. La zona ohmica casi lineal queda con
+    pocos puntos y la rodilla cerca de i_lim (y la zona de Tafel a baja corriente) con muchos.
+    Cada punto medio evaluado termina en la curva, asi que no se desperdician evaluaciones.
+    """
+
+    if not current_max > current_min:
+        raise ValueError("La corriente minima debe ser menor que la maxima.")
+    if max_points < 2 or initial_points < 2:
+        raise ValueError("Se necesitan al menos dos puntos.")
+    kernel = compile_config(config, constants)
+
+    def voltage(currents: np.ndarray) -> np.ndarray:
+        result = kernel.evaluate(currents)
+        return np.where(result.valid, result.voltage, np.nan)
+
+    min_width = (current_max - current_min) * MIN_RELATIVE_WIDTH
+    x = np.linspace(current_min, current_max, min(initial_points, max_points))
+    y = voltage(x)
+    x_mid = 0.5 * (x[:-1] + x[1:])
+    y_mid = voltage(x_mid)
+    error = _interval_error(y[:-1], y_mid, y[1:], np.diff(x), min_width)
+
+    while x.size < max_points:
+        split = np.flatnonzero(error > tolerance)
+        if split.size == 0:
+            break
+        budget = max_points - x.size
+        if split.size > budget:
+            split = np.sort(split[np.argpartition(error[split], -budget)[-budget:]])
+
+        left, right = x[split], x[split + 1]
+        middle, y_middle = x_mid[split], y_mid[split]
+        halves_mid = np.concatenate([0.5 * (left + middle), 0.5 * (middle + right)])
+        y_halves = voltage(halves_mid)
+        n = split.size
+        error_left = _interval_error(y[split], y_halves[:n], y_middle, middle - left, min_width)
+        error_right = _interval_error(y_middle, y_halves[n:], y[split + 1], right - middle, min_width)
+
+        # El intervalo k pasa a ser la mitad izquierda y la derecha se inserta a continuacion.
+        x_mid[split], y_mid[split], error[split] = halves_mid[:n], y_halves[:n], error_left
+        x_mid = np.insert(x_mid, split + 1, halves_mid[n:])
+        y_mid = np.insert(y_mid, split + 1, y_halves[n:])
+        error = np.insert(error, split + 1, error_right)
+        x = np.insert(x, split + 1, middle)
+        y = np.insert(y, split + 1, y_middle)
+    return x
+
+
+def adaptive_polarization_curve(
+    config: ElectrolyzerConfig,
+    current_min: float,
+    current_max: float,
+    tolerance: float = DEFAULT_TOLERANCE,
+    max_points: int = 2_000,
+    constants: PhysicalConstants = CONSTANTS,
+) -> Tuple[List[float], List[float]]:
+    """Version adaptativa de :func:`~simulador.electrochemistry.polarization_curve`.
+
+    Devuelve ``(corrientes, voltajes)``; como la funcion original, lanza ``ValueError`` si algun
+    punto del rango es invalido.
+    """
+
+    currents = adaptive_currents(
+        config, current_min, current_max, tolerance, max_points, constants=constants
+    )
+    return currents.tolist(), polarization_curve(currents, config, constants)
@@ -0,0 +1,258 @@
+"""Cribado de catalogos grandes: actividad ORR por bloques y ranking top-k."""
+
+from __future__ import annotations
+
+import heapq
+import math
+import os
+import pathlib
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+from .catalog import DEFAULT_CHUNK_SIZE, CatalogStore, iter_catalog_csv, iter_catalyst_chunks
+from .constants import CONSTANTS, PhysicalConstants
+from .microkinetics import CoverageInteractions, solve_steady_state
+from .models import Catalyst
+from .orr import CatalystArrays, determinar_via_dominante_array
+
+SCORES = ("log_activity", "barrier", "microkinetic")
+"""Criterios de ranking: media de log10(A) sobre los puntos de operacion, la peor barrera
+(se ordena por ``-max(barrera)``) o la media de log10 de la velocidad estacionaria de
+:mod:`simulador.microkinetics`. En todos los casos un puntaje mayor es mejor."""
+
+CatalogSource = Union[
+    str, pathlib.Path, CatalogStore, Iterable[CatalystArrays], Iterable[Catalyst]
+]
+
+
+@dataclass
+class RankedCatalyst:
+    """Entrada del ranking con sus barreras y vias en cada punto de operacion."""
+
+    name: str
+    index: int  # posicion en el catalogo
+    score: float
+    barrier: np.ndarray  # eV, (n_puntos,)
+    pathway: np.ndarray  # codigos de orr.PATHWAYS, (n_puntos,)
+
+
+@dataclass
+class ScreeningResult:
+    """Mejores ``k`` catalizadores (de mayor a menor puntaje) y los puntos evaluados."""
+
+    ranking: List[RankedCatalyst]
+    n_evaluated: int
+    potential: np.ndarray
+    temperature: np.ndarray
+    pH: np.ndarray
+    score: str
+
+
+class TopK:
+    """Heap acotado con los ``k`` mayores puntajes; los empates favorecen el menor indice."""
+
+    def __init__(self, k: int) -> None:
+        if k <= 0:
+            raise ValueError("k debe ser positivo.")
+        self.k = k
+        self._heap: List[Tuple[float, int, RankedCatalyst]] = []
+
+    def push(self, entry: RankedCatalyst) -> None:
+        item = (entry.score, -entry.index, entry)
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, item)
+        elif item[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, item)
+
+    def extend(self, entries: Iterable[RankedCatalyst]) -> None:
+        for entry in entries:
+            self.push(entry)
+
+    def ranking(self) -> List[RankedCatalyst]:
+        return [item[2] for item in sorted(self._heap, key=lambda item: item[:2], reverse=True)]
+
+
+def operating_points(potentials, temperatures, pH) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Combina ``U``, ``T`` y ``pH`` por broadcasting y los aplana a vectores de puntos."""
+
+    arrays = np.broadcast_arrays(
+        np.asarray(potentials, dtype=float),
+        np.asarray(temperatures, dtype=float),
+        np.asarray(pH, dtype=float),
+    )
+    return tuple(np.ravel(a).copy() for a in arrays)
+
+
+def microkinetic_log_rate(
+    cats: CatalystArrays,
+    points: Tuple[np.ndarray, np.ndarray, np.ndarray],
+    interactions: CoverageInteractions = CoverageInteractions(),
+    constants: PhysicalConstants = CONSTANTS,
+) -> np.ndarray:
+    """log10 de la velocidad estacionaria ``(n, n_puntos)``, un barrido de U por cada (T, pH)."""
+
+    potential, temperature, pH = points
+    out = np.empty((len(cats), potential.size))
+    conditions, group = np.unique(np.stack([temperature, pH], axis=1), axis=0, return_inverse=True)
+    group = group.ravel()
+    for index, (T, p) in enumerate(conditions):
+        columns = np.flatnonzero(group == index)
+        state = solve_steady_state(
+            cats, potential[columns], T, p, interactions, constants=constants
+        )
+        out[:, columns] = state.log10_rate
+    return out
+
+
+def score_chunk(
+    cats: CatalystArrays,
+    points: Tuple[np.ndarray, np.ndarray, np.ndarray],
+    score: str = "log_activity",
+    interactions: CoverageInteractions = CoverageInteractions(),
+    constants: PhysicalConstants = CONSTANTS,
+):
+    """Puntaje por catalizador del bloque y la decision de via ``(n, n_puntos)``.
+
+    Los catalizadores con barreras NaN, o con velocidad neta no positiva en algun punto para
+    ``"microkinetic"``, quedan con puntaje ``-inf``.
+    """
+
+    if score not in SCORES:
+        raise ValueError(f"Criterio de ranking desconocido: {score}.")
+    potential, temperature, pH = points
+    decision = determinar_via_dominante_array(cats, potential, temperature, pH, constants)
+    if score == "log_activity":
+        kT = constants.boltzmann * temperature * constants.joule_to_ev
+        values = np.mean(-decision.barrier / (kT * math.log(10)), axis=1)
+    elif score == "microkinetic":
+        values = np.mean(microkinetic_log_rate(cats, points, interactions, constants), axis=1)
+    else:
+        values = -np.max(decision.barrier, axis=1)
+    return np.where(np.isnan(values), -np.inf, values), decision
+
+
+def _chunk_top(
+    cats: CatalystArrays,
+    offset: int,
+    points: Tuple[np.ndarray, np.ndarray, np.ndarray],
+    k: int,
+    score: str,
+    interactions: CoverageInteractions,
+    constants: PhysicalConstants,
+) -> Tuple[int, List[RankedCatalyst]]:
+    """Evalua un bloque y devuelve ``(n, mejores k del bloque)``; corre en los procesos."""
+
+    values, decision = score_chunk(cats, points, score, interactions, constants)
+    n = len(values)
+    if n > k:
+        # k-esimo mayor puntaje; entre los empatados en el umbral se quedan los de menor indice,
+        # como en TopK.
+        threshold = np.partition(values, n - k)[n - k]
+        above = np.flatnonzero(values > threshold)
+        tied = np.flatnonzero(values == threshold)[: k - above.size]
+        rows = np.concatenate([above, tied])
+    else:
+        rows = np.arange(n)
+    entries = [
+        RankedCatalyst(
+            name=cats.names[row] if cats.names else str(offset + row),
+            index=offset + int(row),
+            score=float(values[row]),
+            barrier=decision.barrier[row].copy(),
+            pathway=decision.pathway[row].copy(),
+        )
+        for row in rows
+    ]
+    return n, entries
+
+
+def _as_chunks(source: CatalogSource, chunk_size: int) -> Iterator[CatalystArrays]:
+    if isinstance(source, CatalogStore):
+        return source.iter_chunks(chunk_size)
+    if isinstance(source, (str, pathlib.Path)):
+        if pathlib.Path(source).is_dir():
+            return CatalogStore(source).iter_chunks(chunk_size)
+        return iter_catalog_csv(source, chunk_size)
+    if isinstance(source, CatalystArrays):
+        return iter([source])
+    iterator = iter(source)
+    first = next(iterator, None)
+    if first is None:
+        return iter(())
+    rest = (item for chunks in ([first], iterator) for item in chunks)
+    if isinstance(first, CatalystArrays):
+        return rest
+    return iter_catalyst_chunks(rest, chunk_size)
+
+
+def screen_catalysts(
+    source: CatalogSource,
+    potentials,
+    temperatures=298.15,
+    pH=0.0,
+    k: int = 10,
+    score: str = "log_activity",
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    max_workers: Optional[int] = 1,
+    interactions: CoverageInteractions = CoverageInteractions(),
+    constants: PhysicalConstants = CONSTANTS,
+) -> ScreeningResult:
+    """Recorre un catalogo en bloques y devuelve los ``k`` mejores catalizadores.
+
+    ``source`` puede ser la ruta de un CSV (:func:`~simulador.catalog.iter_catalog_csv`) o de
+    un :class:`~simulador.catalog.CatalogStore`, un almacen abierto, o un iterable de bloques
+    :class:`~simulador.orr.CatalystArrays` o de ``Catalyst``. Cada bloque se reduce a sus ``k``
+    mejores antes de pasar al heap global, asi que la memoria depende de ``chunk_size`` y
+    ``k``, no del tamano del catalogo. Con ``max_workers`` distinto de 1 los
+    bloques se evaluan en un ``ProcessPoolExecutor`` con a lo sumo ``2 * max_workers`` bloques
+    en vuelo; el ranking es el mismo para cualquier numero de procesos. ``interactions`` solo
+    se usa con ``score="microkinetic"``.
+    """
+
+    points = operating_points(potentials, temperatures, pH)
+    if score not in SCORES:
+        raise ValueError(f"Criterio de ranking desconocido: {score}.")
+    top = TopK(k)
+    evaluated = 0
+    offset = 0
+    chunks = _as_chunks(source, chunk_size)
+    workers = max_workers or os.cpu_count() or 1
+
+    if workers == 1:
+        for cats in chunks:
+            n, entries = _chunk_top(cats, offset, points, k, score, interactions, constants)
+            offset += len(cats)
+            evaluated += n
+            top.extend(entries)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = set()
+            for cats in chunks:
+                pending.add(
+                    pool.submit(
+                        _chunk_top, cats, offset, points, k, score, interactions, constants
+                    )
+                )
+                offset += len(cats)
+                if len(pending) >= 2 * workers:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        n, entries = future.result()
+                        evaluated += n
+                        top.extend(entries)
+            for future in pending:
+                n, entries = future.result()
+                evaluated += n
+                top.extend(entries)
+
+    return ScreeningResult(
+        ranking=top.ranking(),
+        n_evaluated=evaluated,
+        potential=points[0],
+        temperature=points[1],
+        pH=points[2],
+        score=score,
+    )
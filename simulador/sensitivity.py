@@ -0,0 +1,185 @@
+"""Derivadas analiticas del voltaje de celda respecto de cada parametro del modelo."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Tuple
+
+import numpy as np
+
+from .constants import CONSTANTS, PhysicalConstants
+from .electrochemistry import compile_config
+from .models import ElectrodeKinetics, ElectrolyzerConfig
+
+PARAMETERS = (
+    "thermo.delta_h_ref",
+    "thermo.delta_s_ref",
+    "thermo.reference_temperature",
+    "thermo.reference_potential",
+    "thermo.electrons",
+    "kinetics_anode.i0_ref",
+    "kinetics_anode.activation_energy",
+    "kinetics_anode.alpha",
+    "kinetics_anode.electrons",
+    "kinetics_anode.reference_temperature",
+    "kinetics_cathode.i0_ref",
+    "kinetics_cathode.activation_energy",
+    "kinetics_cathode.alpha",
+    "kinetics_cathode.electrons",
+    "kinetics_cathode.reference_temperature",
+    "ohmic.conductivity_ref",
+    "ohmic.activation_energy",
+    "ohmic.membrane_thickness_cm",
+    "ohmic.contact_resistance",
+    "ohmic.electrolyte_resistance",
+    "ohmic.reference_temperature",
+    "mass_transport.limit_current_ref",
+    "mass_transport.activation_energy",
+    "mass_transport.reference_temperature",
+    "conditions.temperature",
+    "conditions.pressure_total",
+    "conditions.pressure_h2",
+    "conditions.pressure_o2",
+    "conditions.activity_h2o",
+    "conditions.pH",
+)
+"""Orden de las columnas del jacobiano (notacion ``submodelo.campo``)."""
+
+
+@dataclass
+class VoltageJacobian:
+    """Voltaje, su derivada respecto de la corriente y el jacobiano dV/dtheta por punto."""
+
+    current_density: np.ndarray
+    voltage: np.ndarray
+    valid: np.ndarray
+    d_voltage_d_current: np.ndarray
+    parameters: Tuple[str, ...]
+    jacobian: np.ndarray  # (..., len(parameters))
+
+    def column(self, parameter: str) -> np.ndarray:
+        return self.jacobian[..., self.parameters.index(parameter)]
+
+
+def _activation_energy(value) -> float:
+    # Sin energia de activacion el modelo equivale a Ea = 0; las derivadas se evaluan ahi.
+    return 0.0 if value is None else value
+
+
+def _electrode_terms(
+    prefix: str,
+    eta: np.ndarray,
+    tafel: float,
+    kinetics: ElectrodeKinetics,
+    temperature: float,
+    R: float,
+) -> Tuple[Dict[str, np.ndarray], np.ndarray]:
+    """Derivadas de eta = b ln(i/i0) con b = RT/(alpha n F) e i0 de Arrhenius."""
+
+    Ea = _activation_energy(kinetics.activation_energy)
+    Tref = kinetics.reference_temperature
+    terms = {
+        f"{prefix}.i0_ref": -tafel / kinetics.i0_ref,
+        f"{prefix}.activation_energy": tafel * (1.0 / temperature - 1.0 / Tref) / R,
+        f"{prefix}.alpha": -eta / kinetics.alpha,
+        f"{prefix}.electrons": -eta / kinetics.electrons,
+        f"{prefix}.reference_temperature": tafel * Ea / (R * Tref**2),
+    }
+    d_temperature = eta / temperature - tafel * Ea / (R * temperature**2)
+    return terms, d_temperature
+
+
+def voltage_jacobian(
+    currents,
+    config: ElectrolyzerConfig,
+    constants: PhysicalConstants = CONSTANTS,
+) -> VoltageJacobian:
+    """Calcula V(i) y dV/dtheta en forma cerrada para un arreglo de corrientes.
+
+    Cada columna corresponde a un nombre de :data:`PARAMETERS`; los parametros que no
+    intervienen en el modelo (p. ej. ``pressure_total`` o ``pH``) tienen derivada nula. Para
+    energias de activacion ``None`` la derivada se evalua en ``Ea = 0``.
+    """
+
+    kernel = compile_config(config, constants)
+    result = kernel.evaluate(currents)
+    i = result.current_density
+    shape = i.shape
+    R = constants.gas_constant
+    T = kernel.temperature
+    n = config.thermo.electrons
+    F = constants.faraday
+    conds = config.conditions
+    ohmic = config.ohmic
+    mass = config.mass_transport
+    tp = kernel.thermal_prefactor
+
+    columns: Dict[str, np.ndarray] = {}
+
+    # Voltaje ideal: Vstd = (dH - T dS)/(nF) y (RT/(nF)) ln(Q).
+    columns["thermo.delta_h_ref"] = 1.0 / (n * F)
+    columns["thermo.delta_s_ref"] = -T / (n * F)
+    columns["thermo.electrons"] = -(kernel.V_ideal + result.eta_conc) / n
+    columns["conditions.pressure_h2"] = tp / conds.pressure_h2
+    columns["conditions.pressure_o2"] = np.where(
+        np.asarray(conds.pressure_o2) > 1e-12, 0.5 * tp / conds.pressure_o2, 0.0
+    )
+    columns["conditions.activity_h2o"] = np.where(
+        np.asarray(conds.activity_h2o) > 1e-12, -tp / conds.activity_h2o, 0.0
+    )
+    d_temperature = -config.thermo.delta_s_ref / (n * F) + tp * kernel.ln_quotient / T
+
+    # Activacion en cada electrodo.
+    for prefix, eta, tafel, kinetics in (
+        ("kinetics_anode", result.eta_act_an, kernel.tafel_anode, config.kinetics_anode),
+        ("kinetics_cathode", result.eta_act_cat, kernel.tafel_cathode, config.kinetics_cathode),
+    ):
+        terms, d_T = _electrode_terms(prefix, eta, tafel, kinetics, T, R)
+        columns.update(terms)
+        d_temperature = d_temperature + d_T
+
+    # Ohmico: eta = i (L/kappa + Rc + Re) con kappa de Arrhenius.
+    kappa = kernel.conductivity
+    Ea_ohm = _activation_energy(ohmic.activation_energy)
+    membrane = i * ohmic.membrane_thickness_cm / kappa
+    columns["ohmic.conductivity_ref"] = -membrane / ohmic.conductivity_ref
+    columns["ohmic.activation_energy"] = membrane * (1.0 / T - 1.0 / ohmic.reference_temperature) / R
+    columns["ohmic.membrane_thickness_cm"] = i / kappa
+    columns["ohmic.contact_resistance"] = i
+    columns["ohmic.electrolyte_resistance"] = i
+    columns["ohmic.reference_temperature"] = membrane * Ea_ohm / (R * ohmic.reference_temperature**2)
+    d_temperature = d_temperature - membrane * Ea_ohm / (R * T**2)
+
+    # Concentracion: eta = (RT/(nF)) ln(i_lim/(i_lim - i)) con i_lim de Arrhenius.
+    i_lim = kernel.limit_current
+    Ea_mass = _activation_energy(mass.activation_energy)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        d_eta_d_lnlim = -tp * i / (i_lim - i)  # d eta / d ln(i_lim)
+    columns["mass_transport.limit_current_ref"] = d_eta_d_lnlim / mass.limit_current_ref
+    columns["mass_transport.activation_energy"] = (
+        -d_eta_d_lnlim * (1.0 / T - 1.0 / mass.reference_temperature) / R
+    )
+    columns["mass_transport.reference_temperature"] = (
+        -d_eta_d_lnlim * Ea_mass / (R * mass.reference_temperature**2)
+    )
+    d_temperature = d_temperature + result.eta_conc / T + d_eta_d_lnlim * Ea_mass / (R * T**2)
+    columns["conditions.temperature"] = d_temperature
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        d_voltage_d_current = (
+            (kernel.tafel_anode + kernel.tafel_cathode) / i + kernel.resistance + tp / (i_lim - i)
+        )
+
+    jacobian = np.zeros(shape + (len(PARAMETERS),))
+    for index, name in enumerate(PARAMETERS):
+        if name in columns:
+            jacobian[..., index] = columns[name]
+    jacobian[~result.valid] = np.nan
+    return VoltageJacobian(
+        current_density=i,
+        voltage=result.voltage,
+        valid=result.valid,
+        d_voltage_d_current=np.where(result.valid, d_voltage_d_current, np.nan),
+        parameters=PARAMETERS,
+        jacobian=jacobian,
+    )
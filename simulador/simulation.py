@@ -2,10 +2,20 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Dict, Iterable, List, Sequence
-
-from . import electrochemistry, orr
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from . import (
+    electrochemistry,
+    metrics,
+    microkinetics,
+    orr,
+    piecewise,
+    sampling,
+    streaming,
+    surrogate,
+    timeseries,
+)
 from .constants import CONSTANTS, PhysicalConstants
 from .models import Catalyst, ElectrolyzerConfig
 
@@ -17,65 +27,159 @@ class ElectrolyzerSimulator:
     config: ElectrolyzerConfig
     constants: PhysicalConstants = CONSTANTS
 
+    @property
+    def kernel(self) -> electrochemistry.ConfigKernel:
+        return electrochemistry.compile_config(self.config, self.constants)
+
     def voltage(self, current_density: float) -> float:
         return electrochemistry.cell_voltage(current_density, self.config, self.constants)
 
     def voltage_breakdown(self, current_density: float) -> Dict[str, float]:
-        conds = self.config.conditions
-        V_ideal = electrochemistry.nernst_potential(conds, self.config.thermo, self.constants)
-        eta_act = electrochemistry.activation_overpotential(
-            current_density,
-            self.config.kinetics_anode,
-            self.config.kinetics_cathode,
-            conds.temperature,
-            self.constants,
-        )
-        eta_ohm = electrochemistry.ohmic_overpotential(
-            current_density, self.config.ohmic, conds.temperature, self.constants
-        )
-        eta_conc = electrochemistry.concentration_overpotential(
-            current_density,
-            self.config.mass_transport,
-            conds.temperature,
-            self.config.thermo.electrons,
-            self.constants,
-        )
+        parts = self.kernel.breakdown(current_density)
+        eta_act = parts["eta_act_an"] + parts["eta_act_cat"]
         return {
-            "V_ideal": V_ideal,
+            "V_ideal": parts["V_ideal"],
             "eta_activacion": eta_act,
-            "eta_ohmico": eta_ohm,
-            "eta_concentracion": eta_conc,
-            "V_total": V_ideal + eta_act + eta_ohm + eta_conc,
+            "eta_ohmico": parts["eta_ohm"],
+            "eta_concentracion": parts["eta_conc"],
+            "V_total": parts["V_ideal"] + eta_act + parts["eta_ohm"] + parts["eta_conc"],
         }
 
     def polarization_curve(self, currents: Sequence[float]) -> List[float]:
         return electrochemistry.polarization_curve(currents, self.config, self.constants)
 
+    def adaptive_curve(
+        self,
+        current_min: float,
+        current_max: float,
+        tolerance: float = sampling.DEFAULT_TOLERANCE,
+        max_points: int = 2_000,
+    ) -> Tuple[List[float], List[float]]:
+        return sampling.adaptive_polarization_curve(
+            self.config, current_min, current_max, tolerance, max_points, self.constants
+        )
+
+    def polarization_arrays(self, currents) -> electrochemistry.PolarizationArrays:
+        return electrochemistry.polarization_arrays(currents, self.config, self.constants)
+
+    def performance_metrics(self, currents) -> metrics.PerformanceMetrics:
+        return metrics.performance_curve(currents, self.config, self.constants)
+
+    def current_at_voltage(self, voltages):
+        return electrochemistry.current_at_voltage(voltages, self.config, self.constants)
+
+    def stream_curve(
+        self, currents: Iterable[float], chunk_size: int = streaming.DEFAULT_CHUNK_SIZE
+    ) -> Iterator[electrochemistry.PolarizationArrays]:
+        return streaming.stream_curve(currents, self.config, self.constants, chunk_size)
+
+    def surrogate(
+        self,
+        temperature_range: Tuple[float, float],
+        current_range: Tuple[float, float],
+        **options,
+    ) -> surrogate.SurrogateModel:
+        """Tablas V(i, T) e i(V, T) que se reconstruyen si cambia ``self.config``."""
+
+        return surrogate.SurrogateModel(
+            self.config, temperature_range, current_range, self.constants, **options
+        )
+
+    def load_profile(
+        self, currents: Iterable[float], time_step_s: float = 1.0, **kwargs
+    ) -> timeseries.LoadProfileResult:
+        return timeseries.simulate_load_profile(
+            self.config, currents, time_step_s, constants=self.constants, **kwargs
+        )
+
+
+_COMPILED_INPUTS = frozenset(("catalyst", "temperature", "pH", "constants"))
+
 
 @dataclass
 class CatalystAnalyzer:
-    """Envuelve las utilidades de energia libre y actividad."""
+    """Envuelve las utilidades de energia libre y actividad.
+
+    Las evaluaciones puntuales usan el :class:`~simulador.orr.CompiledCatalyst` de
+    (catalizador, T, pH), que se descarta al reasignar ``catalyst``, ``temperature``, ``pH`` o
+    ``constants``. Si el catalizador se modifica en sitio hay que reasignarlo.
+    """
 
     catalyst: Catalyst
     temperature: float = 298.15
     pH: float = 0.0
     constants: PhysicalConstants = CONSTANTS
+    _compiled: Optional[orr.CompiledCatalyst] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def __setattr__(self, name: str, value) -> None:
+        if name in _COMPILED_INPUTS:
+            object.__setattr__(self, "_compiled", None)
+        object.__setattr__(self, name, value)
+
+    @property
+    def compiled(self) -> orr.CompiledCatalyst:
+        if self._compiled is None:
+            self._compiled = orr.compile_catalyst(
+                self.catalyst, self.temperature, self.pH, constants=self.constants
+            )
+        return self._compiled
 
     def free_energy(self, potential: float, intermediate: str) -> float:
-        return orr.calcular_energia_libre(
-            self.catalyst, intermediate, potential, self.pH, self.temperature, self.constants
-        )
+        return self.compiled.free_energy(intermediate, potential)
 
     def limiting_barriers(self, potential: float) -> Dict[str, float | str]:
-        return orr.determinar_via_dominante(
-            self.catalyst, potential, self.temperature, self.pH
-        )
+        return self.compiled.dominant(potential)
 
     def activity(self, potential: float) -> float:
-        return orr.calcular_actividad(
-            self.catalyst, potential, self.temperature, self.pH, self.constants
-        )
+        return self.compiled.activity(potential)
 
     def activity_profile(self, potentials: Iterable[float]) -> List[float]:
-        return [self.activity(U) for U in potentials]
+        if self.temperature <= 0:
+            raise ValueError("Temperatura invalida.")
+        activity, _ = orr.calcular_actividad_array(
+            self.catalyst, list(potentials), self.temperature, self.pH, self.constants
+        )
+        return activity[0].tolist()
+
+    def pathway_profile(self, potentials: Iterable[float]) -> orr.PathwayArrays:
+        """Via dominante y barreras para todos los potenciales en una sola pasada."""
 
+        return orr.determinar_via_dominante_array(
+            self.catalyst, list(potentials), self.temperature, self.pH, self.constants
+        )
+
+    def activity_pieces(self) -> piecewise.ActivityPieces:
+        """Quiebres y tramos exactos de la barrera dominante vs U (:mod:`simulador.piecewise`)."""
+
+        return piecewise.activity_pieces(
+            self.catalyst, self.temperature, self.pH, constants=self.constants
+        )
+
+    def activity_curve(
+        self, potential_min: float, potential_max: float
+    ) -> Tuple[List[float], List[float]]:
+        """Vertices ``(U, A)`` de la curva de actividad en el intervalo; entre ellos log10(A) es
+        lineal, asi que la curva queda exacta con pocos puntos."""
+
+        potentials, log_activity = self.activity_pieces().vertices(
+            (0,), potential_min, potential_max
+        )
+        return potentials.tolist(), (10.0**log_activity).tolist()
+
+    def steady_state(
+        self,
+        potentials: Iterable[float],
+        interactions: microkinetics.CoverageInteractions = microkinetics.CoverageInteractions(),
+    ) -> microkinetics.SteadyState:
+        """Coberturas O*/OH* y velocidad estacionarias (:mod:`simulador.microkinetics`)."""
+
+        return microkinetics.solve_steady_state(
+            self.catalyst,
+            list(potentials),
+            self.temperature,
+            self.pH,
+            interactions,
+            constants=self.constants,
+        )
@@ -0,0 +1,153 @@
+"""Stack de muchas celdas en serie con parametros distintos por celda."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, Mapping, Optional
+
+import numpy as np
+
+from .constants import CONSTANTS, PhysicalConstants
+from .electrochemistry import build_kernel
+from .grid import replace_fields, resolve_field
+from .models import ElectrolyzerConfig
+from .uncertainty import ParameterDistribution, sample_parameters
+
+
+@dataclass
+class StackResult:
+    """Voltaje del stack, voltajes por celda y margenes de la peor celda por punto."""
+
+    current_density: np.ndarray
+    stack_voltage: np.ndarray
+    mean_cell_voltage: np.ndarray
+    worst_cell: np.ndarray  # indice de la celda de mayor voltaje (-1 si el punto es invalido)
+    worst_cell_voltage: np.ndarray
+    limit_margin: np.ndarray  # min_c (i_lim,c - i) en A/cm2
+    voltage_margin: Optional[np.ndarray]  # limite de voltaje - peor celda
+    valid: np.ndarray
+    cell_voltage: Optional[np.ndarray] = field(default=None, repr=False)  # (n_celdas, n_puntos)
+
+
+@dataclass
+class StackModel:
+    """Celdas que comparten la configuracion base salvo los campos de ``cell_parameters``.
+
+    ``cell_parameters`` asocia nombres de campo (notacion de
+    :func:`simulador.grid.resolve_field`, p. ej. ``"kinetics_anode.i0_ref"``) con un arreglo de
+    largo ``n_cells``; no se construye un ``ElectrolyzerConfig`` por celda.
+    """
+
+    base_config: ElectrolyzerConfig
+    cell_parameters: Dict[str, np.ndarray]
+
+    def __post_init__(self) -> None:
+        sizes = set()
+        parameters = {}
+        for name, values in self.cell_parameters.items():
+            resolve_field(name)
+            parameters[name] = np.asarray(values, dtype=float).ravel()
+            sizes.add(parameters[name].size)
+        if len(sizes) != 1:
+            raise ValueError("Todos los parametros por celda deben tener el mismo largo (>= 1).")
+        self.cell_parameters = parameters
+
+    @classmethod
+    def from_distributions(
+        cls,
+        config: ElectrolyzerConfig,
+        n_cells: int,
+        distributions: Mapping[str, ParameterDistribution],
+        seed: Optional[int] = None,
+    ) -> "StackModel":
+        """Sortea la dispersion entre celdas con distribuciones de :mod:`simulador.uncertainty`."""
+
+        return cls(config, sample_parameters(distributions, n_cells, seed))
+
+    @property
+    def n_cells(self) -> int:
+        return next(iter(self.cell_parameters.values())).size
+
+    @property
+    def config(self) -> ElectrolyzerConfig:
+        """Configuracion con cada parametro por celda como columna ``(n_cells, 1)``."""
+
+        columns = {name: values[:, None] for name, values in self.cell_parameters.items()}
+        return replace_fields(self.base_config, columns)
+
+    def evaluate(
+        self,
+        currents,
+        constants: PhysicalConstants = CONSTANTS,
+        voltage_limit: Optional[float] = None,
+        keep_cell_voltages: bool = True,
+        chunk_points: int = 4_000_000,
+    ) -> StackResult:
+        """Evalua todas las celdas a las mismas densidades de corriente (celdas en serie).
+
+        Las constantes por celda se agrupan en
+        ``V = a + b ln(i) + R i + (RT/nF) ln(i_lim/(i_lim - i))``, de modo que ``ln(i)`` se
+        calcula una vez por punto y cada elemento (celda, punto) solo requiere un logaritmo. Las
+        corrientes se procesan por bloques de a lo sumo ``chunk_points`` elementos. Un punto es
+        invalido si lo es en alguna celda.
+        """
+
+        currents = np.asarray(currents, dtype=float).ravel()
+        n_cells = self.n_cells
+        column = (n_cells, 1)
+        kernel = build_kernel(self.config, constants)
+        i0_an = np.broadcast_to(kernel.i0_anode, column)
+        i0_cat = np.broadcast_to(kernel.i0_cathode, column)
+        cell_ok = (i0_an > 0) & (i0_cat > 0) & np.broadcast_to(kernel.conductivity > 0, column)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            offset = (
+                kernel.V_ideal
+                - kernel.tafel_anode * np.log(i0_an)
+                - kernel.tafel_cathode * np.log(i0_cat)
+            )
+        offset = np.broadcast_to(offset, column)
+        slope = np.broadcast_to(kernel.tafel_anode + kernel.tafel_cathode, column)
+        resistance = np.broadcast_to(kernel.resistance, column)
+        prefactor = np.broadcast_to(kernel.thermal_prefactor, column)
+        i_lim = np.broadcast_to(kernel.limit_current, column)
+        ln_lim = np.log(i_lim)
+
+        n_points = currents.size
+        stack_voltage = np.empty(n_points)
+        worst_cell = np.empty(n_points, dtype=int)
+        worst_voltage = np.empty(n_points)
+        limit_margin = np.empty(n_points)
+        valid = np.empty(n_points, dtype=bool)
+        cell_voltage = np.empty((n_cells, n_points)) if keep_cell_voltages else None
+
+        step = max(1, chunk_points // n_cells)
+        for start in range(0, n_points, step):
+            block = slice(start, start + step)
+            i = currents[None, block]
+            headroom = i_lim - i
+            point_valid = (i > 0) & (headroom > 0) & cell_ok
+            with np.errstate(divide="ignore", invalid="ignore"):
+                voltage = offset + slope * np.log(i) + resistance * i
+                voltage += prefactor * (ln_lim - np.log(headroom))
+            voltage[~point_valid] = np.nan
+            ok = point_valid.all(axis=0)
+            valid[block] = ok
+            stack_voltage[block] = voltage.sum(axis=0)
+            index = np.argmax(np.where(point_valid, voltage, -np.inf), axis=0)
+            worst_cell[block] = np.where(ok, index, -1)
+            worst_voltage[block] = np.where(ok, voltage[index, np.arange(index.size)], np.nan)
+            limit_margin[block] = headroom.min(axis=0)
+            if cell_voltage is not None:
+                cell_voltage[:, block] = voltage
+
+        return StackResult(
+            current_density=currents,
+            stack_voltage=stack_voltage,
+            mean_cell_voltage=stack_voltage / n_cells,
+            worst_cell=worst_cell,
+            worst_cell_voltage=worst_voltage,
+            limit_margin=limit_margin,
+            voltage_margin=None if voltage_limit is None else voltage_limit - worst_voltage,
+            valid=valid,
+            cell_voltage=cell_voltage,
+        )
@@ -0,0 +1,181 @@
+"""Barridos en streaming con memoria acotada y escritura incremental a disco."""
+
+from __future__ import annotations
+
+import itertools
+import pathlib
+import struct
+from typing import Iterable, Iterator, Tuple, Union
+
+import numpy as np
+
+from .constants import CONSTANTS, PhysicalConstants
+from .electrochemistry import PolarizationArrays, compile_config
+from .models import ElectrolyzerConfig
+
+DEFAULT_CHUNK_SIZE = 65_536
+
+COLUMNS = (
+    "current_density",
+    "voltage",
+    "V_ideal",
+    "eta_act_an",
+    "eta_act_cat",
+    "eta_ohm",
+    "eta_conc",
+    "valid",
+)
+"""Columnas escritas por los escritores de este modulo (mismo orden que la tabla de la app)."""
+
+PathLike = Union[str, pathlib.Path]
+
+
+def iter_chunks(values: Iterable[float], chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[np.ndarray]:
+    """Agrupa un iterable (lista, arreglo o generador) en bloques ``float`` de ``chunk_size``."""
+
+    if chunk_size <= 0:
+        raise ValueError("El tamano de bloque debe ser positivo.")
+    if isinstance(values, np.ndarray):
+        flat = values.ravel()
+        for start in range(0, flat.size, chunk_size):
+            yield np.asarray(flat[start : start + chunk_size], dtype=float)
+        return
+    iterator = iter(values)
+    while True:
+        block = np.fromiter(itertools.islice(iterator, chunk_size), dtype=float)
+        if block.size == 0:
+            return
+        yield block
+
+
+def stream_curve(
+    currents: Iterable[float],
+    config: ElectrolyzerConfig,
+    constants: PhysicalConstants = CONSTANTS,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[PolarizationArrays]:
+    """Version en streaming de :func:`~simulador.electrochemistry.polarization_arrays`.
+
+    Cada bloque tiene a lo sumo ``chunk_size`` puntos; los invalidos quedan marcados en
+    ``valid`` en lugar de interrumpir el barrido.
+    """
+
+    kernel = compile_config(config, constants)
+    for block in iter_chunks(currents, chunk_size):
+        yield kernel.evaluate(block)
+
+
+def stream_configs(
+    configs: Iterable[ElectrolyzerConfig],
+    currents: Iterable[float],
+    constants: PhysicalConstants = CONSTANTS,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[Tuple[int, PolarizationArrays]]:
+    """Recorre un iterable de configuraciones y produce ``(indice, bloque)`` por cada una.
+
+    ``currents`` se materializa una sola vez para poder reutilizarlo con todas las
+    configuraciones; las configuraciones se consumen de a una.
+    """
+
+    if not isinstance(currents, np.ndarray):
+        currents = np.fromiter(currents, dtype=float)
+    for index, config in enumerate(configs):
+        for block in stream_curve(currents, config, constants, chunk_size):
+            yield index, block
+
+
+def chunk_columns(chunk: PolarizationArrays) -> dict:
+    """Columnas 1-D de un bloque, en el orden de :data:`COLUMNS`."""
+
+    return {name: np.ravel(getattr(chunk, name)) for name in COLUMNS}
+
+
+class CsvChunkWriter:
+    """Escribe bloques en un CSV con encabezado, uno tras otro."""
+
+    def __init__(self, path: PathLike, fmt: str = "%.6f") -> None:
+        self.path = pathlib.Path(path)
+        self.fmt = fmt
+        self.rows = 0
+        self._handle = open(self.path, "w", newline="")
+        self._handle.write(",".join(COLUMNS) + "\n")
+
+    def write(self, chunk: PolarizationArrays) -> None:
+        columns = chunk_columns(chunk)
+        table = np.column_stack([columns[name] for name in COLUMNS])
+        fmt = [self.fmt] * (len(COLUMNS) - 1) + ["%d"]
+        np.savetxt(self._handle, table, delimiter=",", fmt=fmt)
+        self.rows += table.shape[0]
+
+    def close(self) -> None:
+        self._handle.close()
+
+    def __enter__(self) -> "CsvChunkWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+_NPY_HEADER_BYTES = 128
+
+
+def _npy_header(dtype: np.dtype, length: int) -> bytes:
+    """Encabezado ``.npy`` v1.0 de tamano fijo, para poder reescribirlo al cerrar."""
+
+    header = repr(
+        {
+            "descr": np.lib.format.dtype_to_descr(np.dtype(dtype)),
+            "fortran_order": False,
+            "shape": (length,),
+        }
+    )
+    header = header.ljust(_NPY_HEADER_BYTES - 10 - 1) + "\n"
+    return b"\x93NUMPY\x01\x00" + struct.pack("<H", len(header)) + header.encode("latin1")
+
+
+class NpyChunkWriter:
+    """Escribe cada columna en su propio ``.npy`` dentro de un directorio (formato columnar).
+
+    Los archivos se pueden abrir con ``np.load(..., mmap_mode="r")`` sin cargarlos en memoria.
+    """
+
+    def __init__(self, directory: PathLike) -> None:
+        self.directory = pathlib.Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.rows = 0
+        self._dtypes = {name: np.dtype(bool if name == "valid" else float) for name in COLUMNS}
+        self._handles = {}
+        for name in COLUMNS:
+            handle = open(self.directory / f"{name}.npy", "wb")
+            handle.write(_npy_header(self._dtypes[name], 0))
+            self._handles[name] = handle
+
+    def write(self, chunk: PolarizationArrays) -> None:
+        columns = chunk_columns(chunk)
+        for name, handle in self._handles.items():
+            handle.write(np.ascontiguousarray(columns[name], dtype=self._dtypes[name]).tobytes())
+        self.rows += columns["current_density"].size
+
+    def close(self) -> None:
+        for name, handle in self._handles.items():
+            if handle.closed:
+                continue
+            handle.seek(0)
+            handle.write(_npy_header(self._dtypes[name], self.rows))
+            handle.close()
+
+    def __enter__(self) -> "NpyChunkWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def write_stream(chunks: Iterable[PolarizationArrays], writer) -> int:
+    """Vuelca un iterable de bloques en ``writer`` y devuelve el numero de filas escritas."""
+
+    with writer:
+        for chunk in chunks:
+            writer.write(chunk)
+    return writer.rows
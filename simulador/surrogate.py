@@ -0,0 +1,301 @@
+"""Tablas precalculadas V(i, T) e i(V, T) con interpolacion bilineal."""
+
+from __future__ import annotations
+
+import hashlib
+import math
+import pathlib
+from dataclasses import dataclass
+from typing import Optional, Tuple, Union
+
+import numpy as np
+
+from .constants import CONSTANTS, PhysicalConstants
+from .electrochemistry import _config_key, build_kernel
+from .models import ElectrolyzerConfig
+
+PathLike = Union[str, pathlib.Path]
+
+
+def _table_key(config: ElectrolyzerConfig) -> tuple:
+    """Clave de la configuracion sin la temperatura de operacion (es un eje de la tabla)."""
+
+    conditions = tuple(
+        value for name, value in config.conditions.__dict__.items() if name != "temperature"
+    )
+    return _config_key(config)[:-1] + (conditions,)
+
+
+def fingerprint(config: ElectrolyzerConfig, constants: PhysicalConstants = CONSTANTS) -> str:
+    """Huella estable de la configuracion y las constantes, guardada junto con la tabla."""
+
+    text = repr((_table_key(config), tuple(constants.__dict__.values())))
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+@dataclass(frozen=True)
+class Axis:
+    """Eje uniforme ``start + k * step`` con ``size`` nodos; ubicar un punto es O(1)."""
+
+    start: float
+    stop: float
+    size: int
+
+    @property
+    def step(self) -> float:
+        return (self.stop - self.start) / (self.size - 1)
+
+    @property
+    def values(self) -> np.ndarray:
+        return np.linspace(self.start, self.stop, self.size)
+
+    @property
+    def midpoints(self) -> np.ndarray:
+        values = self.values
+        return 0.5 * (values[:-1] + values[1:])
+
+
+def _bilinear(table: np.ndarray, rows: Axis, cols: Axis, row_values, col_values) -> np.ndarray:
+    """Interpolacion bilineal vectorizada; fuera de la tabla devuelve NaN (sin extrapolar)."""
+
+    r = (np.asarray(row_values, dtype=float) - rows.start) / rows.step
+    c = (np.asarray(col_values, dtype=float) - cols.start) / cols.step
+    r, c = np.broadcast_arrays(r, c)
+    inside = (r >= 0) & (r <= rows.size - 1) & (c >= 0) & (c <= cols.size - 1)
+    r = np.where(inside, r, 0.0)
+    c = np.where(inside, c, 0.0)
+    r0 = np.minimum(r.astype(np.intp), rows.size - 2)
+    c0 = np.minimum(c.astype(np.intp), cols.size - 2)
+    wr = r - r0
+    wc = c - c0
+    top = table[r0, c0] * (1.0 - wc) + table[r0, c0 + 1] * wc
+    bottom = table[r0 + 1, c0] * (1.0 - wc) + table[r0 + 1, c0 + 1] * wc
+    return np.where(inside, top * (1.0 - wr) + bottom * wr, np.nan)
+
+
+def _bilinear_scalar(table: np.ndarray, rows: Axis, cols: Axis, row: float, col: float) -> float:
+    """Misma interpolacion para un solo punto, sin crear arreglos temporales."""
+
+    r = (row - rows.start) / rows.step
+    c = (col - cols.start) / cols.step
+    if not (0.0 <= r <= rows.size - 1 and 0.0 <= c <= cols.size - 1):
+        return math.nan
+    r0 = min(int(r), rows.size - 2)
+    c0 = min(int(c), cols.size - 2)
+    wr = r - r0
+    wc = c - c0
+    item = table.item
+    top = item(r0, c0) * (1.0 - wc) + item(r0, c0 + 1) * wc
+    bottom = item(r0 + 1, c0) * (1.0 - wc) + item(r0 + 1, c0 + 1) * wc
+    return top * (1.0 - wr) + bottom * wr
+
+
+@dataclass
+class SurrogateTable:
+    """Tablas V(i, T) y ln i(V, T) sobre grillas uniformes con sus cotas de error.
+
+    ``voltage_error`` (V) y ``current_error`` (relativo) son el maximo desvio de la
+    interpolacion respecto del modelo exacto en los centros de todas las celdas de la grilla.
+    Los puntos fuera del dominio valido (p. ej. por encima de i_lim) quedan en NaN.
+    """
+
+    temperature: Axis
+    current_density: Axis
+    voltage_axis: Axis
+    voltage: np.ndarray  # (n_T, n_i)
+    log_current: np.ndarray  # (n_T, n_V)
+    voltage_error: float
+    current_error: float
+    fingerprint: str
+
+    def matches(self, config: ElectrolyzerConfig, constants: PhysicalConstants = CONSTANTS) -> bool:
+        return self.fingerprint == fingerprint(config, constants)
+
+    def check(self, config: ElectrolyzerConfig, constants: PhysicalConstants = CONSTANTS) -> None:
+        if not self.matches(config, constants):
+            raise ValueError("La tabla no corresponde a la configuracion actual; reconstruyala.")
+
+    def voltage_at(self, current_density, temperature):
+        """V(i, T) interpolado; acepta escalares (camino rapido) o arreglos broadcastables."""
+
+        if np.ndim(current_density) == 0 and np.ndim(temperature) == 0:
+            return _bilinear_scalar(
+                self.voltage,
+                self.temperature,
+                self.current_density,
+                float(temperature),
+                float(current_density),
+            )
+        return _bilinear(
+            self.voltage, self.temperature, self.current_density, temperature, current_density
+        )
+
+    def current_at(self, voltage, temperature):
+        """i(V, T) interpolado en escala logaritmica."""
+
+        if np.ndim(voltage) == 0 and np.ndim(temperature) == 0:
+            return math.exp(
+                _bilinear_scalar(
+                    self.log_current,
+                    self.temperature,
+                    self.voltage_axis,
+                    float(temperature),
+                    float(voltage),
+                )
+            )
+        return np.exp(
+            _bilinear(self.log_current, self.temperature, self.voltage_axis, temperature, voltage)
+        )
+
+    def save(self, path: PathLike) -> None:
+        """Guarda la tabla en un ``.npz`` (ejes como ``start, stop, size``)."""
+
+        np.savez(
+            path,
+            temperature=np.array(
+                [self.temperature.start, self.temperature.stop, self.temperature.size]
+            ),
+            current_density=np.array(
+                [self.current_density.start, self.current_density.stop, self.current_density.size]
+            ),
+            voltage_axis=np.array(
+                [self.voltage_axis.start, self.voltage_axis.stop, self.voltage_axis.size]
+            ),
+            voltage=self.voltage,
+            log_current=self.log_current,
+            errors=np.array([self.voltage_error, self.current_error]),
+            fingerprint=np.array(self.fingerprint),
+        )
+
+    @classmethod
+    def load(cls, path: PathLike) -> "SurrogateTable":
+        with np.load(path) as archive:
+
+            def axis(name: str) -> Axis:
+                start, stop, size = archive[name]
+                return Axis(float(start), float(stop), int(size))
+
+            voltage_error, current_error = archive["errors"]
+            return cls(
+                temperature=axis("temperature"),
+                current_density=axis("current_density"),
+                voltage_axis=axis("voltage_axis"),
+                voltage=archive["voltage"],
+                log_current=archive["log_current"],
+                voltage_error=float(voltage_error),
+                current_error=float(current_error),
+                fingerprint=str(archive["fingerprint"]),
+            )
+
+
+def _exact_voltage(config, constants, temperatures, currents) -> np.ndarray:
+    kernel = build_kernel(config, constants, temperatures[:, None])
+    result = kernel.evaluate(currents[None, :])
+    return np.where(result.valid, result.voltage, np.nan)
+
+
+def _exact_log_current(config, constants, temperatures, voltages) -> np.ndarray:
+    kernel = build_kernel(config, constants, temperatures[:, None])
+    current, valid = kernel.current_at_voltage(voltages[None, :])
+    with np.errstate(divide="ignore"):
+        return np.where(valid, np.log(current), np.nan)
+
+
+def build_table(
+    config: ElectrolyzerConfig,
+    temperature_range: Tuple[float, float],
+    current_range: Tuple[float, float],
+    voltage_range: Optional[Tuple[float, float]] = None,
+    shape: Tuple[int, int, int] = (64, 1024, 1024),
+    constants: PhysicalConstants = CONSTANTS,
+    dtype=np.float32,
+) -> SurrogateTable:
+    """Precalcula las tablas sobre grillas uniformes de ``shape = (n_T, n_i, n_V)`` nodos.
+
+    Todo se evalua de una vez con el kernel vectorizado (la temperatura como columna). Sin
+    ``voltage_range`` el eje de voltaje cubre el rango de la tabla V(i, T). Las tablas se
+    guardan en ``dtype`` (``float32`` por defecto) y las cotas de error se miden con ese tipo.
+    """
+
+    n_T, n_i, n_V = shape
+    if min(shape) < 2:
+        raise ValueError("Cada eje de la tabla necesita al menos dos nodos.")
+    temperature = Axis(float(temperature_range[0]), float(temperature_range[1]), n_T)
+    current_axis = Axis(float(current_range[0]), float(current_range[1]), n_i)
+    voltage = _exact_voltage(config, constants, temperature.values, current_axis.values)
+    if voltage_range is None:
+        voltage_range = (np.nanmin(voltage), np.nanmax(voltage))
+    voltage_axis = Axis(float(voltage_range[0]), float(voltage_range[1]), n_V)
+    log_current = _exact_log_current(config, constants, temperature.values, voltage_axis.values)
+
+    table = SurrogateTable(
+        temperature=temperature,
+        current_density=current_axis,
+        voltage_axis=voltage_axis,
+        voltage=voltage.astype(dtype),
+        log_current=log_current.astype(dtype),
+        voltage_error=0.0,
+        current_error=0.0,
+        fingerprint=fingerprint(config, constants),
+    )
+
+    T_mid = temperature.midpoints[:, None]
+    exact = _exact_voltage(config, constants, temperature.midpoints, current_axis.midpoints)
+    approx = table.voltage_at(current_axis.midpoints[None, :], T_mid)
+    exact_log = _exact_log_current(config, constants, temperature.midpoints, voltage_axis.midpoints)
+    approx_current = table.current_at(voltage_axis.midpoints[None, :], T_mid)
+    with np.errstate(invalid="ignore"):
+        table.voltage_error = float(np.nanmax(np.abs(approx - exact), initial=0.0))
+        table.current_error = float(
+            np.nanmax(np.abs(approx_current / np.exp(exact_log) - 1.0), initial=0.0)
+        )
+    return table
+
+
+class SurrogateModel:
+    """Tabla ligada a una configuracion: se reconstruye si la configuracion cambia.
+
+    La comparacion usa los valores de los campos (igual que la cache de kernels), asi que
+    detecta tanto un ``ElectrolyzerConfig`` nuevo como la mutacion del existente. La
+    temperatura de operacion de la configuracion no cuenta: es un eje de la tabla.
+    """
+
+    def __init__(
+        self,
+        config: ElectrolyzerConfig,
+        temperature_range: Tuple[float, float],
+        current_range: Tuple[float, float],
+        constants: PhysicalConstants = CONSTANTS,
+        table: Optional[SurrogateTable] = None,
+        **options,
+    ) -> None:
+        self.config = config
+        self.constants = constants
+        self._arguments = (temperature_range, current_range)
+        self._options = options
+        self._key = None
+        self._table = None
+        if table is not None:
+            table.check(config, constants)
+            self._key = _table_key(config)
+            self._table = table
+
+    @property
+    def table(self) -> SurrogateTable:
+        key = _table_key(self.config)
+        if self._table is None or key != self._key:
+            self._table = build_table(
+                self.config, *self._arguments, constants=self.constants, **self._options
+            )
+            self._key = key
+        return self._table
+
+    def voltage(self, current_density, temperature=None):
+        if temperature is None:
+            temperature = self.config.conditions.temperature
+        return self.table.voltage_at(current_density, temperature)
+
+    def current(self, voltage, temperature=None):
+        if temperature is None:
+            temperature = self.config.conditions.temperature
+        return self.table.current_at(voltage, temperature)
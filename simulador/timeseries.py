@@ -0,0 +1,128 @@
+"""Simulacion en el dominio del tiempo a partir de perfiles de carga."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Iterable, Iterator, Optional
+
+import numpy as np
+
+from .constants import CONSTANTS, JOULE_TO_KWH, PhysicalConstants
+from .electrochemistry import build_kernel, compile_config
+from .models import ElectrolyzerConfig
+from .streaming import DEFAULT_CHUNK_SIZE, iter_chunks
+
+
+@dataclass
+class LoadProfileChunk:
+    """Resultados de un bloque de pasos de tiempo."""
+
+    current_density: np.ndarray  # A/cm2
+    voltage: np.ndarray  # V (NaN en pasos apagados o invalidos)
+    power_w: np.ndarray  # W
+    hydrogen_mol_s: np.ndarray  # mol/s
+    valid: np.ndarray
+
+
+@dataclass
+class LoadProfileResult:
+    """Totales integrados de un perfil de carga y, opcionalmente, las series completas."""
+
+    steps: int
+    invalid_steps: int
+    duration_s: float
+    energy_kwh: float
+    hydrogen_kg: float
+    voltage: Optional[np.ndarray] = None
+    power_w: Optional[np.ndarray] = None
+    hydrogen_mol_s: Optional[np.ndarray] = None
+
+    @property
+    def specific_energy_kwh_per_kg(self) -> float:
+        return self.energy_kwh / self.hydrogen_kg if self.hydrogen_kg > 0 else float("nan")
+
+
+def iter_load_profile(
+    config: ElectrolyzerConfig,
+    currents: Iterable[float],
+    temperatures: Optional[Iterable[float]] = None,
+    area_cm2: float = 1.0,
+    constants: PhysicalConstants = CONSTANTS,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[LoadProfileChunk]:
+    """Evalua un perfil de densidades de corriente (y temperaturas) por bloques.
+
+    Los pasos con corriente nula o negativa se consideran celda apagada: no consumen energia
+    ni producen hidrogeno y no cuentan como invalidos. La produccion sigue la ley de Faraday,
+    ``n_H2 = I / (n F)`` con ``n = config.thermo.electrons``.
+    """
+
+    faraday_rate = 1.0 / (config.thermo.electrons * constants.faraday)
+    current_blocks = iter_chunks(currents, chunk_size)
+    temperature_blocks = None if temperatures is None else iter_chunks(temperatures, chunk_size)
+    kernel = compile_config(config, constants)
+    for block in current_blocks:
+        if temperature_blocks is not None:
+            block_temperature = next(temperature_blocks, None)
+            if block_temperature is None or block_temperature.size != block.size:
+                raise ValueError("Los perfiles de corriente y temperatura deben tener igual largo.")
+            kernel = build_kernel(config, constants, block_temperature)
+        result = kernel.evaluate(block)
+        on = block > 0.0
+        valid = result.valid | ~on
+        voltage = np.where(on, result.voltage, np.nan)
+        current = np.where(on & result.valid, block, 0.0) * area_cm2
+        yield LoadProfileChunk(
+            current_density=block,
+            voltage=voltage,
+            power_w=np.where(on & result.valid, voltage, 0.0) * current,
+            hydrogen_mol_s=current * faraday_rate,
+            valid=valid,
+        )
+    if temperature_blocks is not None and next(temperature_blocks, None) is not None:
+        raise ValueError("Los perfiles de corriente y temperatura deben tener igual largo.")
+
+
+def simulate_load_profile(
+    config: ElectrolyzerConfig,
+    currents: Iterable[float],
+    time_step_s: float = 1.0,
+    temperatures: Optional[Iterable[float]] = None,
+    area_cm2: float = 1.0,
+    constants: PhysicalConstants = CONSTANTS,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    keep_series: bool = True,
+) -> LoadProfileResult:
+    """Integra energia consumida e hidrogeno producido sobre un perfil de carga.
+
+    Cada paso dura ``time_step_s`` segundos (integracion rectangular). Con
+    ``keep_series=False`` solo se acumulan los totales y la memoria queda acotada por
+    ``chunk_size``; los pasos invalidos (p. ej. por encima de i_lim) se excluyen de los totales.
+    """
+
+    steps = 0
+    invalid = 0
+    energy_j = 0.0
+    hydrogen_mol = 0.0
+    series = {"voltage": [], "power_w": [], "hydrogen_mol_s": []}
+    for chunk in iter_load_profile(config, currents, temperatures, area_cm2, constants, chunk_size):
+        steps += chunk.voltage.size
+        invalid += int(np.count_nonzero(~chunk.valid))
+        energy_j += float(chunk.power_w.sum()) * time_step_s
+        hydrogen_mol += float(chunk.hydrogen_mol_s.sum()) * time_step_s
+        if keep_series:
+            for name, values in series.items():
+                values.append(getattr(chunk, name))
+
+    arrays = {
+        name: (np.concatenate(values) if values else np.empty(0)) if keep_series else None
+        for name, values in series.items()
+    }
+    return LoadProfileResult(
+        steps=steps,
+        invalid_steps=invalid,
+        duration_s=steps * time_step_s,
+        energy_kwh=energy_j * JOULE_TO_KWH,
+        hydrogen_kg=hydrogen_mol * constants.molar_mass_h2,
+        **arrays,
+    )
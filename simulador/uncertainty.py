@@ -0,0 +1,148 @@
+"""Propagacion de incertidumbre por Monte Carlo sobre la curva de polarizacion."""
+
+from __future__ import annotations
+
+import warnings
+from dataclasses import dataclass, field
+from typing import Dict, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .constants import CONSTANTS, PhysicalConstants
+from .electrochemistry import polarization_arrays
+from .grid import COMPONENTS, replace_fields, resolve_field
+from .models import ElectrolyzerConfig
+
+
+@dataclass(frozen=True)
+class ParameterDistribution:
+    """Distribucion de un parametro: ``normal`` (media, desvio), ``lognormal`` (mediana, sigma
+    del logaritmo) o ``uniform`` (minimo, maximo)."""
+
+    kind: str
+    a: float
+    b: float
+
+    def sample(self, rng: np.random.Generator, size: int) -> np.ndarray:
+        if self.kind == "normal":
+            return rng.normal(self.a, self.b, size)
+        if self.kind == "lognormal":
+            return self.a * np.exp(rng.normal(0.0, self.b, size))
+        if self.kind == "uniform":
+            return rng.uniform(self.a, self.b, size)
+        raise ValueError(f"Distribucion desconocida: {self.kind}.")
+
+
+def normal(mean: float, std: float) -> ParameterDistribution:
+    return ParameterDistribution("normal", mean, std)
+
+
+def lognormal(median: float, sigma: float) -> ParameterDistribution:
+    return ParameterDistribution("lognormal", median, sigma)
+
+
+def uniform(low: float, high: float) -> ParameterDistribution:
+    return ParameterDistribution("uniform", low, high)
+
+
+def sample_parameters(
+    distributions: Mapping[str, ParameterDistribution],
+    n_samples: int,
+    seed: Optional[int] = None,
+) -> Dict[str, np.ndarray]:
+    """Sortea ``n_samples`` juegos de parametros (reproducible con ``seed``).
+
+    Las claves son campos de :class:`~simulador.models.ElectrolyzerConfig` con la misma
+    notacion que :func:`simulador.grid.resolve_field` (p. ej. ``"kinetics_anode.i0_ref"``).
+    """
+
+    rng = np.random.default_rng(seed)
+    samples = {}
+    for name, distribution in distributions.items():
+        resolve_field(name)
+        samples[name] = distribution.sample(rng, n_samples)
+    return samples
+
+
+@dataclass
+class MonteCarloResult:
+    """Bandas de percentiles y varianza por componente para cada corriente."""
+
+    current_density: np.ndarray
+    percentiles: Tuple[float, ...]
+    voltage_bands: np.ndarray  # (len(percentiles), n_corrientes)
+    mean: np.ndarray
+    variance: Dict[str, np.ndarray]
+    valid_fraction: np.ndarray
+    samples: Dict[str, np.ndarray] = field(repr=False)
+
+    def band(self, percentile: float) -> np.ndarray:
+        return self.voltage_bands[self.percentiles.index(percentile)]
+
+
+def monte_carlo_curve(
+    config: ElectrolyzerConfig,
+    currents: Sequence[float],
+    distributions: Mapping[str, ParameterDistribution],
+    n_samples: int = 10_000,
+    seed: Optional[int] = None,
+    percentiles: Sequence[float] = (5.0, 50.0, 95.0),
+    constants: PhysicalConstants = CONSTANTS,
+    chunk_points: int = 4_000_000,
+) -> MonteCarloResult:
+    """Evalua todas las muestras x todas las corrientes como un calculo vectorizado.
+
+    Los parametros sorteados se colocan como columnas ``(n_samples, 1)`` en la configuracion y
+    las corrientes como fila, de modo que
+    :func:`~simulador.electrochemistry.polarization_arrays` produce la matriz completa. Se
+    procesa por bloques de corrientes de a lo sumo ``chunk_points`` valores. Las muestras
+    invalidas (p. ej. corriente por encima de i_lim) se excluyen de las estadisticas.
+    """
+
+    currents = np.asarray(currents, dtype=float).ravel()
+    samples = sample_parameters(distributions, n_samples, seed)
+    sampled = replace_fields(config, {name: values[:, None] for name, values in samples.items()})
+    percentiles = tuple(float(p) for p in percentiles)
+
+    bands = np.empty((len(percentiles), currents.size))
+    mean = np.empty(currents.size)
+    variance = {name: np.empty(currents.size) for name in ("voltage",) + COMPONENTS}
+    valid_fraction = np.empty(currents.size)
+
+    step = max(1, chunk_points // max(n_samples, 1))
+    for start in range(0, currents.size, step):
+        block = slice(start, start + step)
+        result = polarization_arrays(currents[None, block], sampled, constants)
+        voltage = np.broadcast_to(result.voltage, (n_samples, currents[block].size))
+        all_valid = bool(result.valid.all())
+        percentile, average, var = (
+            (np.percentile, np.mean, np.var)
+            if all_valid
+            else (np.nanpercentile, np.nanmean, np.nanvar)
+        )
+        with warnings.catch_warnings():
+            # Columnas sin muestras validas: las estadisticas quedan en NaN.
+            warnings.simplefilter("ignore", RuntimeWarning)
+            bands[:, block] = percentile(voltage, percentiles, axis=0)
+            mean[block] = average(voltage, axis=0)
+            variance["voltage"][block] = var(voltage, axis=0)
+            for name in COMPONENTS:
+                values = getattr(result, name)
+                if values.ndim == 2 and values.strides[0] == 0 and all_valid:
+                    # Componente que no depende de los parametros sorteados.
+                    variance[name][block] = 0.0
+                    continue
+                if not all_valid:
+                    values = np.where(result.valid, values, np.nan)
+                variance[name][block] = var(np.broadcast_to(values, voltage.shape), axis=0)
+        valid_fraction[block] = np.broadcast_to(result.valid, voltage.shape).mean(axis=0)
+
+    return MonteCarloResult(
+        current_density=currents,
+        percentiles=percentiles,
+        voltage_bands=bands,
+        mean=mean,
+        variance=variance,
+        valid_fraction=valid_fraction,
+        samples=samples,
+    )
@@ -0,0 +1,159 @@
+"""Mapas volcan de actividad ORR sobre grillas de descriptores (DeltaE_O, DeltaE_OH)."""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import Iterator, Mapping, Optional, Tuple
+
+import numpy as np
+
+from .constants import CONSTANTS, PhysicalConstants
+from .models import IntermediateData
+from .orr import (
+    ASSOCIATIVE_DEFAULT_INTERCEPT,
+    ASSOCIATIVE_DEFAULT_SLOPE,
+    CatalystArrays,
+    actividad_desde_barrera,
+    determinar_via_dominante_array,
+)
+
+DEFAULT_TILE_SIZE = 512
+"""Lado de los bloques de la grilla; cada bloque usa del orden de ``tile**2 * 100`` bytes."""
+
+
+@dataclass
+class VolcanoMap:
+    """Mapas de forma ``(n_potenciales, n_temperaturas, n_d_e_o, n_d_e_oh)``."""
+
+    d_e_o: np.ndarray  # eV, eje
+    d_e_oh: np.ndarray  # eV, eje
+    potential: np.ndarray  # V, eje
+    temperature: np.ndarray  # K, eje
+    pH: float
+    barrier: np.ndarray  # eV, barrera de la via dominante
+    pathway: np.ndarray  # codigo de via (indice en orr.PATHWAYS)
+    constants: PhysicalConstants = CONSTANTS
+
+    @property
+    def activity(self) -> np.ndarray:
+        """A = exp(-DeltaG*/kT) (puede desbordar a 0 o inf en grillas amplias)."""
+
+        return actividad_desde_barrera(self.barrier, self._temperature_axis(), self.constants)
+
+    @property
+    def log10_activity(self) -> np.ndarray:
+        """log10(A) = -DeltaG*/(kT ln 10), sin desbordes; es lo que se grafica en el volcan."""
+
+        kT = self.constants.boltzmann * self._temperature_axis() * self.constants.joule_to_ev
+        return -self.barrier / (kT * math.log(10))
+
+    def _temperature_axis(self) -> np.ndarray:
+        return self.temperature[np.newaxis, :, np.newaxis, np.newaxis]
+
+
+def iter_volcano_tiles(
+    d_e_o,
+    d_e_oh,
+    potential: float,
+    temperature: float,
+    pH: float = 0.0,
+    intermediates: Optional[Mapping[str, IntermediateData]] = None,
+    associative_slope: float = ASSOCIATIVE_DEFAULT_SLOPE,
+    associative_intercept: float = ASSOCIATIVE_DEFAULT_INTERCEPT,
+    dissociation_barrier: float = math.inf,
+    tile_size: int = DEFAULT_TILE_SIZE,
+    constants: PhysicalConstants = CONSTANTS,
+) -> Iterator[Tuple[slice, slice, np.ndarray, np.ndarray]]:
+    """Recorre la grilla ``d_e_o x d_e_oh`` por bloques y produce ``(filas, columnas, barrera,
+    via)`` para un potencial y una temperatura.
+
+    Los bloques se evaluan con :func:`~simulador.orr.determinar_via_dominante_array` sobre
+    :meth:`~simulador.orr.CatalystArrays.from_descriptors`, sin construir ``Catalyst``.
+    """
+
+    if tile_size <= 0:
+        raise ValueError("El tamano de bloque debe ser positivo.")
+    d_e_o = np.asarray(d_e_o, dtype=float).ravel()
+    d_e_oh = np.asarray(d_e_oh, dtype=float).ravel()
+    for row in range(0, d_e_o.size, tile_size):
+        rows = slice(row, min(row + tile_size, d_e_o.size))
+        for col in range(0, d_e_oh.size, tile_size):
+            cols = slice(col, min(col + tile_size, d_e_oh.size))
+            block_o, block_oh = np.meshgrid(d_e_o[rows], d_e_oh[cols], indexing="ij")
+            cats = CatalystArrays.from_descriptors(
+                block_o,
+                block_oh,
+                intermediates,
+                associative_slope,
+                associative_intercept,
+                dissociation_barrier,
+            )
+            decision = determinar_via_dominante_array(cats, potential, temperature, pH, constants)
+            shape = block_o.shape
+            yield rows, cols, decision.barrier.reshape(shape), decision.pathway.reshape(shape)
+
+
+def volcano_map(
+    d_e_o,
+    d_e_oh,
+    potentials,
+    temperatures,
+    pH: float = 0.0,
+    intermediates: Optional[Mapping[str, IntermediateData]] = None,
+    associative_slope: float = ASSOCIATIVE_DEFAULT_SLOPE,
+    associative_intercept: float = ASSOCIATIVE_DEFAULT_INTERCEPT,
+    dissociation_barrier: float = math.inf,
+    tile_size: int = DEFAULT_TILE_SIZE,
+    out: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+    constants: PhysicalConstants = CONSTANTS,
+) -> VolcanoMap:
+    """Barrera y via dominante sobre la grilla de descriptores para cada (U, T).
+
+    ``intermediates`` aporta las correcciones ZPE/entropicas de O* y OH* (p. ej.
+    ``data.CATALYSTS["Pt"].intermediates``). Los temporales quedan acotados por ``tile_size``;
+    ``out`` permite escribir en arreglos ``(barrera float, via int8)`` propios, por ejemplo
+    ``np.memmap``, para mapas que no caben en memoria.
+    """
+
+    d_e_o = np.asarray(d_e_o, dtype=float).ravel()
+    d_e_oh = np.asarray(d_e_oh, dtype=float).ravel()
+    potentials = np.atleast_1d(np.asarray(potentials, dtype=float))
+    temperatures = np.atleast_1d(np.asarray(temperatures, dtype=float))
+    shape = (potentials.size, temperatures.size, d_e_o.size, d_e_oh.size)
+    if out is None:
+        barrier = np.empty(shape, dtype=float)
+        pathway = np.empty(shape, dtype=np.int8)
+    else:
+        barrier, pathway = out
+        if barrier.shape != shape or pathway.shape != shape:
+            raise ValueError(f"Los arreglos de salida deben tener forma {shape}.")
+
+    for u, potential in enumerate(potentials):
+        for t, temperature in enumerate(temperatures):
+            tiles = iter_volcano_tiles(
+                d_e_o,
+                d_e_oh,
+                potential,
+                temperature,
+                pH,
+                intermediates,
+                associative_slope,
+                associative_intercept,
+                dissociation_barrier,
+                tile_size,
+                constants,
+            )
+            for rows, cols, tile_barrier, tile_pathway in tiles:
+                barrier[u, t, rows, cols] = tile_barrier
+                pathway[u, t, rows, cols] = tile_pathway
+    return VolcanoMap(
+        d_e_o=d_e_o,
+        d_e_oh=d_e_oh,
+        potential=potentials,
+        temperature=temperatures,
+        pH=float(pH),
+        barrier=barrier,
+        pathway=pathway,
+        constants=constants,
+    )